@@ -0,0 +1,75 @@
+"""Compare the per-request cost of ``Graph.fork()`` with ``copy.deepcopy(graph)``.
+
+``axf serve`` used to deepcopy the prepared graph for every ``/flows/{id}/run`` call.
+This script loads a flow once, prepares it the way the serve command does and then
+times both ways of getting an isolated per-run graph.
+
+Usage::
+
+    python benchmarks/graph_fork.py [FLOW_JSON] [--iterations N]
+
+``FLOW_JSON`` defaults to ``SIMPLIFIED.json`` at the repository root. The flow's
+components must be importable in the current environment.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from axf.load import load_flow_from_json
+
+DEFAULT_FLOW = Path(__file__).resolve().parents[2] / "SIMPLIFIED.json"
+
+
+def _time_per_call(func, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _peak_allocation(func) -> int:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("flow", nargs="?", type=Path, default=DEFAULT_FLOW, help="Flow JSON to benchmark")
+    parser.add_argument("--iterations", type=int, default=200, help="Copies to time for each strategy")
+    args = parser.parse_args()
+
+    graph = load_flow_from_json(args.flow, disable_logs=True)
+    graph.prepare()
+    print(f"{args.flow.name}: {len(graph.vertices)} vertices, {len(graph.edges)} edges")  # noqa: T201
+
+    strategies = {
+        "deepcopy": lambda: copy.deepcopy(graph),
+        "fork": graph.fork,
+    }
+    medians = {}
+    for name, func in strategies.items():
+        func()  # warm up
+        timings = _time_per_call(func, args.iterations)
+        medians[name] = statistics.median(timings)
+        peak_kib = _peak_allocation(func) / 1024
+        print(  # noqa: T201
+            f"{name:>9}: median {medians[name] * 1000:8.3f} ms  "
+            f"p95 {statistics.quantiles(timings, n=20)[-1] * 1000:8.3f} ms  "
+            f"peak alloc {peak_kib:9.1f} KiB"
+        )
+    print(f"speedup: {medians['deepcopy'] / medians['fork']:.1f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Per-run capture of ``stdout``/``stderr`` for concurrently executing graphs.
+
+Swapping ``sys.stdout`` around a run only works when one run executes at a time:
+with several runs on the same event loop, the output of one run ends up in the
+buffer of whichever run swapped the stream last. Instead, :func:`install_capture_streams`
+replaces ``sys.stdout`` and ``sys.stderr`` once with proxies that look up the
+capture of the current run in a :class:`~contextvars.ContextVar`. Tasks and
+``asyncio.to_thread`` calls inherit the context of the run that started them, so
+their output is routed to the same buffer. Writes made outside of a run go to the
+original streams.
+
+Each run's buffer is bounded. By default it keeps the first ``max_chars``
+characters and drops the rest; in ring-buffer mode it keeps the last ``max_chars``
+characters instead, which is usually what you want for tracebacks.
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Default per-stream limit of a run's capture, in characters
+DEFAULT_MAX_CAPTURE_CHARS = 1_000_000
+
+_current_capture: ContextVar[RunCapture | None] = ContextVar("axf_run_capture", default=None)
+_install_lock = threading.Lock()
+
+
+class CaptureBuffer:
+    """A size-capped text buffer.
+
+    Args:
+        max_chars: Maximum number of characters kept. ``None`` disables the limit.
+        ring_buffer: If True, keep the most recent ``max_chars`` characters instead of the first ones.
+    """
+
+    def __init__(self, max_chars: int | None = DEFAULT_MAX_CAPTURE_CHARS, *, ring_buffer: bool = False) -> None:
+        if max_chars is not None and max_chars < 0:
+            msg = "max_chars must be a non-negative integer or None"
+            raise ValueError(msg)
+        self.max_chars = max_chars
+        self.ring_buffer = ring_buffer
+        self.dropped_chars = 0
+        self._chunks: deque[str] = deque()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        written = len(text)
+        if not text:
+            return written
+        with self._lock:
+            if self.max_chars is None:
+                self._append(text)
+            elif self.ring_buffer:
+                # Slice from the start: text[-0:] would keep everything when max_chars is 0
+                kept = text[written - self.max_chars :] if written > self.max_chars else text
+                if kept:
+                    self._append(kept)
+                self.dropped_chars += written - len(kept)
+                self._trim_left()
+            else:
+                room = self.max_chars - self._size
+                if room > 0:
+                    self._append(text[:room])
+                self.dropped_chars += max(0, written - max(room, 0))
+        return written
+
+    def _append(self, text: str) -> None:
+        self._chunks.append(text)
+        self._size += len(text)
+
+    def _trim_left(self) -> None:
+        excess = self._size - (self.max_chars or 0)
+        while excess > 0:
+            head = self._chunks[0]
+            if len(head) <= excess:
+                self._chunks.popleft()
+                self._size -= len(head)
+                self.dropped_chars += len(head)
+                excess -= len(head)
+            else:
+                self._chunks[0] = head[excess:]
+                self._size -= excess
+                self.dropped_chars += excess
+                excess = 0
+
+    @property
+    def truncated(self) -> bool:
+        return self.dropped_chars > 0
+
+    def getvalue(self) -> str:
+        with self._lock:
+            value = "".join(self._chunks)
+            if len(self._chunks) > 1:
+                self._chunks = deque([value])
+        if not self.truncated:
+            return value
+        marker = f"[... {self.dropped_chars} characters truncated ...]\n"
+        return marker + value if self.ring_buffer else value + "\n" + marker
+
+
+class RunCapture:
+    """The captured ``stdout`` and ``stderr`` of a single run."""
+
+    def __init__(self, max_chars: int | None = DEFAULT_MAX_CAPTURE_CHARS, *, ring_buffer: bool = False) -> None:
+        self.stdout = CaptureBuffer(max_chars, ring_buffer=ring_buffer)
+        self.stderr = CaptureBuffer(max_chars, ring_buffer=ring_buffer)
+
+    def getvalue(self) -> str:
+        return self.stdout.getvalue() + self.stderr.getvalue()
+
+
+class _ContextRoutingStream(io.TextIOBase):
+    """Text stream that writes to the current run's capture, or to the wrapped stream outside of a run."""
+
+    def __init__(self, wrapped: TextIO, name: str) -> None:
+        super().__init__()
+        self.wrapped = wrapped
+        self._name = name
+
+    def _target(self) -> TextIO | CaptureBuffer:
+        capture = _current_capture.get()
+        if capture is None:
+            return self.wrapped
+        return getattr(capture, self._name)
+
+    def write(self, s: str) -> int:
+        return self._target().write(s)
+
+    def writelines(self, lines) -> None:
+        for line in lines:
+            self.write(line)
+
+    def flush(self) -> None:
+        if _current_capture.get() is None:
+            self.wrapped.flush()
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return _current_capture.get() is None and self.wrapped.isatty()
+
+    def fileno(self) -> int:
+        return self.wrapped.fileno()
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        return getattr(self.wrapped, "encoding", "utf-8")
+
+    def __getattr__(self, name: str):
+        return getattr(self.wrapped, name)
+
+
+def install_capture_streams() -> None:
+    """Route ``sys.stdout`` and ``sys.stderr`` through the per-run capture.
+
+    Safe to call any number of times; the proxies are only installed once.
+    """
+    with _install_lock:
+        if not isinstance(sys.stdout, _ContextRoutingStream):
+            sys.stdout = _ContextRoutingStream(sys.stdout, "stdout")
+        if not isinstance(sys.stderr, _ContextRoutingStream):
+            sys.stderr = _ContextRoutingStream(sys.stderr, "stderr")
+
+
+@contextmanager
+def capture_run_output(
+    max_chars: int | None = DEFAULT_MAX_CAPTURE_CHARS, *, ring_buffer: bool = False
+) -> Iterator[RunCapture]:
+    """Capture everything the current context writes to ``stdout``/``stderr``.
+
+    Args:
+        max_chars: Per-stream limit of the capture, in characters. ``None`` disables the limit.
+        ring_buffer: If True, keep the most recent output when the limit is reached.
+
+    Yields:
+        RunCapture: The capture of this run.
+    """
+    install_capture_streams()
+    capture = RunCapture(max_chars, ring_buffer=ring_buffer)
+    token = _current_capture.set(capture)
+    try:
+        yield capture
+    finally:
+        _current_capture.reset(token)
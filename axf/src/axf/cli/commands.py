@@ -23,7 +23,7 @@ from axf.cli.common import (
     is_port_in_use,
     load_graph_from_path,
 )
-from axf.cli.serve_app import FlowMeta, create_multi_serve_app
+from axf.cli.serve_app import FlowMeta, StreamOptions, create_multi_serve_app
 
 # Initialize console
 console = Console()
@@ -69,6 +69,21 @@ def serve_command(
         "--check-variables/--no-check-variables",
         help="Check global variables for environment compatibility",
     ),
+    stream_queue_size: int = typer.Option(
+        1000,
+        "--stream-queue-size",
+        help="Maximum number of events queued per /stream client (0 for unbounded)",
+    ),
+    stream_coalesce_ms: float = typer.Option(
+        0,
+        "--stream-coalesce-ms",
+        help="Merge streamed tokens for up to this many milliseconds (0 sends every token)",
+    ),
+    slow_consumer_policy: str = typer.Option(
+        "block",
+        "--slow-consumer-policy",
+        help="What to do when a /stream client falls behind. One of: block, drop, disconnect",
+    ),
 ) -> None:
     """Serve AXF flows as a web API.
 
@@ -120,6 +135,14 @@ def serve_command(
         verbose_print(f"Error: Invalid log level '{log_level}'. Must be one of: {', '.join(sorted(valid_log_levels))}")
         raise typer.Exit(1)
 
+    valid_policies = {"block", "drop", "disconnect"}
+    if slow_consumer_policy not in valid_policies:
+        verbose_print(
+            f"Error: Invalid slow consumer policy '{slow_consumer_policy}'. "
+            f"Must be one of: {', '.join(sorted(valid_policies))}"
+        )
+        raise typer.Exit(1)
+
     # Configure logging with the specified level
     # Disable pretty logs for serve command to avoid ANSI codes in API responses
     os.environ["AXIESTUDIO_PRETTY_LOGS"] = "false"
@@ -212,6 +235,7 @@ def serve_command(
         # Prepare the graph
         verbose_print("Preparing graph for serving...")
         try:
+            graph.production_mode = True
             graph.prepare()
             verbose_print("✓ Graph prepared successfully")
 
@@ -264,6 +288,11 @@ def serve_command(
             graphs=graphs,
             metas=metas,
             verbose_print=verbose_print,
+            stream_options=StreamOptions(
+                queue_size=stream_queue_size,
+                coalesce_interval=stream_coalesce_ms / 1000 if stream_coalesce_ms > 0 else None,
+                slow_consumer_policy=slow_consumer_policy,
+            ),
         )
 
         verbose_print("🚀 Starting single-flow server...")
@@ -14,7 +14,6 @@ import sys
 import tempfile
 import uuid
 import zipfile
-from io import StringIO
 from pathlib import Path
 from shutil import which
 from typing import TYPE_CHECKING
@@ -23,6 +22,7 @@ from urllib.parse import urlparse
 import httpx
 import typer
 
+from axf.cli.capture import DEFAULT_MAX_CAPTURE_CHARS, capture_run_output
 from axf.cli.script_loader import (
     extract_structured_result,
     find_graph_variable,
@@ -293,12 +293,24 @@ def prepare_graph(graph, verbose_print):
         raise typer.Exit(1) from e
 
 
-async def execute_graph_with_capture(graph, input_value: str | None):
+async def execute_graph_with_capture(
+    graph,
+    input_value: str | None,
+    *,
+    max_capture_chars: int | None = DEFAULT_MAX_CAPTURE_CHARS,
+    ring_buffer: bool = False,
+):
     """Execute a graph and capture output.
 
+    Output is captured per run through a context variable rather than by swapping
+    ``sys.stdout``/``sys.stderr``, so concurrent executions (e.g. in ``axf serve``)
+    only see their own output.
+
     Args:
         graph: Graph object to execute
         input_value: Input value to pass to the graph
+        max_capture_chars: Per-stream limit of the captured output, in characters. ``None`` disables the limit.
+        ring_buffer: If True, keep the most recent output instead of the first once the limit is reached
 
     Returns:
         Tuple of (results, captured_logs)
@@ -309,34 +321,18 @@ async def execute_graph_with_capture(graph, input_value: str | None):
     # Create input request
     inputs = InputValueRequest(input_value=input_value) if input_value else None
 
-    # Capture output during execution
-    captured_stdout = StringIO()
-    captured_stderr = StringIO()
-
-    # Redirect stdout and stderr during graph execution
-    original_stdout = sys.stdout
-    original_stderr = sys.stderr
-
-    try:
-        sys.stdout = captured_stdout
-        sys.stderr = captured_stderr
-        results = [result async for result in graph.async_start(inputs)]
-    except Exception as exc:
-        # Capture any error output that was written to stderr
-        error_output = captured_stderr.getvalue()
-        if error_output:
-            # Add error output to the exception for better debugging
-            exc.args = (f"{exc.args[0] if exc.args else str(exc)}\n\nCaptured stderr:\n{error_output}",)
-        raise
-    finally:
-        # Restore original stdout/stderr
-        sys.stdout = original_stdout
-        sys.stderr = original_stderr
-
-    # Get captured logs
-    captured_logs = captured_stdout.getvalue() + captured_stderr.getvalue()
-
-    return results, captured_logs
+    with capture_run_output(max_capture_chars, ring_buffer=ring_buffer) as capture:
+        try:
+            results = [result async for result in graph.async_start(inputs)]
+        except Exception as exc:
+            # Capture any error output that was written to stderr
+            error_output = capture.stderr.getvalue()
+            if error_output:
+                # Add error output to the exception for better debugging
+                exc.args = (f"{exc.args[0] if exc.args else str(exc)}\n\nCaptured stderr:\n{error_output}",)
+            raise
+
+    return results, capture.getvalue()
 
 
 def extract_result_data(results, captured_logs: str) -> dict:
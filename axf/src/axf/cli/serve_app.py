@@ -4,8 +4,9 @@ This module is used by the CLI *serve* command when the provided path is a
 folder containing multiple ``*.json`` flow files.  Each flow is exposed under
 its own router prefix::
 
-    /flows/{flow_id}/run  - POST - execute the flow
-    /flows/{flow_id}/info - GET  - metadata
+    /flows/{flow_id}/run    - POST - execute the flow
+    /flows/{flow_id}/stream - POST - execute the flow, streaming events as they happen
+    /flows/{flow_id}/info   - GET  - metadata
 
 A global ``/flows`` endpoint lists all available flows and returns a JSON array
 of metadata objects, allowing API consumers to discover IDs without guessing.
@@ -19,7 +20,6 @@ from __future__ import annotations
 
 import asyncio
 import time
-from copy import deepcopy
 from typing import TYPE_CHECKING, Annotated, Any
 
 from fastapi import APIRouter, Depends, FastAPI, HTTPException, Security
@@ -27,14 +27,18 @@ from fastapi.responses import StreamingResponse
 from fastapi.security import APIKeyHeader, APIKeyQuery
 from pydantic import BaseModel, Field
 
+from axf.cli.capture import capture_run_output
 from axf.cli.common import execute_graph_with_capture, extract_result_data, get_api_key
+from axf.events.event_manager import DEFAULT_MAX_BACKLOG, SlowConsumerPolicy, create_stream_tokens_event_manager
 from axf.log.logger import logger
+from axf.processing.process import apply_tweaks_to_graph, run_graph
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator, Callable
     from pathlib import Path
 
     from axf.graph import Graph
+    from axf.graph.schema import RunOutputs
 
 # Security - use the same pattern as AxieStudio main API
 API_KEY_NAME = "x-api-key"
@@ -82,23 +86,25 @@ def _analyze_graph_structure(graph: Graph) -> dict[str, Any]:
 
     try:
         # Analyze nodes
-        for node_id, node in graph.nodes.items():
+        for vertex_id, vertex in graph.vertex_map.items():
             analysis["node_count"] += 1
+            node = vertex.data["node"]
+            component_type = vertex.data.get("type", "Unknown")
             component_info = {
-                "id": node_id,
-                "type": node.data.get("type", "Unknown"),
-                "name": node.data.get("display_name", node.data.get("type", "Unknown")),
-                "description": node.data.get("description", ""),
-                "template": node.data.get("template", {}),
+                "id": vertex_id,
+                "type": component_type,
+                "name": node.get("display_name", component_type),
+                "description": node.get("description", ""),
+                "template": node.get("template", {}),
             }
             analysis["components"].append(component_info)
 
             # Identify entry points (nodes with no incoming edges)
-            if not any(edge.source == node_id for edge in graph.edges):
+            if not graph.get_vertex_edges(vertex_id, is_source=False):
                 analysis["entry_points"].append(component_info)
 
             # Identify exit points (nodes with no outgoing edges)
-            if not any(edge.target == node_id for edge in graph.edges):
+            if not graph.get_vertex_edges(vertex_id, is_target=False):
                 analysis["exit_points"].append(component_info)
 
         # Analyze edges
@@ -108,6 +114,8 @@ def _analyze_graph_structure(graph: Graph) -> dict[str, Any]:
         for entry in analysis["entry_points"]:
             template = entry.get("template", {})
             for field_config in template.values():
+                if not isinstance(field_config, dict):
+                    continue
                 if field_config.get("type") in ["str", "text", "string"]:
                     analysis["input_types"].add("text")
                 elif field_config.get("type") in ["int", "float", "number"]:
@@ -118,6 +126,8 @@ def _analyze_graph_structure(graph: Graph) -> dict[str, Any]:
         for exit_point in analysis["exit_points"]:
             template = exit_point.get("template", {})
             for field_config in template.values():
+                if not isinstance(field_config, dict):
+                    continue
                 if field_config.get("type") in ["str", "text", "string"]:
                     analysis["output_types"].add("text")
                 elif field_config.get("type") in ["int", "float", "number"]:
@@ -221,6 +231,24 @@ class FlowMeta(BaseModel):
     description: str | None = Field(None, description="Optional flow description")
 
 
+class StreamOptions(BaseModel):
+    """How the ``/stream`` endpoints deliver events to clients."""
+
+    queue_size: int = Field(default=1000, ge=0, description="Maximum queued events per stream, 0 for unbounded")
+    coalesce_interval: float | None = Field(
+        default=None, gt=0, description="Merge tokens of a message for up to this many seconds"
+    )
+    coalesce_bytes: int | None = Field(default=None, gt=0, description="Send merged tokens once they reach this size")
+    slow_consumer_policy: SlowConsumerPolicy = Field(
+        default="block", description="What to do when a client does not read events fast enough"
+    )
+    max_backlog: int = Field(
+        default=DEFAULT_MAX_BACKLOG,
+        ge=0,
+        description="Events kept beyond a full queue before the block policy drops tokens",
+    )
+
+
 class RunRequest(BaseModel):
     """Request model for executing a AXF flow."""
 
@@ -293,6 +321,23 @@ async def consume_and_yield(queue: asyncio.Queue, client_consumed_queue: asyncio
         )
 
 
+def _extract_run_result(run_outputs: list[RunOutputs]) -> dict[str, Any]:
+    """Extract the first message produced by the selected outputs of a run."""
+    for run_output in run_outputs:
+        for output in run_output.outputs:
+            if output is None or not isinstance(output.results, dict) or "message" not in output.results:
+                continue
+            message = output.results["message"]
+            return {
+                "result": message.text if hasattr(message, "text") else message,
+                "type": "message",
+                "component": output.component_display_name or "",
+                "component_id": output.component_id,
+                "success": True,
+            }
+    return {"text": "No response generated", "type": "error", "success": False}
+
+
 async def run_flow_generator_for_serve(
     graph: Graph,
     input_request: StreamRequest,
@@ -306,7 +351,7 @@ async def run_flow_generator_for_serve(
     including success completion and error scenarios.
 
     Args:
-        graph (Graph): The graph to execute
+        graph (Graph): The graph to execute. It is mutated by the run, so pass a fork.
         input_request (StreamRequest): The input parameters for the flow
         flow_id (str): The ID of the flow being executed
         event_manager: Manages the streaming of events to the client
@@ -319,17 +364,30 @@ async def run_flow_generator_for_serve(
         - "error": Sent if an error occurs during execution
 
     Notes:
-        - Runs the flow with streaming enabled via execute_graph_with_capture()
+        - Components receive the event manager, so tokens are sent as they are produced
+        - The session ID defaults to the flow ID, like the AxieStudio API
+        - ``tweaks`` are applied to the graph and enable ``stream`` unless it is set explicitly
+        - ``output_component`` or ``output_type`` select the outputs reported in the "end" event
         - On success, sends the final result via event_manager.on_end()
         - On error, logs the error and sends it via event_manager.on_error()
-        - Always sends a final None event to signal completion
+        - Always sends the buffered events and a final None event to signal completion
     """
     try:
-        # For the serve app, we'll use execute_graph_with_capture with streaming
-        # Note: This is a simplified version. In a full implementation, you might want
-        # to integrate with the full AXF streaming pipeline from endpoints.py
-        results, logs = await execute_graph_with_capture(graph, input_request.input_value)
-        result_data = extract_result_data(results, logs)
+        apply_tweaks_to_graph(graph, {"stream": True, **(input_request.tweaks or {})})
+        with capture_run_output() as capture:
+            run_outputs = await run_graph(
+                graph,
+                input_value=input_request.input_value,
+                input_type=input_request.input_type,
+                output_type=input_request.output_type,
+                session_id=input_request.session_id or flow_id,
+                output_component=input_request.output_component,
+                stream=True,
+                event_manager=event_manager,
+            )
+        result_data = _extract_run_result(run_outputs)
+        result_data["session_id"] = graph.session_id
+        result_data["logs"] = capture.getvalue()
 
         # Send the final result
         event_manager.on_end(data={"result": result_data})
@@ -338,7 +396,7 @@ async def run_flow_generator_for_serve(
         logger.error(f"Error running flow {flow_id}: {e}")
         event_manager.on_error(data={"error": str(e)})
     finally:
-        await event_manager.queue.put((None, None, time.time()))
+        await event_manager.aclose()
 
 
 # -----------------------------------------------------------------------------
@@ -352,6 +410,7 @@ def create_multi_serve_app(
     graphs: dict[str, Graph],
     metas: dict[str, FlowMeta],
     verbose_print: Callable[[str], None],  # noqa: ARG001
+    stream_options: StreamOptions | None = None,
 ) -> FastAPI:
     """Create a FastAPI app exposing multiple AXF flows.
 
@@ -361,15 +420,19 @@ def create_multi_serve_app(
         Folder originally supplied to the serve command.  All *relative_path*
         values are relative to this directory.
     graphs
-        Mapping ``flow_id -> Graph`` containing prepared graph objects.
+        Mapping ``flow_id -> Graph`` containing graph objects. Graphs that are not prepared yet
+        are prepared once here.
     metas
         Mapping ``flow_id -> FlowMeta`` containing metadata for each flow.
     verbose_print
         Diagnostic printer inherited from the CLI (unused, kept for backward compatibility).
+    stream_options
+        Queue bound, token coalescing and slow-consumer policy of the ``/stream`` endpoints.
     """
     if set(graphs) != set(metas):  # pragma: no cover - sanity check
         msg = "graphs and metas must contain the same keys"
         raise ValueError(msg)
+    stream_options = stream_options or StreamOptions()
 
     app = FastAPI(
         title=f"AXF Multi-Flow Server ({len(graphs)})",
@@ -399,6 +462,9 @@ def create_multi_serve_app(
 
     def create_flow_router(flow_id: str, graph: Graph, meta: FlowMeta) -> APIRouter:
         """Create a router for a specific flow to avoid loop variable binding issues."""
+        # Requests run on forks of the graph, which need a prepared graph to copy.
+        if not graph._prepared:  # noqa: SLF001
+            graph.prepare()
         analysis = _analyze_graph_structure(graph)
         run_description = _generate_dynamic_run_description(graph)
 
@@ -419,7 +485,7 @@ def create_multi_serve_app(
             request: RunRequest,
         ) -> RunResponse:
             try:
-                graph_copy = deepcopy(graph)
+                graph_copy = graph.fork()
                 results, logs = await execute_graph_with_capture(graph_copy, request.input_value)
                 result_data = extract_result_data(results, logs)
 
@@ -485,16 +551,20 @@ def create_multi_serve_app(
         ) -> StreamingResponse:
             """Stream the execution of the flow with real-time events."""
             try:
-                # Import here to avoid potential circular imports
-                from axf.events.event_manager import create_stream_tokens_event_manager
-
-                asyncio_queue: asyncio.Queue = asyncio.Queue()
+                asyncio_queue: asyncio.Queue = asyncio.Queue(maxsize=stream_options.queue_size)
                 asyncio_queue_client_consumed: asyncio.Queue = asyncio.Queue()
-                event_manager = create_stream_tokens_event_manager(queue=asyncio_queue)
+                event_manager = create_stream_tokens_event_manager(
+                    queue=asyncio_queue,
+                    coalesce_interval=stream_options.coalesce_interval,
+                    coalesce_bytes=stream_options.coalesce_bytes,
+                    slow_consumer_policy=stream_options.slow_consumer_policy,
+                    max_backlog=stream_options.max_backlog,
+                )
+                event_manager.register_event("on_error", "error")
 
                 main_task = asyncio.create_task(
                     run_flow_generator_for_serve(
-                        graph=graph,
+                        graph=graph.fork(),
                         input_request=request,
                         flow_id=flow_id,
                         event_manager=event_manager,
@@ -27,6 +27,7 @@ from axf.io import (
 from axf.schema.data import Data
 from axf.schema.dotdict import dotdict
 from axf.utils.component_utils import set_current_fields, set_field_advanced, set_field_display
+from axf.utils.request_utils import pooled_async_client
 
 # Define fields for each mode
 MODE_FIELDS = {
@@ -438,7 +439,7 @@ class APIRequestComponent(Component):
         body = self._process_body(body)
         url = self.add_query_params(url, query_params)
 
-        async with httpx.AsyncClient() as client:
+        async with pooled_async_client(url) as client:
             result = await self.make_request(
                 client,
                 method,
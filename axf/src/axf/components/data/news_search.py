@@ -1,12 +1,13 @@
 from urllib.parse import quote_plus
 
+import httpx
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 
 from axf.custom import Component
 from axf.io import IntInput, MessageTextInput, Output
 from axf.schema import DataFrame
+from axf.utils.request_utils import pooled_client
 
 
 class NewsSearchComponent(Component):
@@ -126,11 +127,12 @@ class NewsSearchComponent(Component):
             )
 
         try:
-            response = requests.get(rss_url, timeout=self.timeout)
+            with pooled_client(rss_url) as client:
+                response = client.get(rss_url, timeout=self.timeout, follow_redirects=True)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, "xml")
             items = soup.find_all("item")
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             self.status = f"Failed to fetch news: {e}"
             self.log(self.status)
             return DataFrame(pd.DataFrame([{"title": "Error", "link": "", "published": "", "summary": str(e)}]))
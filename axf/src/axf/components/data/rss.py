@@ -1,11 +1,12 @@
+import httpx
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 
 from axf.custom import Component
 from axf.io import IntInput, MessageTextInput, Output
 from axf.log.logger import logger
 from axf.schema import DataFrame
+from axf.utils.request_utils import pooled_client
 
 
 class RSSReaderComponent(Component):
@@ -36,7 +37,8 @@ class RSSReaderComponent(Component):
 
     def read_rss(self) -> DataFrame:
         try:
-            response = requests.get(self.rss_url, timeout=self.timeout)
+            with pooled_client(self.rss_url) as client:
+                response = client.get(self.rss_url, timeout=self.timeout, follow_redirects=True)
             response.raise_for_status()
             if not response.content.strip():
                 msg = "Empty response received"
@@ -49,7 +51,7 @@ class RSSReaderComponent(Component):
                 raise ValueError(msg) from e
             soup = BeautifulSoup(response.content, "xml")
             items = soup.find_all("item")
-        except (requests.RequestException, ValueError) as e:
+        except (httpx.HTTPError, ValueError) as e:
             self.status = f"Failed to fetch RSS: {e}"
             return DataFrame(pd.DataFrame([{"title": "Error", "link": "", "published": "", "summary": str(e)}]))
 
@@ -1,14 +1,14 @@
 import re
 from urllib.parse import parse_qs, unquote, urlparse
 
+import httpx
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 
 from axf.custom import Component
 from axf.io import IntInput, MessageTextInput, Output
 from axf.schema import DataFrame
-from axf.utils.request_utils import get_user_agent
+from axf.utils.request_utils import get_user_agent, pooled_client
 
 
 class WebSearchComponent(Component):
@@ -67,9 +67,10 @@ class WebSearchComponent(Component):
         url = "https://html.duckduckgo.com/html/"
 
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=self.timeout)
+            with pooled_client(url) as client:
+                response = client.get(url, params=params, headers=headers, timeout=self.timeout, follow_redirects=True)
             response.raise_for_status()
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             self.status = f"Failed request: {e!s}"
             return DataFrame(pd.DataFrame([{"title": "Error", "link": "", "snippet": str(e), "content": ""}]))
 
@@ -92,10 +93,11 @@ class WebSearchComponent(Component):
 
                 try:
                     final_url = self.ensure_url(decoded_link)
-                    page = requests.get(final_url, headers=headers, timeout=self.timeout)
+                    with pooled_client(final_url) as client:
+                        page = client.get(final_url, headers=headers, timeout=self.timeout, follow_redirects=True)
                     page.raise_for_status()
                     content = BeautifulSoup(page.text, "lxml").get_text(separator=" ", strip=True)
-                except requests.RequestException as e:
+                except httpx.HTTPError as e:
                     final_url = decoded_link
                     content = f"(Failed to fetch: {e!s}"
 
@@ -0,0 +1,183 @@
+"""Process-wide cache of classes compiled from custom component code.
+
+Every vertex of every graph build turns its component source back into a class.
+Parsing, compiling and executing the same source over and over is wasted work,
+so classes are cached by a hash of the source, the requested class name, the axf
+version and the Python bytecode tag. The in-memory tier is an LRU of class objects; the optional disk
+tier stores the marshalled bytecode so other processes (and restarts) can skip
+the parse and compile steps.
+
+Classes returned by the cache are shared by every caller, so components must not
+mutate their class-level ``inputs``/``outputs`` in place.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import marshal
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from axf.custom import validate
+from axf.log.logger import logger
+
+DEFAULT_MAX_SIZE = 1024
+
+
+def _axf_version() -> str:
+    try:
+        return importlib.metadata.version("axf")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class ComponentClassCache:
+    """LRU cache of component classes keyed by a hash of their source code and class name.
+
+    Args:
+        max_size: Maximum number of classes kept in memory. ``0`` disables caching.
+        cache_dir: Directory of the on-disk bytecode tier. ``None`` disables it.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, cache_dir: str | Path | None = None) -> None:
+        if max_size < 0:
+            msg = "max_size must be a non-negative integer"
+            raise ValueError(msg)
+        self.max_size = max_size
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._classes: OrderedDict[str, type] = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_prefix = f"{_axf_version()}\0{sys.implementation.cache_tag}\0"
+
+    def key(self, code: str, class_name: str | None = None) -> str:
+        # The same code can define several classes; None stands for the one extract_class_name finds
+        return hashlib.sha256(f"{self._key_prefix}{class_name or ''}\0{code}".encode()).hexdigest()
+
+    def get(self, code: str, class_name: str | None = None) -> type:
+        """Return the class defined by ``code``, compiling it only on a cache miss.
+
+        Raises:
+            ValueError: If the code does not define a valid class. Failures are not cached.
+        """
+        if self.max_size == 0:
+            return validate.create_class(code, class_name or validate.extract_class_name(code))
+
+        key = self.key(code, class_name)
+        with self._lock:
+            cls = self._classes.get(key)
+            if cls is not None:
+                self._classes.move_to_end(key)
+                self.hits += 1
+                return cls
+            self.misses += 1
+
+        cls = self._load(key, code, class_name)
+
+        with self._lock:
+            # Another thread may have built the same class meanwhile; keep a single one
+            cls = self._classes.setdefault(key, cls)
+            self._classes.move_to_end(key)
+            while len(self._classes) > self.max_size:
+                self._classes.popitem(last=False)
+        return cls
+
+    def _load(self, key: str, code: str, class_name: str | None) -> type:
+        compiled = self._read_disk(key)
+        if compiled is not None:
+            try:
+                cls = validate.load_compiled_class(compiled)
+            except ValueError:
+                logger.debug(f"Ignoring unusable cached bytecode for component class {key}")
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+                return cls
+
+        compiled = validate.compile_class(code, class_name or validate.extract_class_name(code))
+        cls = validate.load_compiled_class(compiled)
+        self._write_disk(key, compiled)
+        return cls
+
+    def _path(self, key: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{key}.bin"
+
+    def _read_disk(self, key: str) -> validate.CompiledClass | None:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            # The cache directory is trusted like __pycache__: only this process writes to it
+            return validate.CompiledClass(*marshal.loads(path.read_bytes()))  # noqa: S302
+        except (OSError, EOFError, ValueError, TypeError):
+            logger.debug(f"Ignoring corrupt component class cache file {path}")
+            return None
+
+    def _write_disk(self, key: str, compiled: validate.CompiledClass) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(marshal.dumps(tuple(compiled)))
+                Path(tmp_name).replace(path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.debug(f"Could not write component class cache file {path}: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._classes),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Drop the in-memory classes and reset the counters. The disk tier is kept."""
+        with self._lock:
+            self._classes.clear()
+            self.hits = self.misses = self.disk_hits = 0
+
+
+_cache: ComponentClassCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_component_class_cache() -> ComponentClassCache:
+    """Return the process-wide cache, configured from the settings on first use."""
+    global _cache  # noqa: PLW0603
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                max_size, cache_dir = DEFAULT_MAX_SIZE, None
+                try:
+                    from axf.services.deps import get_settings_service
+
+                    settings_service = get_settings_service()
+                    if settings_service is not None:
+                        max_size = settings_service.settings.component_class_cache_size
+                        cache_dir = settings_service.settings.component_class_cache_dir
+                except Exception:  # noqa: BLE001
+                    logger.debug("Could not read component class cache settings, using defaults")
+                _cache = ComponentClassCache(max_size=max_size, cache_dir=cache_dir)
+    return _cache
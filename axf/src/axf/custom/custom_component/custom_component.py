@@ -104,6 +104,29 @@ class CustomComponent(BaseComponent):
     def set_attributes(self, parameters: dict) -> None:
         pass
 
+    def fork(self, vertex: Vertex) -> CustomComponent:
+        """Returns a copy of this component bound to ``vertex`` for a single run.
+
+        The class (and therefore the compiled component code) and the configuration are shared;
+        results, artifacts, logs and other per-run state start empty.
+        """
+        new_component = object.__new__(type(self))
+        new_component.__dict__.update(self.__dict__)
+        new_component._reset_run_state(vertex)
+        return new_component
+
+    def _reset_run_state(self, vertex: Vertex) -> None:
+        """Bind a fresh fork to ``vertex`` and give it its own per-run state."""
+        self._vertex = vertex
+        self._results = {}
+        self._artifacts = {}
+        self._logs = []
+        self._output_logs = {}
+        self._outputs = []
+        self.status = None
+        self.repr_value = ""
+        self.cache = TTLCache(maxsize=1024, ttl=60)
+
     def set_parameters(self, parameters: dict) -> None:
         self._parameters = parameters
         self.set_attributes(self._parameters)
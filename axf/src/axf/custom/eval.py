@@ -1,12 +1,16 @@
 from typing import TYPE_CHECKING
 
 from axf.custom import validate
+from axf.custom.class_cache import get_component_class_cache
 
 if TYPE_CHECKING:
     from axf.custom.custom_component.custom_component import CustomComponent
 
 
 def eval_custom_component_code(code: str) -> type["CustomComponent"]:
-    """Evaluate custom component code."""
+    """Evaluate custom component code.
+
+    Classes are cached by a hash of the code, so evaluating the same code again returns the same class.
+    """
     class_name = validate.extract_class_name(code)
-    return validate.create_class(code, class_name)
+    return get_component_class_cache().get(code, class_name)
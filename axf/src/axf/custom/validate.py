@@ -2,8 +2,8 @@ import ast
 import contextlib
 import importlib
 import warnings
-from types import FunctionType
-from typing import Optional, Union
+from types import CodeType, FunctionType
+from typing import NamedTuple, Optional, Union
 
 from langchain_core._api.deprecation import LangChainDeprecationWarning
 from pydantic import ValidationError
@@ -238,19 +238,24 @@ def create_function(code, function_name):
     return wrapped_function
 
 
-def create_class(code, class_name):
-    """Dynamically create a class from a string of code and a specified class name.
+class CompiledClass(NamedTuple):
+    """The compiled, marshal-able form of a custom component class.
 
-    Args:
-        code: String containing the Python code defining the class
-        class_name: Name of the class to be created
+    Holds everything needed to rebuild the class without parsing the source again:
+    the imports of the module, the code object of its top-level definitions and
+    the code object of the class itself.
+    """
 
-    Returns:
-         A function that, when called, returns an instance of the created class
+    class_name: str
+    imports: tuple[tuple[str, str], ...]
+    """``(module, variable_name)`` pairs of the ``import`` statements."""
+    import_froms: tuple[tuple[str, tuple[str, ...]], ...]
+    """``(module, names)`` pairs of the ``from ... import`` statements."""
+    definitions: CodeType | None
+    class_code: CodeType
 
-    Raises:
-        ValueError: If the code contains syntax errors or the class definition is invalid
-    """
+
+def _prepare_class_source(code):
     if not hasattr(ast, "TypeIgnore"):
         ast.TypeIgnore = create_type_ignore_class()
 
@@ -260,16 +265,14 @@ def create_class(code, class_name):
         "from axiestudio.custom import CustomComponent",
     )
 
-    code = DEFAULT_IMPORT_STRING + "\n" + code
-    try:
-        module = ast.parse(code)
-        exec_globals = prepare_global_scope(module)
-
-        class_code = extract_class_code(module, class_name)
-        compiled_class = compile_class_code(class_code)
+    return DEFAULT_IMPORT_STRING + "\n" + code
 
-        return build_class_constructor(compiled_class, exec_globals, class_name)
 
+@contextlib.contextmanager
+def _class_creation_errors():
+    """Translate the errors raised while creating a class into ValueErrors."""
+    try:
+        yield
     except SyntaxError as e:
         msg = f"Syntax error in code: {e!s}"
         raise ValueError(msg) from e
@@ -285,6 +288,74 @@ def create_class(code, class_name):
         raise ValueError(msg) from e
 
 
+def create_class(code, class_name):
+    """Dynamically create a class from a string of code and a specified class name.
+
+    Args:
+        code: String containing the Python code defining the class
+        class_name: Name of the class to be created
+
+    Returns:
+         A function that, when called, returns an instance of the created class
+
+    Raises:
+        ValueError: If the code contains syntax errors or the class definition is invalid
+    """
+    with _class_creation_errors():
+        return _load_compiled_class(_compile_class(code, class_name))
+
+
+def compile_class(code, class_name) -> CompiledClass:
+    """Parse and compile a class without executing it.
+
+    The result can be passed to :func:`load_compiled_class`, or serialized with
+    :mod:`marshal` and loaded later by the same Python version.
+
+    Raises:
+        ValueError: If the code contains syntax errors or the class definition is invalid
+    """
+    with _class_creation_errors():
+        return _compile_class(code, class_name)
+
+
+def _compile_class(code, class_name) -> CompiledClass:
+    module = ast.parse(_prepare_class_source(code))
+    imports, import_froms, definitions = _split_module_body(module)
+
+    compiled_definitions = None
+    if definitions:
+        compiled_definitions = compile(ast.Module(body=definitions, type_ignores=[]), "<string>", "exec")
+
+    class_code = extract_class_code(module, class_name)
+    return CompiledClass(
+        class_name=class_name,
+        imports=tuple((alias.name, alias.asname or alias.name) for node in imports for alias in node.names),
+        import_froms=tuple((node.module, tuple(alias.name for alias in node.names)) for node in import_froms),
+        definitions=compiled_definitions,
+        class_code=compile_class_code(class_code),
+    )
+
+
+def load_compiled_class(compiled: CompiledClass):
+    """Execute a :class:`CompiledClass` and return the class it defines.
+
+    Raises:
+        ValueError: If the imports or the definitions of the class fail
+    """
+    with _class_creation_errors():
+        return _load_compiled_class(compiled)
+
+
+def _load_compiled_class(compiled: CompiledClass):
+    exec_globals = globals().copy()
+    _import_modules(compiled.imports, exec_globals)
+    _import_from_modules(compiled.import_froms, exec_globals)
+    if compiled.definitions is not None:
+        exec(compiled.definitions, exec_globals)
+
+    return build_class_constructor(compiled.class_code, exec_globals, compiled.class_name)
+
+
 def create_type_ignore_class():
     """Create a TypeIgnore class for AST module if it doesn't exist.
 
@@ -310,29 +381,21 @@ def _import_module_with_warnings(module_name):
 
 def _handle_module_attributes(imported_module, node, module_name, exec_globals):
     """Handle importing specific attributes from a module."""
-    for alias in node.names:
+    _import_attributes(imported_module, [alias.name for alias in node.names], module_name, exec_globals)
+
+
+def _import_attributes(imported_module, names, module_name, exec_globals):
+    for name in names:
         try:
             # First try getting it as an attribute
-            exec_globals[alias.name] = getattr(imported_module, alias.name)
+            exec_globals[name] = getattr(imported_module, name)
         except AttributeError:
             # If that fails, try importing the full module path
-            full_module_path = f"{module_name}.{alias.name}"
-            exec_globals[alias.name] = importlib.import_module(full_module_path)
+            full_module_path = f"{module_name}.{name}"
+            exec_globals[name] = importlib.import_module(full_module_path)
 
 
-def prepare_global_scope(module):
-    """Prepares the global scope with necessary imports from the provided code module.
-
-    Args:
-        module: AST parsed module
-
-    Returns:
-        Dictionary representing the global scope with imported modules
-
-    Raises:
-        ModuleNotFoundError: If a module is not found in the code
-    """
-    exec_globals = globals().copy()
+def _split_module_body(module):
     imports = []
     import_froms = []
     definitions = []
@@ -345,22 +408,25 @@ def prepare_global_scope(module):
         elif isinstance(node, ast.ClassDef | ast.FunctionDef | ast.Assign):
             definitions.append(node)
 
-    for node in imports:
-        for alias in node.names:
-            try:
-                module_name = alias.name
-                variable_name = alias.asname or alias.name
-                exec_globals[variable_name] = importlib.import_module(module_name)
-            except ModuleNotFoundError as e:
-                msg = f"Module {alias.name} not found. Please install it and try again."
-                raise ModuleNotFoundError(msg) from e
+    return imports, import_froms, definitions
+
+
+def _import_modules(imports, exec_globals):
+    for module_name, variable_name in imports:
+        try:
+            exec_globals[variable_name] = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            msg = f"Module {module_name} not found. Please install it and try again."
+            raise ModuleNotFoundError(msg) from e
+
 
-    for node in import_froms:
-        module_names_to_try = [node.module]
+def _import_from_modules(import_froms, exec_globals):
+    for module, names in import_froms:
+        module_names_to_try = [module]
 
         # If original module starts with axiestudio, also try lfx equivalent
-        if node.module and node.module.startswith("axiestudio."):
-            lfx_module_name = node.module.replace("axiestudio.", "lfx.", 1)
+        if module and module.startswith("axiestudio."):
+            lfx_module_name = module.replace("axiestudio.", "lfx.", 1)
             module_names_to_try.append(lfx_module_name)
 
         success = False
@@ -369,7 +435,7 @@ def prepare_global_scope(module):
         for module_name in module_names_to_try:
             try:
                 imported_module = _import_module_with_warnings(module_name)
-                _handle_module_attributes(imported_module, node, module_name, exec_globals)
+                _import_attributes(imported_module, names, module_name, exec_globals)
 
                 success = True
                 break
@@ -379,9 +445,30 @@ def prepare_global_scope(module):
                 continue
 
         if not success:
-            msg = f"Module {node.module} not found. Please install it and try again"
+            msg = f"Module {module} not found. Please install it and try again"
             raise ModuleNotFoundError(msg) from last_error
 
+
+def prepare_global_scope(module):
+    """Prepares the global scope with necessary imports from the provided code module.
+
+    Args:
+        module: AST parsed module
+
+    Returns:
+        Dictionary representing the global scope with imported modules
+
+    Raises:
+        ModuleNotFoundError: If a module is not found in the code
+    """
+    exec_globals = globals().copy()
+    imports, import_froms, definitions = _split_module_body(module)
+
+    _import_modules(
+        [(alias.name, alias.asname or alias.name) for node in imports for alias in node.names], exec_globals
+    )
+    _import_from_modules([(node.module, [alias.name for alias in node.names]) for node in import_froms], exec_globals)
+
     if definitions:
         combined_module = ast.Module(body=definitions, type_ignores=[])
         compiled_code = compile(combined_module, "<string>", "exec")
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
+import itertools
 import json
+import threading
 import time
 import uuid
+from collections import deque
 from functools import partial
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
 from fastapi.encoders import jsonable_encoder
 from typing_extensions import Protocol
@@ -16,6 +20,19 @@ if TYPE_CHECKING:
     # Lightweight type stub for log types
     LoggableType = dict | str | int | float | bool | list | None
 
+SlowConsumerPolicy = Literal["block", "drop", "disconnect"]
+
+DEFAULT_MAX_BACKLOG = 1000
+
+# Token events are by far the most frequent, so they are serialized from a template
+# instead of going through jsonable_encoder and json.dumps for the whole event.
+# The output is identical to json.dumps({"event": "token", "data": {"chunk": ..., "id": ...}}).
+_TOKEN_EVENT_TEMPLATE = '{"event": "token", "data": {"chunk": %s, "id": %s}}\n\n'
+
+
+class SlowConsumerError(RuntimeError):
+    """Raised by an EventManager with the "disconnect" policy when its consumer falls behind."""
+
 
 class EventCallback(Protocol):
     def __call__(self, *, manager: EventManager, event_type: str, data: LoggableType): ...
@@ -26,9 +43,65 @@ class PartialEventCallback(Protocol):
 
 
 class EventManager:
-    def __init__(self, queue):
+    """Serializes events and puts them on a queue for a streaming response.
+
+    Args:
+        queue: The queue consumed by the response. Items are ``(event_id, bytes, put_time)`` tuples.
+        coalesce_interval: If set, token events of the same message are merged for up to this many
+            seconds before they are sent.
+        coalesce_bytes: If set, merged tokens are sent as soon as they reach this many bytes.
+        slow_consumer_policy: What to do when a bounded queue is full:
+
+            - ``"block"``: keep the events in order in a backlog; producers that await :meth:`drain`
+              wait until the consumer catches up. Producers that never drain would grow the backlog
+              without bound, so once it holds ``max_backlog`` events, token events are dropped as
+              with ``"drop"``.
+            - ``"drop"``: drop token events and send a ``tokens_dropped`` summary once there is room
+              again. Other events are never dropped; they are kept in the backlog.
+            - ``"disconnect"``: discard the pending events, end the stream and raise
+              :class:`SlowConsumerError` to the producer.
+        max_backlog: Number of backlog events after which the ``"block"`` policy drops token events.
+            None keeps every event.
+    """
+
+    def __init__(
+        self,
+        queue,
+        *,
+        coalesce_interval: float | None = None,
+        coalesce_bytes: int | None = None,
+        slow_consumer_policy: SlowConsumerPolicy = "block",
+        max_backlog: int | None = DEFAULT_MAX_BACKLOG,
+    ):
+        if slow_consumer_policy not in {"block", "drop", "disconnect"}:
+            msg = f"Invalid slow consumer policy: {slow_consumer_policy}"
+            raise ValueError(msg)
         self.queue = queue
         self.events: dict[str, PartialEventCallback] = {}
+        self.coalesce_interval = coalesce_interval
+        self.coalesce_bytes = coalesce_bytes
+        self.slow_consumer_policy = slow_consumer_policy
+        self.max_backlog = max_backlog
+        self.dropped_tokens = 0
+        self.dropped_chars = 0
+        self.closed = False
+        self._id_prefix = uuid.uuid4().hex
+        self._event_counter = itertools.count()
+        self._lock = threading.RLock()
+        self._backlog: deque[tuple[str, bytes, float]] = deque()
+        # Set while a drain() call moves the backlog; concurrent callers wait for it
+        self._drain_done: asyncio.Future | None = None
+        self._pending_tokens: list[str] = []
+        self._pending_token_id: str | None = None
+        self._pending_bytes = 0
+        self._pending_since = 0.0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._unreported_drops = 0
+        self._unreported_dropped_chars = 0
+
+    @property
+    def coalescing(self) -> bool:
+        return self.coalesce_interval is not None or self.coalesce_bytes is not None
 
     @staticmethod
     def _validate_callback(callback: EventCallback) -> None:
@@ -64,22 +137,180 @@ class EventManager:
         self.events[name] = callback_
 
     def send_event(self, *, event_type: str, data: LoggableType):
+        if self.closed:
+            return
+        if event_type == "token" and self._is_plain_token(data):
+            self._send_token(data["chunk"], data["id"])  # type: ignore[index]
+            return
+        with self._lock:
+            self._flush_tokens()
+            jsonable_data = jsonable_encoder(data)
+            json_data = {"event": event_type, "data": jsonable_data}
+            str_data = json.dumps(json_data) + "\n\n"
+            self._enqueue(event_type, str_data.encode("utf-8"))
+
+    @staticmethod
+    def _is_plain_token(data: LoggableType) -> bool:
+        return (
+            isinstance(data, dict)
+            and data.keys() == {"chunk", "id"}
+            and isinstance(data["chunk"], str)
+            and isinstance(data["id"], str)
+        )
+
+    def _send_token(self, chunk: str, message_id: str) -> None:
+        with self._lock:
+            if not self.coalescing:
+                self._enqueue("token", self._token_event(chunk, message_id), chars=len(chunk))
+                return
+            if self._pending_token_id != message_id:
+                self._flush_tokens()
+                self._pending_token_id = message_id
+            if not self._pending_tokens:
+                self._pending_since = time.monotonic()
+            self._pending_tokens.append(chunk)
+            self._pending_bytes += len(chunk.encode("utf-8"))
+            if (self.coalesce_bytes is not None and self._pending_bytes >= self.coalesce_bytes) or (
+                self.coalesce_interval is not None and time.monotonic() - self._pending_since >= self.coalesce_interval
+            ):
+                self._flush_tokens()
+            elif self.coalesce_interval is not None and self._flush_handle is None:
+                self._schedule_flush()
+
+    @staticmethod
+    def _token_event(chunk: str, message_id: str) -> bytes:
+        return (_TOKEN_EVENT_TEMPLATE % (json.dumps(chunk), json.dumps(message_id))).encode("utf-8")
+
+    def _schedule_flush(self) -> None:
         try:
-            # Simple event creation without heavy dependencies
-            if isinstance(data, dict) and event_type in {"message", "error", "warning", "info", "token"}:
-                # For lfx, keep it simple without playground event creation
-                pass
-        except Exception:  # noqa: BLE001
-            logger.debug(f"Error processing event: {event_type}")
-        jsonable_data = jsonable_encoder(data)
-        json_data = {"event": event_type, "data": jsonable_data}
-        event_id = f"{event_type}-{uuid.uuid4()}"
-        str_data = json.dumps(json_data) + "\n\n"
-        if self.queue:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not on the event loop: the tokens are sent with the next event or flush()
+            return
+        self._flush_handle = loop.call_later(self.coalesce_interval, self.flush)
+
+    def flush(self) -> None:
+        """Send the tokens that are waiting to be coalesced."""
+        with self._lock:
+            self._flush_tokens()
+
+    def _flush_tokens(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending_tokens or self._pending_token_id is None:
+            return
+        chunk = "".join(self._pending_tokens)
+        self._pending_tokens = []
+        self._pending_bytes = 0
+        self._enqueue("token", self._token_event(chunk, self._pending_token_id), chars=len(chunk))
+
+    def _next_event_id(self, event_type: str) -> str:
+        return f"{event_type}-{self._id_prefix}-{next(self._event_counter)}"
+
+    def _enqueue(self, event_type: str, payload: bytes, *, chars: int = 0) -> None:
+        if not self.queue or self.closed:
+            return
+        item = (self._next_event_id(event_type), payload, time.time())
+        self._move_backlog()
+        if not self._backlog and self._drain_done is None:
+            if self._unreported_drops:
+                self._report_drops()
             try:
-                self.queue.put_nowait((event_id, str_data.encode("utf-8"), time.time()))
+                self.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                pass
             except Exception:  # noqa: BLE001
                 logger.debug("Queue not available for event")
+                return
+            else:
+                return
+        self._handle_full_queue(event_type, item, chars)
+
+    def _handle_full_queue(self, event_type: str, item: tuple[str, bytes, float], chars: int) -> None:
+        if self.slow_consumer_policy == "disconnect":
+            self._disconnect()
+            msg = "The client is not consuming events fast enough"
+            raise SlowConsumerError(msg)
+        if event_type == "token" and (
+            self.slow_consumer_policy == "drop"
+            or (self.max_backlog is not None and len(self._backlog) >= self.max_backlog)
+        ):
+            self.dropped_tokens += 1
+            self.dropped_chars += chars
+            self._unreported_drops += 1
+            self._unreported_dropped_chars += chars
+            return
+        self._backlog.append(item)
+
+    def _drops_event(self) -> tuple[str, bytes, float]:
+        data = {"count": self._unreported_drops, "chars": self._unreported_dropped_chars}
+        payload = (json.dumps({"event": "tokens_dropped", "data": data}) + "\n\n").encode("utf-8")
+        return self._next_event_id("tokens_dropped"), payload, time.time()
+
+    def _report_drops(self) -> None:
+        try:
+            self.queue.put_nowait(self._drops_event())
+        except asyncio.QueueFull:
+            return
+        self._unreported_drops = 0
+        self._unreported_dropped_chars = 0
+
+    def _move_backlog(self) -> None:
+        if self._drain_done is not None:
+            return
+        while self._backlog:
+            try:
+                self.queue.put_nowait(self._backlog[0])
+            except asyncio.QueueFull:
+                return
+            self._backlog.popleft()
+
+    def _disconnect(self) -> None:
+        self.closed = True
+        self._backlog.clear()
+        self._pending_tokens = []
+        while True:
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+        self.queue.put_nowait((None, None, time.time()))
+
+    async def drain(self) -> None:
+        """Wait until every event in the backlog is in the queue.
+
+        Producers that can produce events faster than the client reads them (e.g. token streams)
+        should await this after sending, so that a full queue slows them down instead of growing
+        the backlog. It returns immediately when there is no backlog. Concurrent callers wait for
+        the same drain. An event leaves the backlog only once it is in the queue, so cancelling a
+        drain never loses one.
+        """
+        while self._backlog and not self.closed:
+            if self._drain_done is not None:
+                await asyncio.shield(self._drain_done)
+                continue
+            self._drain_done = asyncio.get_running_loop().create_future()
+            try:
+                while self._backlog and not self.closed:
+                    await self.queue.put(self._backlog[0])
+                    if self._backlog:
+                        self._backlog.popleft()
+            finally:
+                self._drain_done.set_result(None)
+                self._drain_done = None
+
+    async def aclose(self) -> None:
+        """Send everything that is still buffered, then the end-of-stream marker."""
+        if self.closed:
+            return
+        self.flush()
+        await self.drain()
+        if self._unreported_drops:
+            await self.queue.put(self._drops_event())
+            self._unreported_drops = self._unreported_dropped_chars = 0
+        self.closed = True
+        await self.queue.put((None, None, time.time()))
 
     def noop(self, *, data: LoggableType) -> None:
         pass
@@ -102,8 +333,21 @@ def create_default_event_manager(queue=None):
     return manager
 
 
-def create_stream_tokens_event_manager(queue=None):
-    manager = EventManager(queue)
+def create_stream_tokens_event_manager(
+    queue=None,
+    *,
+    coalesce_interval: float | None = None,
+    coalesce_bytes: int | None = None,
+    slow_consumer_policy: SlowConsumerPolicy = "block",
+    max_backlog: int | None = DEFAULT_MAX_BACKLOG,
+):
+    manager = EventManager(
+        queue,
+        coalesce_interval=coalesce_interval,
+        coalesce_bytes=coalesce_bytes,
+        slow_consumer_policy=slow_consumer_policy,
+        max_backlog=max_backlog,
+    )
     manager.register_event("on_message", "add_message")
     manager.register_event("on_token", "token")
     manager.register_event("on_end", "end")
@@ -74,6 +74,13 @@ class Edge:
     def to_data(self):
         return self._data
 
+    def fork(self) -> Edge:
+        """Returns the edge to use in a forked graph.
+
+        Plain edges only describe the connection between two vertices, so they are shared.
+        """
+        return self
+
     def validate_handles(self, source, target) -> None:
         if isinstance(self._source_handle, str) or self.source_handle.base_classes:
             self._legacy_validate_handles(source, target)
@@ -232,6 +239,14 @@ class CycleEdge(Edge):
         source.has_cycle_edges = True
         target.has_cycle_edges = True
 
+    def fork(self) -> CycleEdge:
+        """Returns a copy of the edge with its contract reset, for use in a forked graph."""
+        new_edge = object.__new__(type(self))
+        new_edge.__dict__.update(self.__dict__)
+        new_edge.is_fulfilled = False
+        new_edge.result = None
+        return new_edge
+
     async def honor(self, source: Vertex, target: Vertex) -> None:
         """Fulfills the contract by setting the result of the source vertex to the target vertex's parameter.
 
@@ -109,8 +109,6 @@ class Vertex:
         self.output_names: list[str] = [
             output["name"] for output in self.outputs if isinstance(output, dict) and "name" in output
         ]
-        self._incoming_edges: list[CycleEdge] | None = None
-        self._outgoing_edges: list[CycleEdge] | None = None
 
     @property
     def lock(self):
@@ -191,15 +189,11 @@ class Vertex:
 
     @property
     def outgoing_edges(self) -> list[CycleEdge]:
-        if self._outgoing_edges is None:
-            self._outgoing_edges = [edge for edge in self.edges if edge.source_id == self.id]
-        return self._outgoing_edges
+        return self.graph.get_vertex_edges(self.id, is_target=False)
 
     @property
     def incoming_edges(self) -> list[CycleEdge]:
-        if self._incoming_edges is None:
-            self._incoming_edges = [edge for edge in self.edges if edge.target_id == self.id]
-        return self._incoming_edges
+        return self.graph.get_vertex_edges(self.id, is_source=False)
 
     # Get edge connected to an output of a certain name
     def get_incoming_edge_by_target_param(self, target_param: str) -> str | None:
@@ -234,6 +228,51 @@ class Vertex:
         self.built_object = state.get("built_object") or UnbuiltObject()
         self.built_result = state.get("built_result") or UnbuiltResult()
 
+    def fork(self, graph: Graph) -> Vertex:
+        """Returns a copy of this vertex bound to ``graph`` for a single run.
+
+        The parsed template data (``data``/``full_data``), outputs and the compiled component
+        class are shared with this vertex; only the state that a build mutates is copied.
+        Vertex references in ``params`` still point to this vertex's graph until
+        :meth:`rebind_params` is called with the new graph's vertex map.
+        """
+        new_vertex = object.__new__(type(self))
+        new_vertex.__dict__.update(self.__dict__)
+        new_vertex.graph = graph
+        new_vertex._lock = None
+        new_vertex.params = dict(self.params)
+        new_vertex.raw_params = dict(getattr(self, "raw_params", self.params))
+        new_vertex.results = dict(self.results)
+        new_vertex.artifacts = dict(self.artifacts)
+        new_vertex.artifacts_type = dict(self.artifacts_type)
+        new_vertex.outputs_logs = dict(self.outputs_logs)
+        new_vertex.logs = dict(self.logs)
+        new_vertex.steps_ran = list(self.steps_ran)
+        new_vertex.log_transaction_tasks = set()
+        # Steps are bound methods, so they must be re-bound to the new vertex
+        new_vertex.steps = [
+            getattr(new_vertex, step.__name__) if getattr(step, "__self__", None) is self else step
+            for step in self.steps
+        ]
+        if self.custom_component is not None:
+            new_vertex.custom_component = self.custom_component.fork(new_vertex)
+        return new_vertex
+
+    def rebind_params(self, vertex_map: dict[str, Vertex]) -> None:
+        """Points the vertex references held in ``params`` and ``raw_params`` to the vertices in ``vertex_map``."""
+
+        def rebind(value):
+            if isinstance(value, Vertex):
+                return vertex_map.get(value.id, value)
+            if isinstance(value, list) and any(isinstance(item, Vertex) for item in value):
+                return [rebind(item) for item in value]
+            if isinstance(value, dict) and any(isinstance(item, Vertex) for item in value.values()):
+                return {key: rebind(item) for key, item in value.items()}
+            return value
+
+        self.params = {key: rebind(value) for key, value in self.params.items()}
+        self.raw_params = {key: rebind(value) for key, value in self.raw_params.items()}
+
     def set_top_level(self, top_level_vertices: list[str]) -> None:
         self.parent_is_top_level = self.parent_node_id in top_level_vertices
 
@@ -778,7 +817,7 @@ class Vertex:
             return self.built_object
 
         # Get the requester edge
-        requester_edge = next((edge for edge in self.edges if edge.target_id == requester.id), None)
+        requester_edge = self.graph.get_edge(self.id, requester.id)
         # Return the result of the requester edge
         return (
             None
@@ -0,0 +1,177 @@
+"""On-disk index of the templates of the built-in components.
+
+Building the component catalogue imports every module of ``axf.components`` and
+instantiates every component class just to render its template, which takes seconds
+on each process start. The index stores the rendered templates per module together
+with a hash of the module source, so a warm start reads one file and imports no
+component modules at all. Modules whose source changed since the index was written
+are imported and rendered again, and the index is rewritten.
+
+The whole index is keyed by the axf version and a signature of the rest of the axf
+sources (templates also depend on base classes and inputs), so upgrading or editing
+axf itself rebuilds it from scratch.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from axf.log.logger import logger
+
+INDEX_FORMAT = 1
+INDEX_FILE_NAME = "component_index.json"
+
+
+def _axf_version() -> str:
+    try:
+        return importlib.metadata.version("axf")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def iter_component_modules(package_path: str | Path, prefix: str) -> list[tuple[str, Path]]:
+    """List the modules of a package and its subpackages without importing them.
+
+    Modules are returned in the order of ``pkgutil.walk_packages``: sorted by file name,
+    each package followed by its own modules. Packages map to their ``__init__.py``.
+
+    Args:
+        package_path: Directory of the package.
+        prefix: Dotted name of the package followed by a dot, e.g. ``"axf.components."``.
+
+    Returns:
+        A list of (module name, source file) pairs.
+    """
+    modules: list[tuple[str, Path]] = []
+    for entry in sorted(os.scandir(package_path), key=lambda entry: entry.name):
+        if entry.is_dir():
+            init_file = Path(entry.path) / "__init__.py"
+            if "." in entry.name or not init_file.is_file():
+                continue
+            modules.append((prefix + entry.name, init_file))
+            modules.extend(iter_component_modules(entry.path, f"{prefix}{entry.name}."))
+        elif entry.name.endswith(".py") and entry.name != "__init__.py" and "." not in entry.name[:-3]:
+            modules.append((prefix + entry.name[:-3], Path(entry.path)))
+    return modules
+
+
+def source_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def framework_signature(package_root: Path, excluded_dir: Path) -> str:
+    """Return a signature of the axf sources outside the component modules.
+
+    Uses file sizes and modification times rather than contents, which is enough to notice
+    edits and cheap enough to run on every start.
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(package_root):
+        if Path(root) == excluded_dir:
+            dirs.clear()
+            continue
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(".py"):
+                continue
+            stat = Path(root, name).stat()
+            digest.update(
+                f"{Path(root, name).relative_to(package_root)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode()
+            )
+    return digest.hexdigest()
+
+
+class ComponentIndex:
+    """Templates of the built-in components per module, persisted as a JSON file.
+
+    Args:
+        path: Location of the index file. ``None`` keeps the index in memory only.
+        key: Identifies the axf build the templates were rendered with. An index file
+            written with another key is ignored.
+    """
+
+    def __init__(self, path: str | Path | None, key: str) -> None:
+        self.path = Path(path) if path else None
+        self.key = key
+        self.modules: dict[str, dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str | Path | None, key: str) -> ComponentIndex:
+        """Read the index at ``path``, or return an empty one if it is missing, corrupt or stale."""
+        index = cls(path, key)
+        if index.path is None or not index.path.exists():
+            return index
+        try:
+            data = orjson.loads(index.path.read_bytes())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.debug(f"Ignoring unreadable component index {index.path}: {e}")
+            return index
+        if not isinstance(data, dict) or data.get("format") != INDEX_FORMAT or data.get("key") != key:
+            logger.debug(f"Ignoring component index {index.path} written by another axf build")
+            return index
+        index.modules = data.get("modules") or {}
+        return index
+
+    def get(self, modname: str, digest: str) -> tuple[str, dict] | None:
+        """Return the (top-level package, templates) of a module if its source did not change."""
+        entry = self.modules.get(modname)
+        if entry is None or entry.get("digest") != digest:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["top_level"], entry["components"]
+
+    def put(self, modname: str, digest: str, top_level: str, components: dict) -> None:
+        """Store the templates of a module. Templates that can't be written as JSON are not indexed."""
+        try:
+            orjson.dumps(components)
+        except TypeError as e:
+            logger.debug(f"Not indexing module {modname}: {e}")
+            self.discard(modname)
+            return
+        self.modules[modname] = {"digest": digest, "top_level": top_level, "components": components}
+        self.dirty = True
+
+    def discard(self, modname: str) -> None:
+        if self.modules.pop(modname, None) is not None:
+            self.dirty = True
+
+    def retain(self, modnames: set[str]) -> None:
+        """Drop the entries of modules that no longer exist."""
+        for modname in [modname for modname in self.modules if modname not in modnames]:
+            self.discard(modname)
+
+    def save(self) -> None:
+        """Write the index if it changed. The file is replaced atomically, so readers never see a partial index."""
+        if self.path is None or not self.dirty:
+            return
+        data = {"format": INDEX_FORMAT, "key": self.key, "modules": self.modules}
+        try:
+            payload = orjson.dumps(data)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(payload)
+                Path(tmp_name).replace(self.path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not write component index {self.path}: {e}")
+            return
+        self.dirty = False
+
+
+def index_key(package_root: Path, components_dir: Path) -> str:
+    return f"{_axf_version()}:{framework_signature(package_root, components_dir)}"
@@ -1,12 +1,18 @@
 import asyncio
 import importlib
 import json
-import pkgutil
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional
 
 from axf.constants import BASE_COMPONENTS_PATH
 from axf.custom.utils import abuild_custom_components, create_component_template
+from axf.interface.component_index import (
+    INDEX_FILE_NAME,
+    ComponentIndex,
+    index_key,
+    iter_component_modules,
+    source_digest,
+)
 from axf.log.logger import logger
 
 if TYPE_CHECKING:
@@ -31,13 +37,20 @@ class ComponentCache:
 component_cache = ComponentCache()
 
 
-async def import_axiestudio_components():
+async def import_axiestudio_components(index_path: str | Path | None = None):
     """Asynchronously discovers and loads all built-in AxieStudio components with module-level parallelization.
 
-    Scans the `lfx.components` package and its submodules in parallel, instantiates classes that are subclasses
+    Scans the `axf.components` package and its submodules in parallel, instantiates classes that are subclasses
     of `Component` or `CustomComponent`, and generates their templates. Components are grouped by their
     top-level subpackage name.
 
+    With an index path, templates of modules whose source is unchanged since the index was written are read
+    from the index instead, without importing the module. The index is updated with the modules that had to
+    be loaded.
+
+    Args:
+        index_path: Location of the component index file. ``None`` loads every module.
+
     Returns:
         A dictionary with a "components" key mapping top-level package names to their component templates.
     """
@@ -48,18 +61,34 @@ async def import_axiestudio_components():
         logger.error(f"Failed to import axiestudio.components package: {e}", exc_info=True)
         return {"components": modules_dict}
 
-    # Collect all module names to process
-    module_names = []
-    for _, modname, _ in pkgutil.walk_packages(components_pkg.__path__, prefix=components_pkg.__name__ + "."):
+    # Collect all module names to process, without importing the packages
+    components_dir = Path(components_pkg.__path__[0])
+    module_files = [
+        (modname, path)
+        for modname, path in iter_component_modules(components_dir, prefix=components_pkg.__name__ + ".")
         # Skip if the module is in the deactivated folder
-        if "deactivated" not in modname:
-            module_names.append(modname)
+        if "deactivated" not in modname
+    ]
 
-    if not module_names:
+    if not module_files:
         return {"components": modules_dict}
 
+    index: ComponentIndex | None = None
+    digests: dict[str, str] = {}
+    if index_path is not None:
+        index, digests = await asyncio.to_thread(_read_component_index, index_path, components_dir, module_files)
+
+    indexed_results = {}
+    module_names = []
+    for modname, _ in module_files:
+        indexed = index.get(modname, digests[modname]) if index is not None else None
+        if indexed is not None:
+            indexed_results[modname] = indexed
+        else:
+            module_names.append(modname)
+
     # Create tasks for parallel module processing
-    tasks = [asyncio.to_thread(_process_single_module, modname) for modname in module_names]
+    tasks = [asyncio.to_thread(_load_module_components, modname) for modname in module_names]
 
     # Wait for all modules to be processed
     try:
@@ -68,12 +97,28 @@ async def import_axiestudio_components():
         logger.error(f"Error during parallel module processing: {e}", exc_info=True)
         return {"components": modules_dict}
 
-    # Merge results from all modules
-    for result in module_results:
+    loaded_results = {}
+    for modname, result in zip(module_names, module_results, strict=True):
         if isinstance(result, Exception):
             logger.warning(f"Module processing failed: {result}")
-            continue
-
+        elif result is not None:
+            top_level, components, complete = result
+            loaded_results[modname] = (top_level, components)
+            # Modules that failed to load may work once a dependency is installed, so only index complete ones
+            if index is not None and complete:
+                index.put(modname, digests[modname], top_level, components)
+                continue
+        if index is not None:
+            index.discard(modname)
+
+    if index is not None:
+        logger.debug(f"Read {index.hits} component modules from the index, loaded {len(module_names)}")
+        index.retain({modname for modname, _ in module_files})
+        await asyncio.to_thread(index.save)
+
+    # Merge results from all modules, in module order
+    for modname, _ in module_files:
+        result = indexed_results.get(modname) or loaded_results.get(modname)
         if result and isinstance(result, tuple) and len(result) == EXPECTED_RESULT_LENGTH:
             top_level, components = result
             if top_level and components:
@@ -84,6 +129,15 @@ async def import_axiestudio_components():
     return {"components": modules_dict}
 
 
+def _read_component_index(
+    index_path: str | Path, components_dir: Path, module_files: list[tuple[str, Path]]
+) -> tuple[ComponentIndex, dict[str, str]]:
+    key = index_key(components_dir.parent, components_dir)
+    index = ComponentIndex.load(index_path, key)
+    digests = {modname: source_digest(path) for modname, path in module_files}
+    return index, digests
+
+
 def _process_single_module(modname: str) -> tuple[str, dict] | None:
     """Process a single module and return its components.
 
@@ -93,6 +147,20 @@ def _process_single_module(modname: str) -> tuple[str, dict] | None:
     Returns:
         A tuple of (top_level_package, components_dict) or None if processing failed
     """
+    result = _load_module_components(modname)
+    if result is None:
+        return None
+    top_level, module_components, _ = result
+    return (top_level, module_components)
+
+
+def _load_module_components(modname: str) -> tuple[str, dict, bool] | None:
+    """Import a module and render the templates of its components.
+
+    Returns:
+        A tuple of (top_level_package, components_dict, complete), where complete is False if some
+        component classes failed, or None if the module could not be imported.
+    """
     try:
         module = importlib.import_module(modname)
     except (ImportError, AttributeError) as e:
@@ -146,7 +214,7 @@ def _process_single_module(modname: str) -> tuple[str, dict] | None:
             f"in module '{modname}' due to instantiation failure: {', '.join(failed_count)}"
         )
     logger.debug(f"Processed module {modname}")
-    return (top_level, module_components)
+    return (top_level, module_components, not failed_count)
 
 
 async def _determine_loading_strategy(settings_service: "SettingsService") -> dict:
@@ -186,14 +254,14 @@ async def get_and_cache_all_types_dict(
     """Retrieves and caches the complete dictionary of component types and templates.
 
     Supports both full and partial (lazy) loading. If the cache is empty, loads built-in AxieStudio
-    components and either fully loads all components or loads only their metadata, depending on the
-    lazy loading setting. Merges built-in and custom components into the cache and returns the
-    resulting dictionary.
+    components, from the component index where possible, and either fully loads all custom components
+    or loads only their metadata, depending on the lazy loading setting. Merges built-in and custom
+    components into the cache and returns the resulting dictionary.
     """
     if component_cache.all_types_dict is None:
         logger.debug("Building components cache")
 
-        axiestudio_components = await import_axiestudio_components()
+        axiestudio_components = await import_axiestudio_components(get_component_index_path(settings_service))
         custom_components_dict = await _determine_loading_strategy(settings_service)
 
         # merge the dicts
@@ -206,6 +274,18 @@ async def get_and_cache_all_types_dict(
     return component_cache.all_types_dict
 
 
+def get_component_index_path(settings_service: "SettingsService") -> Path | None:
+    """Return the location of the component index, or None if the index is disabled."""
+    settings = settings_service.settings
+    if not settings.use_component_index:
+        return None
+    if settings.component_index_path:
+        return Path(settings.component_index_path)
+    if settings.config_dir:
+        return Path(settings.config_dir) / INDEX_FILE_NAME
+    return None
+
+
 async def aget_all_types_dict(components_paths: list[str]):
     """Get all types dictionary with full component loading."""
     return await abuild_custom_components(components_paths=components_paths)
@@ -428,7 +508,7 @@ async def get_type_dict(component_type: str, settings_service: Optional["Setting
     """Get a specific component type dictionary, loading if needed."""
     if settings_service is None:
         # Import here to avoid circular imports
-        from axiestudio.services.deps import get_settings_service
+        from axf.services.deps import get_settings_service
 
         settings_service = get_settings_service()
 
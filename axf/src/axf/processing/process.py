@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import json
 from typing import TYPE_CHECKING, Any, cast
 
@@ -53,8 +54,12 @@ async def run_graph_internal(
     inputs: list[InputValueRequest] | None = None,
     outputs: list[str] | None = None,
     event_manager: EventManager | None = None,
+    concurrency: int = 1,
 ) -> tuple[list[RunOutputs], str]:
-    """Run the graph and generate the result."""
+    """Run the graph and generate the result.
+
+    With ``concurrency`` above 1, up to that many inputs run at once, each on its own fork of the graph.
+    """
     inputs = inputs or []
     effective_session_id = session_id or flow_id
     components = []
@@ -83,13 +88,14 @@ async def run_graph_internal(
         session_id=effective_session_id or "",
         fallback_to_env_vars=fallback_to_env_vars,
         event_manager=event_manager,
+        concurrency=concurrency,
     )
     return run_outputs, effective_session_id
 
 
 async def run_graph(
     graph: Graph,
-    input_value: str,
+    input_value: str | list[str],
     input_type: str,
     output_type: str,
     *,
@@ -97,12 +103,15 @@ async def run_graph(
     fallback_to_env_vars: bool = False,
     output_component: str | None = None,
     stream: bool = False,
+    event_manager: EventManager | None = None,
+    concurrency: int = 1,
 ) -> list[RunOutputs]:
     """Runs the given AxieStudio Graph with the specified input and returns the outputs.
 
     Args:
         graph (Graph): The graph to be executed.
-        input_value (str): The input value to be passed to the graph.
+        input_value (str | list[str]): The input value to be passed to the graph, or a list of input values
+            to run the graph once for each.
         input_type (str): The type of the input value.
         output_type (str): The type of the desired output.
         session_id (str | None, optional): The session ID to be used for the flow. Defaults to None.
@@ -110,12 +119,17 @@ async def run_graph(
             Defaults to False.
         output_component (Optional[str], optional): The specific output component to retrieve. Defaults to None.
         stream (bool, optional): Whether to stream the results or not. Defaults to False.
+        event_manager (EventManager | None, optional): Receives the events (e.g. tokens) emitted while
+            the graph runs. Defaults to None.
+        concurrency (int, optional): Maximum number of input values run at the same time, each on its own
+            fork of the graph. Defaults to 1.
 
     Returns:
-        List[RunOutputs]: A list of RunOutputs objects representing the outputs of the graph.
+        List[RunOutputs]: A list of RunOutputs objects representing the outputs of the graph, one per input value.
 
     """
-    inputs = [InputValue(components=[], input_value=input_value, type=input_type)]
+    input_values = input_value if isinstance(input_value, list) else [input_value]
+    inputs = [InputValue(components=[], input_value=value, type=input_type) for value in input_values]
     if output_component:
         outputs = [output_component]
     else:
@@ -143,6 +157,8 @@ async def run_graph(
         stream=stream,
         session_id=session_id,
         fallback_to_env_vars=fallback_to_env_vars,
+        event_manager=event_manager,
+        concurrency=concurrency,
     )
 
 
@@ -226,6 +242,45 @@ def process_tweaks(
     return graph_data
 
 
+def apply_tweaks_to_graph(graph: Graph, tweaks: Tweaks | dict[str, Any]) -> Graph:
+    """Apply tweaks to the vertices of a forked graph, the same way :func:`process_tweaks` applies them to graph data.
+
+    A forked graph shares its parsed templates with the graph it was forked from, so the template of each
+    tweaked vertex is copied before it is changed and the vertex params are rebuilt from the copy. Vertices
+    that no tweak applies to are left untouched, which keeps this cheap for the common case of a few tweaks.
+
+    :param graph: A graph returned by ``Graph.fork()``.
+    :param tweaks: The tweaks, keyed by vertex id or display name, or global tweaks applied to every vertex.
+    :return: The tweaked graph.
+    """
+    tweaks_dict = cast("dict[str, Any]", tweaks.model_dump()) if not isinstance(tweaks, dict) else tweaks
+    vertices_by_display_name = {vertex.data["node"].get("display_name"): vertex for vertex in graph.vertices}
+
+    vertex_tweaks: dict[str, list[dict[str, Any]]] = {}
+    all_vertices_tweaks = {}
+    for key, value in tweaks_dict.items():
+        if isinstance(value, dict):
+            if (vertex := graph.vertex_map.get(key)) or (vertex := vertices_by_display_name.get(key)):
+                vertex_tweaks.setdefault(vertex.id, []).append(value)
+        else:
+            all_vertices_tweaks[key] = value
+
+    for vertex in graph.vertices:
+        template = vertex.data["node"]["template"]
+        node_tweaks = vertex_tweaks.get(vertex.id, [])
+        if all_vertices_tweaks and any(name in template for name in all_vertices_tweaks):
+            node_tweaks = [*node_tweaks, all_vertices_tweaks]
+        if not node_tweaks:
+            continue
+        vertex.full_data = copy.deepcopy(vertex.full_data)
+        vertex.data = vertex.full_data["data"]
+        for tweaks_ in node_tweaks:
+            apply_tweaks(vertex.full_data, tweaks_)
+        vertex.build_params()
+
+    return graph
+
+
 def process_tweaks_on_graph(graph: Graph, tweaks: dict[str, dict[str, Any]]):
     for vertex in graph.vertices:
         if isinstance(vertex, Vertex) and isinstance(vertex.id, str):
@@ -10,6 +10,7 @@ from axf.log.logger import logger
 from axf.services.schema import ServiceType
 
 if TYPE_CHECKING:
+    from axf.services.http_client.service import HTTPClientService
     from axf.services.interfaces import (
         CacheServiceProtocol,
         ChatServiceProtocol,
@@ -87,6 +88,13 @@ def get_shared_component_cache_service() -> CacheServiceProtocol | None:
     return get_service(ServiceType.SHARED_COMPONENT_CACHE_SERVICE, SharedComponentCacheServiceFactory())
 
 
+def get_http_client_service() -> HTTPClientService | None:
+    """Retrieves the shared HTTP client service instance."""
+    from axf.services.http_client.factory import HTTPClientServiceFactory
+
+    return get_service(ServiceType.HTTP_CLIENT_SERVICE, HTTPClientServiceFactory())
+
+
 def get_chat_service() -> ChatServiceProtocol | None:
     """Retrieves the chat service instance."""
     from axf.services.schema import ServiceType
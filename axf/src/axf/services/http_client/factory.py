@@ -0,0 +1,40 @@
+"""Factory for creating the HTTP client service."""
+
+from typing import TYPE_CHECKING
+
+from axf.services.factory import ServiceFactory
+from axf.services.http_client.service import HTTPClientService
+from axf.services.schema import ServiceType
+
+if TYPE_CHECKING:
+    from axf.services.base import Service
+
+
+class HTTPClientServiceFactory(ServiceFactory):
+    """Factory for creating HTTPClientService instances."""
+
+    def __init__(self) -> None:
+        """Initialize the factory."""
+        super().__init__()
+        self.service_class = HTTPClientService
+        self.dependencies = [ServiceType.SETTINGS_SERVICE]
+
+    def create(self, **kwargs) -> "Service":
+        """Create an HTTPClientService configured from the settings service.
+
+        Args:
+            **kwargs: The dependent services, including settings_service
+
+        Returns:
+            HTTPClientService instance
+        """
+        settings_service = kwargs.get("settings_service")
+        if settings_service is None:
+            return HTTPClientService()
+        settings = settings_service.settings
+        return HTTPClientService(
+            max_connections_per_host=settings.http_client_max_connections_per_host,
+            keepalive_expiry=settings.http_client_keepalive_expiry,
+            http2=settings.http_client_http2,
+            max_clients=settings.http_client_max_clients,
+        )
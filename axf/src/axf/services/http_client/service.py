@@ -0,0 +1,234 @@
+"""Shared, pooled HTTP clients for components.
+
+Opening a new ``httpx`` client for every request means a new connection pool, DNS lookup
+and TLS handshake each time. :class:`HTTPClientService` keeps one keep-alive client per
+origin (scheme, host and port) and TLS settings, so repeated calls to the same API reuse
+their connections. Each client only talks to one origin, so its connection limit is a
+per-host limit.
+
+The clients never store cookies: they are shared by every flow and user of the process.
+Async clients are bound to the event loop they are used on, so they are also keyed by loop.
+
+Clients evicted from the pool are not closed, since a caller may still be using them: they are
+closed at teardown if they are still referenced, and otherwise garbage-collected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import threading
+import weakref
+from collections import Counter, OrderedDict
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import TYPE_CHECKING, Any, NamedTuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from axf.log.logger import logger
+from axf.services.base import Service
+
+if TYPE_CHECKING:
+    from httpx._types import CertTypes, VerifyTypes
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_MAX_CLIENTS = 128
+
+
+class _NoCookiesPolicy(DefaultCookiePolicy):
+    def set_ok(self, cookie, request) -> bool:  # noqa: ARG002
+        return False
+
+    def return_ok(self, cookie, request) -> bool:  # noqa: ARG002
+        return False
+
+
+class _ClientKey(NamedTuple):
+    origin: str
+    verify: Any
+    cert: Any
+    loop_id: int | None
+
+
+def _origin(url: str | httpx.URL) -> str:
+    parts = urlsplit(str(url))
+    if not parts.scheme or not parts.netloc:
+        msg = f"Expected an absolute URL, got {url!r}"
+        raise ValueError(msg)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+class HTTPClientService(Service):
+    """Hands out pooled ``httpx`` clients keyed by origin and TLS settings.
+
+    Args:
+        max_connections_per_host: Maximum number of open connections per client, i.e. per origin.
+        keepalive_expiry: Seconds an idle connection is kept open.
+        http2: Use HTTP/2 where the server supports it (requires the ``h2`` package).
+        max_clients: Maximum number of clients kept; the least recently used are evicted first.
+    """
+
+    name = "http_client_service"
+
+    def __init__(
+        self,
+        *,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = True,
+        max_clients: int = DEFAULT_MAX_CLIENTS,
+    ) -> None:
+        super().__init__()
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_connections_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.max_clients = max_clients
+        self.clients_created = 0
+        self.clients_reused = 0
+        self.clients_evicted = 0
+        self.clients_closed = 0
+        self.requests: Counter[str] = Counter()
+        self._clients: OrderedDict[_ClientKey, httpx.Client] = OrderedDict()
+        self._async_clients: OrderedDict[_ClientKey, tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = (
+            OrderedDict()
+        )
+        self._evicted_clients: weakref.WeakSet[httpx.Client] = weakref.WeakSet()
+        self._evicted_async_clients: weakref.WeakKeyDictionary[httpx.AsyncClient, asyncio.AbstractEventLoop] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._closing: set[asyncio.Future] = set()
+        self._lock = threading.Lock()
+
+    def get_client(
+        self, url: str | httpx.URL, *, verify: VerifyTypes = True, cert: CertTypes | None = None
+    ) -> httpx.Client:
+        """Return the shared synchronous client for the origin of ``url``.
+
+        The client must not be closed by the caller. Pass timeouts, headers and redirect
+        handling per request.
+        """
+        key = _ClientKey(_origin(url), verify, cert, None)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.clients_reused += 1
+                return client
+            client = httpx.Client(
+                verify=verify,
+                cert=cert,
+                http2=self.http2,
+                limits=self.limits,
+                cookies=self._cookie_jar(),
+                event_hooks={"request": [self._count_request]},
+            )
+            self._clients[key] = client
+            self.clients_created += 1
+            for old_client in self._evict(self._clients):
+                self._evicted_clients.add(old_client)
+        return client
+
+    def get_async_client(
+        self, url: str | httpx.URL, *, verify: VerifyTypes = True, cert: CertTypes | None = None
+    ) -> httpx.AsyncClient:
+        """Return the shared async client for the origin of ``url`` on the running event loop.
+
+        The client must not be closed by the caller. Pass timeouts, headers and redirect
+        handling per request.
+        """
+        loop = asyncio.get_running_loop()
+        key = _ClientKey(_origin(url), verify, cert, id(loop))
+        with self._lock:
+            entry = self._async_clients.get(key)
+            if entry is not None and entry[1] is loop:
+                self._async_clients.move_to_end(key)
+                self.clients_reused += 1
+                return entry[0]
+            client = httpx.AsyncClient(
+                verify=verify,
+                cert=cert,
+                http2=self.http2,
+                limits=self.limits,
+                cookies=self._cookie_jar(),
+                event_hooks={"request": [self._acount_request]},
+            )
+            self._async_clients[key] = (client, loop)
+            self.clients_created += 1
+            for old_client, old_loop in self._evict(self._async_clients):
+                self._evicted_async_clients[old_client] = old_loop
+            # Clients of event loops that no longer run can't be used or closed anymore
+            stale_keys = [stale for stale, (_, client_loop) in self._async_clients.items() if client_loop.is_closed()]
+            for stale_key in stale_keys:
+                del self._async_clients[stale_key]
+                self.clients_evicted += 1
+        return client
+
+    @staticmethod
+    def _cookie_jar() -> CookieJar:
+        # httpx copies ``Cookies`` instances into a default jar, so hand it the jar itself
+        return CookieJar(policy=_NoCookiesPolicy())
+
+    def _evict(self, clients: OrderedDict) -> list:
+        evicted = []
+        while len(clients) > self.max_clients:
+            _, client = clients.popitem(last=False)
+            evicted.append(client)
+            self.clients_evicted += 1
+        return evicted
+
+    def _close_async_client(self, client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+        if loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if loop is running_loop:
+            task = loop.create_task(client.aclose())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    def _count_request(self, request: httpx.Request) -> None:
+        self.requests[f"{request.url.scheme}://{request.url.netloc.decode('ascii')}"] += 1
+
+    async def _acount_request(self, request: httpx.Request) -> None:
+        self._count_request(request)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "clients": len(self._clients) + len(self._async_clients),
+                "clients_created": self.clients_created,
+                "clients_reused": self.clients_reused,
+                "clients_evicted": self.clients_evicted,
+                "clients_closed": self.clients_closed,
+                "requests": sum(self.requests.values()),
+                "requests_by_origin": dict(self.requests),
+                "http2": self.http2,
+            }
+
+    async def teardown(self) -> None:
+        with self._lock:
+            clients, self._clients = [*self._clients.values(), *self._evicted_clients], OrderedDict()
+            async_clients = [*self._async_clients.values(), *self._evicted_async_clients.items()]
+            self._async_clients = OrderedDict()
+            self._evicted_clients = weakref.WeakSet()
+            self._evicted_async_clients = weakref.WeakKeyDictionary()
+            self.clients_closed += len(clients) + len(async_clients)
+        for client in clients:
+            client.close()
+        for client, loop in async_clients:
+            try:
+                if loop is asyncio.get_running_loop():
+                    await client.aclose()
+                else:
+                    self._close_async_client(client, loop)
+            except Exception:  # noqa: BLE001
+                logger.debug("Error closing HTTP client", exc_info=True)
@@ -18,3 +18,4 @@ class ServiceType(str, Enum):
     STORE_SERVICE = "store_service"
     JOB_QUEUE_SERVICE = "job_queue_service"
     SHARED_COMPONENT_CACHE_SERVICE = "shared_component_cache_service"
+    HTTP_CLIENT_SERVICE = "http_client_service"
@@ -275,6 +275,25 @@ class Settings(BaseSettings):
     lazy_load_components: bool = False
     """If set to True, AxieStudio will only partially load components at startup and fully load them on demand.
     This significantly reduces startup time but may cause a slight delay when a component is first used."""
+    use_component_index: bool = True
+    """If set to True, the templates of the built-in components are stored in an index file and read from it at
+    startup, so unchanged component modules are not imported."""
+    component_index_path: str | None = None
+    """Location of the component index file. Defaults to component_index.json in the config directory."""
+    component_class_cache_size: int = Field(default=1024, ge=0)
+    """Maximum number of compiled component classes kept in memory. Set to 0 to disable the cache."""
+    component_class_cache_dir: str | None = None
+    """If set, compiled component bytecode is also stored in this directory and reused across processes."""
+    stream_message_update_interval: float = Field(default=0.0, ge=0)
+    """Seconds between updates of a message in the database while it is streamed. 0 stores it only at the end."""
+    http_client_max_connections_per_host: int = Field(default=20, ge=1)
+    """Maximum number of open connections per host of the HTTP clients that components share."""
+    http_client_keepalive_expiry: float = Field(default=30.0, ge=0)
+    """Seconds an idle connection of the shared HTTP clients is kept open for reuse."""
+    http_client_http2: bool = True
+    """If set to True, the shared HTTP clients use HTTP/2 with servers that support it."""
+    http_client_max_clients: int = Field(default=128, ge=1)
+    """Maximum number of shared HTTP clients (one per host and TLS settings) kept open."""
 
     # Starter Projects
     create_starter_projects: bool = True
@@ -1,4 +1,14 @@
-from axf.services.deps import get_settings_service
+from __future__ import annotations
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING
+
+import httpx
+
+from axf.services.deps import get_http_client_service, get_settings_service
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
 
 DEFAULT_USER_AGENT = "AxieStudio"
 
@@ -16,3 +26,28 @@ def get_user_agent():
     except (AttributeError, TypeError):
         pass
     return DEFAULT_USER_AGENT
+
+
+@asynccontextmanager
+async def pooled_async_client(url: str) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the shared keep-alive client for the host of ``url``.
+
+    Falls back to a client that is closed on exit if the HTTP client service is not available.
+    """
+    http_client_service = get_http_client_service()
+    if http_client_service is None:
+        async with httpx.AsyncClient() as client:
+            yield client
+        return
+    yield http_client_service.get_async_client(url)
+
+
+@contextmanager
+def pooled_client(url: str) -> Iterator[httpx.Client]:
+    """Synchronous version of :func:`pooled_async_client`."""
+    http_client_service = get_http_client_service()
+    if http_client_service is None:
+        with httpx.Client() as client:
+            yield client
+        return
+    yield http_client_service.get_client(url)
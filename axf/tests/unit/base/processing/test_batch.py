@@ -0,0 +1,166 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from axf.base.processing.batch import BatchRunner, is_rate_limit_error, is_transient_error, retry_after
+from axf.components.processing.batch_run import BatchRunComponent
+from axf.schema.dataframe import DataFrame
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class Response:
+    def __init__(self, headers: dict[str, str]) -> None:
+        self.headers = headers
+        self.status_code = 429
+
+
+class HTTPError(Exception):
+    def __init__(self, response: Response) -> None:
+        super().__init__("too many requests")
+        self.response = response
+
+
+def test_error_classification():
+    assert is_rate_limit_error(RateLimitError())
+    assert is_rate_limit_error(HTTPError(Response({})))
+    assert not is_rate_limit_error(ValueError("bad input"))
+    assert is_transient_error(TimeoutError())
+    assert not is_transient_error(ValueError("bad input"))
+    assert retry_after(HTTPError(Response({"retry-after": "2"}))) == 2.0
+    assert retry_after(HTTPError(Response({"retry-after-ms": "250"}))) == 0.25
+    assert retry_after(HTTPError(Response({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}))) is None
+
+
+async def test_results_keep_item_order_and_respect_limit():
+    running = 0
+    max_running = 0
+
+    async def invoke(item):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01 * (item % 3))
+        running -= 1
+        return item * 2
+
+    runner = BatchRunner(invoke, max_concurrency=4)
+    results = await runner.run_chunk(list(range(20)), start=100)
+
+    assert [result.value for result in results] == [item * 2 for item in range(20)]
+    assert [result.index for result in results] == list(range(100, 120))
+    assert max_running == 4
+
+
+async def test_failed_rows_are_captured_not_raised():
+    attempts: dict[int, int] = {}
+
+    async def invoke(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == 1:
+            msg = "bad input"
+            raise ValueError(msg)
+        if item == 2 and attempts[item] == 1:
+            raise ConnectionError
+        return item
+
+    runner = BatchRunner(invoke, max_retries=2, base_delay=0.001)
+    results = await runner.run_chunk([0, 1, 2])
+
+    assert [result.value for result in results] == [0, None, 2]
+    assert isinstance(results[1].error, ValueError)
+    # Errors that can't be fixed by retrying are not retried
+    assert attempts == {0: 1, 1: 1, 2: 2}
+    assert runner.failed == 1
+    assert runner.retries == 1
+
+
+async def test_rate_limit_lowers_concurrency_and_retries():
+    rejected = set()
+    limits = []
+
+    async def invoke(item):
+        await asyncio.sleep(0.005)
+        if item < 4 and item not in rejected:
+            rejected.add(item)
+            raise RateLimitError
+        return item
+
+    runner = BatchRunner(invoke, max_concurrency=8, max_retries=3, base_delay=0.01)
+    release = runner.limiter.release
+
+    async def tracked_release(**kwargs):
+        await release(**kwargs)
+        limits.append(runner.limiter.limit)
+
+    runner.limiter.release = tracked_release
+    results = await runner.run_chunk(list(range(16)))
+
+    assert [result.value for result in results] == list(range(16))
+    assert runner.rate_limited == 4
+    assert runner.failed == 0
+    # The concurrent rejections count as one signal and halve the limit once
+    assert min(limits) == 4
+    # Successes grow it back
+    assert limits[-1] > 4
+
+
+async def test_retries_are_bounded():
+    async def invoke(_item):
+        raise RateLimitError
+
+    runner = BatchRunner(invoke, max_retries=2, base_delay=0.001)
+    (result,) = await runner.run_chunk(["row"])
+
+    assert isinstance(result.error, RateLimitError)
+    assert result.attempts == 3
+
+
+async def test_cancelling_a_chunk_cancels_its_rows():
+    started = asyncio.Event()
+    cancelled = []
+
+    async def invoke(item):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+
+    task = asyncio.create_task(BatchRunner(invoke, max_concurrency=2).run_chunk([0, 1, 2]))
+    await started.wait()
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert sorted(cancelled) == [0, 1]
+
+
+class EchoModel:
+    def with_config(self, _config):
+        return self
+
+    async def ainvoke(self, conversation):
+        return f"echo {conversation[-1]['content']}"
+
+
+async def test_batch_run_sends_the_rows_of_each_chunk_without_keeping_them():
+    component = BatchRunComponent()
+    component.set(
+        model=EchoModel(), df=DataFrame([{"text": str(i)} for i in range(5)]), column_name="text", chunk_size=2
+    )
+    component._event_manager = MagicMock()
+    component._current_output = "batch_results"
+
+    result = await component.run_batch()
+
+    assert list(result["model_response"]) == [f"echo {i}" for i in range(5)]
+    sent = [call.kwargs["data"] for call in component._event_manager.on_log.call_args_list]
+    partial = [data for data in sent if data["name"].startswith("Rows")]
+    assert [data["name"] for data in partial] == ["Rows 1-2", "Rows 3-4", "Rows 5-5"]
+    assert [row["model_response"] for row in partial[1]["message"]] == ["echo 2", "echo 3"]
+    assert not any(log.name.startswith("Rows") for log in component._logs)
@@ -0,0 +1,120 @@
+import asyncio
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from axf.cli.capture import CaptureBuffer, capture_run_output, install_capture_streams
+from axf.cli.common import execute_graph_with_capture
+
+
+class TestCaptureBuffer:
+    def test_unbounded(self):
+        buffer = CaptureBuffer(None)
+        buffer.write("a" * 10)
+        buffer.write("b" * 10)
+        assert buffer.getvalue() == "a" * 10 + "b" * 10
+        assert not buffer.truncated
+
+    def test_cap_keeps_first_chars(self):
+        buffer = CaptureBuffer(5)
+        buffer.write("abc")
+        buffer.write("defgh")
+        buffer.write("ijk")
+        assert buffer.dropped_chars == 6
+        assert buffer.getvalue().startswith("abcde\n")
+        assert "6 characters truncated" in buffer.getvalue()
+
+    def test_ring_buffer_keeps_last_chars(self):
+        buffer = CaptureBuffer(5, ring_buffer=True)
+        for chunk in ("abc", "defgh", "ij"):
+            buffer.write(chunk)
+        assert buffer.dropped_chars == 5
+        assert buffer.getvalue().endswith("fghij")
+        assert buffer.getvalue().startswith("[... 5 characters truncated ...]")
+
+    def test_ring_buffer_single_oversized_write(self):
+        buffer = CaptureBuffer(3, ring_buffer=True)
+        buffer.write("abcdefg")
+        assert buffer.getvalue().endswith("efg")
+        assert buffer.dropped_chars == 4
+
+    def test_ring_buffer_oversized_write_evicts_older_chunks(self):
+        buffer = CaptureBuffer(3, ring_buffer=True)
+        buffer.write("ab")
+        buffer.write("cdefg")
+        assert buffer.getvalue().endswith("efg")
+        assert buffer.dropped_chars == 4
+
+    def test_ring_buffer_with_zero_limit_keeps_nothing(self):
+        buffer = CaptureBuffer(0, ring_buffer=True)
+        buffer.write("abc")
+        buffer.write("de")
+        assert buffer.dropped_chars == 5
+        assert buffer.getvalue() == "[... 5 characters truncated ...]\n"
+
+    def test_negative_limit_rejected(self):
+        with pytest.raises(ValueError, match="max_chars"):
+            CaptureBuffer(-1)
+
+
+def test_install_is_idempotent():
+    install_capture_streams()
+    stdout = sys.stdout
+    install_capture_streams()
+    assert sys.stdout is stdout
+
+
+def test_writes_outside_a_run_reach_original_stream(capsys):
+    with capture_run_output() as capture:
+        print("inside")  # noqa: T201
+    print("outside")  # noqa: T201
+    assert capture.getvalue() == "inside\n"
+    assert capsys.readouterr().out == "outside\n"
+
+
+async def test_concurrent_runs_capture_only_their_own_output():
+    async def run(name):
+        with capture_run_output() as capture:
+            for i in range(3):
+                print(f"{name}-{i}")  # noqa: T201
+                await asyncio.sleep(0)
+            await asyncio.to_thread(print, f"{name}-thread", file=sys.stderr)
+        return capture
+
+    first, second = await asyncio.gather(run("first"), run("second"))
+
+    assert first.stdout.getvalue() == "first-0\nfirst-1\nfirst-2\n"
+    assert first.stderr.getvalue() == "first-thread\n"
+    assert second.stdout.getvalue() == "second-0\nsecond-1\nsecond-2\n"
+    assert second.stderr.getvalue() == "second-thread\n"
+
+
+async def test_execute_graph_with_capture_applies_limit():
+    async def async_start(_inputs):
+        print("x" * 100)  # noqa: T201
+        yield MagicMock()
+
+    graph = MagicMock()
+    graph.async_start = async_start
+
+    results, logs = await execute_graph_with_capture(graph, "input", max_capture_chars=10, ring_buffer=True)
+
+    assert len(results) == 1
+    assert logs.endswith("xxxxxxxxx\n")
+    assert "91 characters truncated" in logs
+
+
+async def test_execute_graph_with_capture_adds_stderr_to_error():
+    async def async_start(_inputs):
+        print("boom details", file=sys.stderr)  # noqa: T201
+        msg = "Execution failed"
+        raise RuntimeError(msg)
+        yield  # pragma: no cover
+
+    graph = MagicMock()
+    graph.async_start = async_start
+
+    with pytest.raises(RuntimeError, match="Execution failed") as exc_info:
+        await execute_graph_with_capture(graph, "input")
+    assert "Captured stderr:\nboom details" in str(exc_info.value)
@@ -0,0 +1,104 @@
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessageChunk
+
+from axf.cli.serve_app import FlowMeta, StreamOptions, create_multi_serve_app
+from axf.components.input_output import ChatInput, ChatOutput
+from axf.custom.custom_component.component import Component
+from axf.graph import Graph
+from axf.io import MessageTextInput, Output
+from axf.schema.message import Message
+
+
+class WordStreamer(Component):
+    display_name = "Word Streamer"
+    inputs = [
+        MessageTextInput(name="input_value", display_name="Input"),
+        MessageTextInput(name="suffix", display_name="Suffix", value=""),
+    ]
+    outputs = [Output(name="message", display_name="Message", method="stream_words")]
+
+    def stream_words(self) -> Message:
+        words = [*str(self.input_value).split(), self.suffix]
+
+        def chunks():
+            for word in words:
+                yield AIMessageChunk(content=f"{word} ")
+
+        return Message(text=chunks())
+
+
+def _client(monkeypatch, stream_options=None):
+    monkeypatch.setenv("AXIESTUDIO_API_KEY", "test-key")
+    chat_input = ChatInput(_id="chat_input")
+    chat_input.set(should_store_message=False)
+    streamer = WordStreamer(_id="streamer")
+    streamer.set(input_value=chat_input.message_response)
+    chat_output = ChatOutput(_id="chat_output")
+    chat_output.set(input_value=streamer.stream_words)
+    graph = Graph(chat_input, chat_output)
+    graph.prepare()
+    meta = FlowMeta(id="flow", relative_path="flow.json", title="Flow")
+    app = create_multi_serve_app(
+        root_dir=Path(),
+        graphs={"flow": graph},
+        metas={"flow": meta},
+        verbose_print=print,
+        stream_options=stream_options,
+    )
+    return TestClient(app)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    return _client(monkeypatch)
+
+
+def _stream(client, payload):
+    response = client.post("/flows/flow/stream", json=payload, headers={"x-api-key": "test-key"})
+    assert response.status_code == 200
+    return [json.loads(chunk) for chunk in response.text.split("\n\n") if chunk.strip()]
+
+
+def test_stream_sends_tokens_before_end(client):
+    events = _stream(client, {"input_value": "hello streaming world", "session_id": "session-1"})
+
+    event_types = [event["event"] for event in events]
+    assert event_types == ["add_message", "token", "token", "token", "token", "end"]
+    assert [event["data"]["chunk"] for event in events if event["event"] == "token"] == [
+        "hello ",
+        "streaming ",
+        "world ",
+        " ",
+    ]
+    result = events[-1]["data"]["result"]
+    assert result["success"] is True
+    assert result["result"] == "hello streaming world  "
+    assert result["session_id"] == "session-1"
+
+
+def test_stream_applies_tweaks_per_request(client):
+    events = _stream(client, {"input_value": "hi", "tweaks": {"streamer": {"suffix": "there"}}})
+    assert events[-1]["data"]["result"]["result"] == "hi there "
+
+    events = _stream(client, {"input_value": "hi"})
+    assert events[-1]["data"]["result"]["result"] == "hi  "
+
+
+def test_stream_reports_unknown_output_component(client):
+    events = _stream(client, {"input_value": "hi", "output_component": "missing"})
+
+    result = events[-1]["data"]["result"]
+    assert result["success"] is False
+
+
+def test_stream_coalesces_tokens(monkeypatch):
+    client = _client(monkeypatch, StreamOptions(queue_size=2, coalesce_bytes=1024))
+
+    events = _stream(client, {"input_value": "hello streaming world"})
+
+    assert [event["event"] for event in events] == ["add_message", "token", "end"]
+    assert events[1]["data"]["chunk"] == "hello streaming world  "
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from axf.custom.custom_component.component import Component
+from axf.events.event_manager import create_stream_tokens_event_manager
+from axf.schema.message import Message
+
+
+class Streamer(Component):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.updates: list[str] = []
+
+    async def _update_stored_message(self, message: Message) -> Message:
+        self.updates.append(message.text)
+        return message
+
+
+def _streamer(update_interval: float = 0.0) -> Streamer:
+    component = Streamer()
+    component.set_event_manager(create_stream_tokens_event_manager(asyncio.Queue()))
+    component._get_stream_update_interval = lambda: update_interval
+    return component
+
+
+async def test_stream_joins_chunks():
+    component = _streamer()
+    chunks = (AIMessageChunk(content=str(i)) for i in range(1000))
+
+    text = await component._stream_message(chunks, Message(id="m1", text=""))
+
+    assert text == "".join(str(i) for i in range(1000))
+    assert component.updates == []
+
+
+async def test_stream_stores_partial_text_at_interval():
+    component = _streamer(update_interval=0.01)
+
+    async def chunks():
+        for word in ("a", "b", "c"):
+            await asyncio.sleep(0.02)
+            yield AIMessageChunk(content=word)
+
+    text = await component._stream_message(chunks(), Message(id="m1", text=""))
+
+    assert text == "abc"
+    assert component.updates == ["a", "ab", "abc"]
+
+
+async def test_cancelled_stream_keeps_partial_text():
+    component = _streamer()
+    started = asyncio.Event()
+
+    async def chunks():
+        yield AIMessageChunk(content="partial ")
+        yield AIMessageChunk(content="answer")
+        started.set()
+        await asyncio.sleep(10)
+        yield AIMessageChunk(content="never")
+
+    task = asyncio.create_task(component._stream_message(chunks(), Message(id="m1", text="")))
+    await started.wait()
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert component.updates == ["partial answer"]
@@ -0,0 +1,133 @@
+import pytest
+
+from axf.custom import validate
+from axf.custom.class_cache import ComponentClassCache
+
+CODE = """
+from axf.custom.custom_component.component import Component
+from axf.io import MessageTextInput, Output
+from axf.schema.message import Message
+
+GREETING = "hello"
+
+
+def greet(name):
+    return f"{GREETING} {name}"
+
+
+class GreeterComponent(Component):
+    inputs = [MessageTextInput(name="person")]
+    outputs = [Output(name="message", method="build_message")]
+
+    def build_message(self) -> Message:
+        return Message(text=greet(self.person))
+"""
+
+
+def test_same_code_returns_cached_class():
+    cache = ComponentClassCache()
+
+    first = cache.get(CODE)
+    second = cache.get(CODE)
+
+    assert first is second
+    assert first.__name__ == "GreeterComponent"
+    assert cache.stats() | {"hit_ratio": None} == {
+        "size": 1,
+        "max_size": 1024,
+        "hits": 1,
+        "misses": 1,
+        "disk_hits": 0,
+        "hit_ratio": None,
+    }
+
+
+def test_cached_class_works():
+    cls = ComponentClassCache().get(CODE)
+
+    component = cls()
+    component.set(person="world")
+
+    assert component.build_message().text == "hello world"
+
+
+def test_class_name_is_part_of_the_key():
+    code = (
+        CODE
+        + """
+
+class LoudGreeterComponent(GreeterComponent):
+    def build_message(self) -> Message:
+        return Message(text=greet(self.person).upper())
+"""
+    )
+    cache = ComponentClassCache()
+
+    greeter = cache.get(code, "GreeterComponent")
+    loud = cache.get(code, "LoudGreeterComponent")
+
+    assert greeter.__name__ == "GreeterComponent"
+    assert loud.__name__ == "LoudGreeterComponent"
+    assert cache.get(code, "GreeterComponent") is greeter
+
+
+def test_least_recently_used_class_is_evicted():
+    cache = ComponentClassCache(max_size=2)
+    codes = [CODE.replace("hello", greeting) for greeting in ("a", "b", "c")]
+
+    first = cache.get(codes[0])
+    cache.get(codes[1])
+    cache.get(codes[0])
+    cache.get(codes[2])
+
+    assert cache.get(codes[0]) is first
+    assert cache.stats()["size"] == 2
+    cache.get(codes[1])
+    assert cache.misses == 4
+
+
+def test_disabled_cache_compiles_every_time():
+    cache = ComponentClassCache(max_size=0)
+
+    assert cache.get(CODE) is not cache.get(CODE)
+    assert cache.stats()["size"] == 0
+
+
+def test_disk_tier_is_shared_between_caches(tmp_path, monkeypatch):
+    ComponentClassCache(cache_dir=tmp_path).get(CODE)
+    assert len(list(tmp_path.glob("*.bin"))) == 1
+
+    def fail_compile(*_args):
+        pytest.fail("class should have been loaded from disk")
+
+    monkeypatch.setattr(validate, "compile_class", fail_compile)
+    cache = ComponentClassCache(cache_dir=tmp_path)
+    cls = cache.get(CODE)
+
+    assert cls().set(person="disk").build_message().text == "hello disk"
+    assert cache.disk_hits == 1
+
+
+def test_corrupt_disk_entry_is_recompiled(tmp_path):
+    cache = ComponentClassCache(cache_dir=tmp_path)
+    (tmp_path / f"{cache.key(CODE)}.bin").write_bytes(b"not bytecode")
+
+    assert cache.get(CODE).__name__ == "GreeterComponent"
+    assert cache.disk_hits == 0
+
+
+def test_errors_are_not_cached():
+    cache = ComponentClassCache()
+    code = CODE.replace("from axf.io", "from axf.missing_module")
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="missing_module"):
+            cache.get(code)
+
+    assert cache.stats()["size"] == 0
+    assert cache.misses == 2
+
+
+def test_syntax_errors_keep_create_class_message():
+    with pytest.raises(ValueError, match="Syntax error in code"):
+        ComponentClassCache().get("class Broken(Component):\n    def x(:\n", "Broken")
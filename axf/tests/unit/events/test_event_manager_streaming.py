@@ -0,0 +1,208 @@
+import asyncio
+import json
+
+import pytest
+
+from axf.events.event_manager import SlowConsumerError, create_stream_tokens_event_manager
+
+
+def _events(queue: asyncio.Queue) -> list[dict | None]:
+    events = []
+    while not queue.empty():
+        _, payload, _ = queue.get_nowait()
+        events.append(None if payload is None else json.loads(payload))
+    return events
+
+
+def _token(chunk: str, message_id: str = "m1") -> dict:
+    return {"chunk": chunk, "id": message_id}
+
+
+def test_token_fast_path_matches_json_dumps():
+    queue: asyncio.Queue = asyncio.Queue()
+    manager = create_stream_tokens_event_manager(queue)
+
+    manager.on_token(data=_token('say "hi"\n ünïcode'))
+
+    _, payload, _ = queue.get_nowait()
+    expected = json.dumps({"event": "token", "data": _token('say "hi"\n ünïcode')}) + "\n\n"
+    assert payload == expected.encode("utf-8")
+
+
+def test_event_ids_are_unique():
+    queue: asyncio.Queue = asyncio.Queue()
+    manager = create_stream_tokens_event_manager(queue)
+
+    for _ in range(3):
+        manager.on_token(data=_token("a"))
+
+    event_ids = [queue.get_nowait()[0] for _ in range(3)]
+    assert len(set(event_ids)) == 3
+    assert all(event_id.startswith("token-") for event_id in event_ids)
+
+
+def test_tokens_are_coalesced_by_size():
+    queue: asyncio.Queue = asyncio.Queue()
+    manager = create_stream_tokens_event_manager(queue, coalesce_bytes=5)
+
+    for chunk in ("ab", "cd", "ef", "g"):
+        manager.on_token(data=_token(chunk))
+
+    assert _events(queue) == [{"event": "token", "data": _token("abcdef")}]
+    manager.flush()
+    assert _events(queue) == [{"event": "token", "data": _token("g")}]
+
+
+def test_other_events_flush_pending_tokens_first():
+    queue: asyncio.Queue = asyncio.Queue()
+    manager = create_stream_tokens_event_manager(queue, coalesce_bytes=100)
+
+    manager.on_token(data=_token("a", "m1"))
+    manager.on_token(data=_token("b", "m2"))
+    manager.on_end(data={"result": "ab"})
+
+    assert _events(queue) == [
+        {"event": "token", "data": _token("a", "m1")},
+        {"event": "token", "data": _token("b", "m2")},
+        {"event": "end", "data": {"result": "ab"}},
+    ]
+
+
+async def test_tokens_are_coalesced_by_time():
+    queue: asyncio.Queue = asyncio.Queue()
+    manager = create_stream_tokens_event_manager(queue, coalesce_interval=0.05)
+
+    manager.on_token(data=_token("a"))
+    manager.on_token(data=_token("b"))
+    assert queue.empty()
+
+    await asyncio.sleep(0.1)
+    assert _events(queue) == [{"event": "token", "data": _token("ab")}]
+
+
+async def test_block_policy_keeps_order_and_waits_for_consumer():
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    manager = create_stream_tokens_event_manager(queue)
+
+    for chunk in "abcd":
+        manager.on_token(data=_token(chunk))
+    drain = asyncio.create_task(manager.drain())
+    await asyncio.sleep(0)
+    assert not drain.done()
+
+    received = []
+    while len(received) < 4:
+        _, payload, _ = await queue.get()
+        received.append(json.loads(payload)["data"]["chunk"])
+    await drain
+    assert received == ["a", "b", "c", "d"]
+
+
+async def test_concurrent_drains_wait_for_the_same_backlog():
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    manager = create_stream_tokens_event_manager(queue)
+
+    for chunk in "abc":
+        manager.on_token(data=_token(chunk))
+    first = asyncio.create_task(manager.drain())
+    second = asyncio.create_task(manager.drain())
+    await asyncio.sleep(0)
+    assert not first.done()
+    assert not second.done()
+
+    received = []
+    while len(received) < 3:
+        _, payload, _ = await queue.get()
+        received.append(json.loads(payload)["data"]["chunk"])
+    await asyncio.gather(first, second)
+    assert received == ["a", "b", "c"]
+
+
+async def test_cancelled_drain_keeps_the_pending_event():
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    manager = create_stream_tokens_event_manager(queue)
+
+    for chunk in "ab":
+        manager.on_token(data=_token(chunk))
+    drain = asyncio.create_task(manager.drain())
+    await asyncio.sleep(0)
+    drain.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await drain
+
+    await queue.get()
+    await manager.drain()
+    _, payload, _ = queue.get_nowait()
+    assert json.loads(payload)["data"]["chunk"] == "b"
+
+
+async def test_drop_policy_summarises_dropped_tokens():
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    manager = create_stream_tokens_event_manager(queue, slow_consumer_policy="drop")
+
+    for chunk in ("a", "b", "cc", "ddd"):
+        manager.on_token(data=_token(chunk))
+    manager.on_end(data={"result": "done"})
+    assert manager.dropped_tokens == 2
+    assert manager.dropped_chars == 5
+
+    close = asyncio.create_task(manager.aclose())
+    events = []
+    while not events or events[-1] is not None:
+        _, payload, _ = await queue.get()
+        events.append(None if payload is None else json.loads(payload))
+    await close
+
+    assert events == [
+        {"event": "token", "data": _token("a")},
+        {"event": "token", "data": _token("b")},
+        {"event": "end", "data": {"result": "done"}},
+        {"event": "tokens_dropped", "data": {"count": 2, "chars": 5}},
+        None,
+    ]
+
+
+async def test_block_policy_drops_tokens_once_the_backlog_is_full():
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    manager = create_stream_tokens_event_manager(queue, max_backlog=2)
+
+    for chunk in "abcde":
+        manager.on_token(data=_token(chunk))
+    manager.on_end(data={"result": "done"})
+    assert manager.dropped_tokens == 2
+
+    close = asyncio.create_task(manager.aclose())
+    events = []
+    while not events or events[-1] is not None:
+        _, payload, _ = await queue.get()
+        events.append(None if payload is None else json.loads(payload))
+    await close
+
+    assert events == [
+        {"event": "token", "data": _token("a")},
+        {"event": "token", "data": _token("b")},
+        {"event": "token", "data": _token("c")},
+        {"event": "end", "data": {"result": "done"}},
+        {"event": "tokens_dropped", "data": {"count": 2, "chars": 2}},
+        None,
+    ]
+
+
+def test_disconnect_policy_ends_the_stream():
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    manager = create_stream_tokens_event_manager(queue, slow_consumer_policy="disconnect")
+
+    manager.on_token(data=_token("a"))
+    manager.on_token(data=_token("b"))
+    with pytest.raises(SlowConsumerError):
+        manager.on_token(data=_token("c"))
+
+    assert manager.closed
+    assert _events(queue) == [None]
+    manager.on_end(data={"result": "ignored"})
+    assert queue.empty()
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError, match="slow consumer policy"):
+        create_stream_tokens_event_manager(asyncio.Queue(), slow_consumer_policy="ignore")
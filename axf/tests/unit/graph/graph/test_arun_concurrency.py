@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from axf.components.input_output import ChatInput, ChatOutput
+from axf.graph import Graph
+
+
+@pytest.fixture
+def graph():
+    chat_input = ChatInput(_id="chat_input")
+    chat_input.set(should_store_message=False)
+    chat_output = ChatOutput(_id="chat_output")
+    chat_output.set(input_value=chat_input.message_response, should_store_message=False)
+    return Graph(chat_input, chat_output)
+
+
+def _texts(run_outputs):
+    return [run_output.outputs[0].results["message"].get_text() for run_output in run_outputs]
+
+
+async def test_concurrent_runs_keep_input_order(graph):
+    inputs = [{"input_value": f"message {i}"} for i in range(6)]
+
+    run_outputs = await graph.arun(inputs, outputs=["chat_output"], concurrency=3)
+
+    assert _texts(run_outputs) == [f"message {i}" for i in range(6)]
+    assert [run_output.inputs for run_output in run_outputs] == inputs
+    # The runs happen on forks, the graph itself stays unbuilt
+    assert not any(vertex.built for vertex in graph.vertices)
+
+
+async def test_concurrent_runs_respect_limit(graph, monkeypatch):
+    running = 0
+    max_running = 0
+    original_run = Graph._run
+
+    async def tracked_run(self, **kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        try:
+            await asyncio.sleep(0.01)
+            return await original_run(self, **kwargs)
+        finally:
+            running -= 1
+
+    monkeypatch.setattr(Graph, "_run", tracked_run)
+
+    run_outputs = await graph.arun([{"input_value": str(i)} for i in range(8)], outputs=["chat_output"], concurrency=3)
+
+    assert _texts(run_outputs) == [str(i) for i in range(8)]
+    assert max_running == 3
+
+
+async def test_failed_run_cancels_the_others(graph, monkeypatch):
+    original_run = Graph._run
+    cancelled = []
+
+    async def failing_run(self, **kwargs):
+        if kwargs["inputs"]["input_value"] == "bad":
+            msg = "bad input"
+            raise RuntimeError(msg)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(kwargs["inputs"]["input_value"])
+            raise
+        return await original_run(self, **kwargs)
+
+    monkeypatch.setattr(Graph, "_run", failing_run)
+
+    with pytest.raises(RuntimeError, match="bad input"):
+        await graph.arun([{"input_value": "slow"}, {"input_value": "bad"}], outputs=["chat_output"], concurrency=2)
+    assert cancelled == ["slow"]
+
+
+async def test_concurrency_must_be_positive(graph):
+    with pytest.raises(ValueError, match="concurrency must be at least 1"):
+        await graph.arun([{"input_value": "hi"}], concurrency=0)
@@ -0,0 +1,73 @@
+import pickle
+
+import pytest
+
+from axf.cli.serve_app import _analyze_graph_structure
+from axf.components.input_output import ChatInput, ChatOutput, TextOutputComponent
+from axf.graph import Graph
+
+
+@pytest.fixture
+def graph():
+    chat_input = ChatInput(_id="chat_input")
+    chat_input.set(should_store_message=False)
+    text_output = TextOutputComponent(_id="text_output")
+    text_output.set(input_value=chat_input.message_response)
+    chat_output = ChatOutput(_id="chat_output")
+    chat_output.set(input_value=text_output.text_response, should_store_message=False)
+    return Graph(chat_input, chat_output)
+
+
+def _ids(edges):
+    return sorted((edge.source_id, edge.target_id) for edge in edges)
+
+
+def test_vertex_edges_come_from_the_index(graph):
+    text_output = graph.get_vertex("text_output")
+
+    assert _ids(text_output.edges) == [("chat_input", "text_output"), ("text_output", "chat_output")]
+    assert _ids(text_output.outgoing_edges) == [("text_output", "chat_output")]
+    assert _ids(text_output.incoming_edges) == [("chat_input", "text_output")]
+    assert _ids(graph.get_vertex_edges("chat_input", is_source=False)) == []
+    assert graph.get_edge("text_output", "chat_output") is text_output.outgoing_edges[0]
+    assert graph.get_edge("chat_output", "text_output") is None
+    assert [vertex.id for vertex in graph.get_vertices_with_target("text_output")] == ["chat_input"]
+    assert {vertex.id: count for vertex, count in graph.get_vertex_neighbors(text_output).items()} == {
+        "chat_input": 1,
+        "chat_output": 1,
+    }
+
+
+def test_remove_vertex_updates_the_index(graph):
+    graph.remove_vertex("chat_output")
+
+    assert _ids(graph.edges) == [("chat_input", "text_output")]
+    assert _ids(graph.get_vertex("text_output").edges) == [("chat_input", "text_output")]
+    assert graph.get_vertex_edges("chat_output") == []
+
+
+def test_assigning_edges_reindexes(graph):
+    graph.edges = [edge for edge in graph.edges if edge.target_id != "chat_output"]
+
+    assert graph.get_vertex("chat_output").edges == []
+    assert _ids(graph.get_vertex("text_output").edges) == [("chat_input", "text_output")]
+
+
+def test_index_survives_pickling(graph):
+    restored = pickle.loads(pickle.dumps(graph))  # noqa: S301
+
+    assert _ids(restored.get_vertex_edges("text_output")) == _ids(graph.get_vertex_edges("text_output"))
+    assert all(edge in restored.edges for edge in restored.get_vertex_edges("chat_output"))
+
+
+def test_serve_analysis_finds_entry_and_exit_points():
+    chat_input = ChatInput(_id="chat_input")
+    chat_output = ChatOutput(_id="chat_output")
+    chat_output.set(input_value=chat_input.message_response)
+
+    analysis = _analyze_graph_structure(Graph(chat_input, chat_output))
+
+    assert (analysis["node_count"], analysis["edge_count"]) == (2, 1)
+    assert [point["id"] for point in analysis["entry_points"]] == ["chat_input"]
+    assert [point["id"] for point in analysis["exit_points"]] == ["chat_output"]
+    assert [component["type"] for component in analysis["components"]] == ["ChatInput", "ChatOutput"]
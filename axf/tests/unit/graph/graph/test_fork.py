@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from axf.components.input_output import ChatInput, ChatOutput
+from axf.graph import Graph
+from axf.processing.process import apply_tweaks_to_graph
+from axf.schema.schema import InputValueRequest
+
+
+@pytest.fixture
+def graph():
+    chat_input = ChatInput(_id="chat_input")
+    chat_input.set(should_store_message=False)
+    chat_output = ChatOutput(_id="chat_output")
+    chat_output.set(input_value=chat_input.message_response, should_store_message=False)
+    return Graph(chat_input, chat_output)
+
+
+def test_fork_requires_prepared_graph():
+    with pytest.raises(ValueError, match="Graph not prepared"):
+        Graph().fork()
+
+
+def test_fork_shares_templates_and_copies_run_state(graph):
+    forked = graph.fork()
+
+    assert forked is not graph
+    assert [vertex.id for vertex in forked.vertices] == [vertex.id for vertex in graph.vertices]
+    for vertex in forked.vertices:
+        original = graph.get_vertex(vertex.id)
+        assert vertex is not original
+        assert vertex.graph is forked
+        assert vertex.data is original.data
+        assert vertex.custom_component is not original.custom_component
+        assert type(vertex.custom_component) is type(original.custom_component)
+        assert vertex.custom_component.get_vertex() is vertex
+        assert all(step.__self__ is vertex for step in vertex.steps)
+    assert forked.run_manager is not graph.run_manager
+    assert forked._run_queue == graph._run_queue
+    assert forked._run_queue is not graph._run_queue
+
+
+def test_fork_rebinds_vertex_params(graph):
+    forked = graph.fork()
+
+    input_value = forked.get_vertex("chat_output").raw_params["input_value"]
+    assert input_value is forked.get_vertex("chat_input")
+
+
+async def test_forks_run_concurrently_without_sharing_results(graph):
+    async def run(forked, text):
+        results = [result async for result in forked.async_start(InputValueRequest(input_value=text))]
+        output = next(result for result in results if getattr(result, "vertex", None) and result.vertex.is_output)
+        return output.result_dict.results["message"].get_text()
+
+    texts = await asyncio.gather(run(graph.fork(), "first"), run(graph.fork(), "second"))
+
+    assert texts == ["first", "second"]
+    assert not any(vertex.built for vertex in graph.vertices)
+
+
+def test_tweaks_on_fork_leave_source_untouched(graph):
+    forked = apply_tweaks_to_graph(graph.fork(), {"chat_input": {"sender_name": "Tweaked"}})
+
+    assert forked.get_vertex("chat_input").params["sender_name"] == "Tweaked"
+    assert graph.get_vertex("chat_input").params["sender_name"] != "Tweaked"
+    assert forked.get_vertex("chat_output").data is graph.get_vertex("chat_output").data
@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+import pytest
+
+from axf.custom.custom_component.component import Component
+from axf.exceptions.component import ComponentBuildError
+from axf.graph import Graph
+from axf.inputs.inputs import FloatInput, MessageTextInput
+from axf.schema.message import Message
+from axf.template import Output
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.events: list[tuple[str, str, float]] = []
+        self.running = 0
+        self.max_running = 0
+
+
+recorder = Recorder()
+
+
+class SleepComponent(Component):
+    display_name = "Sleep"
+    inputs = [
+        MessageTextInput(name="first", value=""),
+        MessageTextInput(name="second", value=""),
+        FloatInput(name="seconds", value=0.0),
+    ]
+    outputs = [Output(name="text", method="sleep")]
+
+    async def sleep(self) -> Message:
+        recorder.running += 1
+        recorder.max_running = max(recorder.max_running, recorder.running)
+        recorder.events.append(("start", self._id, time.perf_counter()))
+        if self.seconds < 0:
+            recorder.running -= 1
+            msg = f"{self._id} failed"
+            raise ValueError(msg)
+        await asyncio.sleep(self.seconds)
+        recorder.events.append(("end", self._id, time.perf_counter()))
+        recorder.running -= 1
+        return Message(text=f"{self.first}{self.second}{self._id};")
+
+
+@pytest.fixture(autouse=True)
+def reset_recorder():
+    recorder.__init__()
+
+
+def _branchy_graph() -> Graph:
+    # source -> slow ------------> join
+    # source -> fast -> fast_next -> join
+    source = SleepComponent(_id="source")
+    slow = SleepComponent(_id="slow")
+    slow.set(first=source.sleep, seconds=0.3)
+    fast = SleepComponent(_id="fast")
+    fast.set(first=source.sleep, seconds=0.01)
+    fast_next = SleepComponent(_id="fast_next")
+    fast_next.set(first=fast.sleep, seconds=0.01)
+    join = SleepComponent(_id="join")
+    join.set(first=slow.sleep, second=fast_next.sleep)
+    return Graph(source, join)
+
+
+def _times(event: str) -> dict[str, float]:
+    return {vertex_id: timestamp for kind, vertex_id, timestamp in recorder.events if kind == event}
+
+
+async def test_successor_starts_without_waiting_for_independent_branch():
+    graph = _branchy_graph()
+
+    await graph.process(fallback_to_env_vars=False)
+
+    starts, ends = _times("start"), _times("end")
+    assert starts["fast_next"] < ends["slow"]
+    assert starts["join"] >= max(ends["slow"], ends["fast_next"])
+    assert graph.get_vertex("join").built_object["text"].text == "source;slow;source;fast;fast_next;join;"
+
+
+async def test_max_concurrency_limits_running_vertices():
+    graph = _branchy_graph()
+    graph.max_concurrency = 1
+
+    await graph.process(fallback_to_env_vars=False)
+
+    assert recorder.max_running == 1
+    assert all(vertex.built for vertex in graph.vertices)
+
+
+async def test_ready_vertices_start_by_average_build_time():
+    graph = _branchy_graph()
+    graph.max_concurrency = 1
+    graph.get_vertex("slow").add_build_time(1.0)
+    graph.get_vertex("fast").add_build_time(0.1)
+
+    await graph.process(fallback_to_env_vars=False)
+
+    starts = _times("start")
+    assert starts["fast"] < starts["slow"]
+
+
+async def test_invalid_max_concurrency():
+    graph = _branchy_graph()
+    graph.max_concurrency = 0
+
+    with pytest.raises(ValueError, match="max_concurrency"):
+        await graph.process(fallback_to_env_vars=False)
+
+
+async def test_failed_vertex_cancels_running_vertices():
+    graph = _branchy_graph()
+    graph.get_vertex("fast").update_raw_params({"seconds": -1.0})
+
+    with pytest.raises(ComponentBuildError, match="fast failed"):
+        await graph.process(fallback_to_env_vars=False)
+
+    await asyncio.sleep(0)
+    assert "slow" not in _times("end")
+    assert not graph.get_vertex("join").built
+
+
+async def test_vertex_runnable_again_while_building_is_rebuilt_after_it_finishes():
+    # In a loop a vertex can become runnable again while it is still building; here "fast" finishing
+    # makes "slow" runnable again, as a loop body finishing makes the loop component runnable again.
+    graph = _branchy_graph()
+    build_vertex = graph.build_vertex
+    get_next_runnable_vertices = graph.get_next_runnable_vertices
+    builds: list[tuple[str, str, float]] = []
+
+    async def recording_build_vertex(vertex_id, **kwargs):
+        builds.append(("start", vertex_id, time.perf_counter()))
+        result = await build_vertex(vertex_id, **kwargs)
+        builds.append(("end", vertex_id, time.perf_counter()))
+        return result
+
+    async def get_next_with_rerun(lock, vertex, *, cache=True):
+        next_runnable_vertices = await get_next_runnable_vertices(lock, vertex, cache=cache)
+        if vertex.id == "fast":
+            next_runnable_vertices = [*next_runnable_vertices, "slow"]
+        return next_runnable_vertices
+
+    graph.build_vertex = recording_build_vertex
+    graph.get_next_runnable_vertices = get_next_with_rerun
+
+    await graph.process(fallback_to_env_vars=False)
+
+    slow_builds = [(kind, timestamp) for kind, vertex_id, timestamp in builds if vertex_id == "slow"]
+    assert [kind for kind, _ in slow_builds] == ["start", "end", "start", "end"]
+    assert slow_builds[2][1] >= slow_builds[1][1]
@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+import pytest
+
+from axf.components.input_output import ChatInput, ChatOutput
+from axf.graph import Graph
+from axf.graph.graph.constants import Finish
+from axf.schema.schema import InputValueRequest
+
+
+class RecordingChatService:
+    def __init__(self) -> None:
+        self.writes: list[str] = []
+
+    async def get_cache(self, key, lock=None):  # noqa: ARG002
+        return None
+
+    async def set_cache(self, key, data, lock=None) -> bool:  # noqa: ARG002
+        self.writes.append(key if isinstance(key, str) else str(key))
+        assert not isinstance(data, Graph), "production mode must not cache the whole graph"
+        return True
+
+
+@pytest.fixture
+def chat_service():
+    service = RecordingChatService()
+    with patch("axf.graph.graph.base.get_chat_service", return_value=service):
+        yield service
+
+
+@pytest.fixture
+def graph():
+    chat_input = ChatInput(_id="chat_input")
+    chat_input.set(should_store_message=False)
+    chat_output = ChatOutput(_id="chat_output")
+    chat_output.set(input_value=chat_input.message_response, should_store_message=False)
+    graph = Graph(chat_input, chat_output, flow_id="flow")
+    graph.production_mode = True
+    return graph
+
+
+async def _run_steps(graph) -> list:
+    steps = []
+    async for result in graph.async_start(InputValueRequest(input_value="hi")):
+        steps.append(result)
+        if not isinstance(result, Finish):
+            steps[-1] = result.vertex.id
+    return steps
+
+
+async def test_production_mode_batches_vertex_cache_writes(chat_service, graph):
+    snapshots_before = len(graph._snapshots)
+    call_order_before = list(graph._call_order)
+
+    steps = await _run_steps(graph)
+
+    assert steps[:-1] == ["chat_input", "chat_output"]
+    assert isinstance(steps[-1], Finish)
+    assert sorted(chat_service.writes) == ["chat_input", "chat_output"]
+    assert len(graph._snapshots) == snapshots_before
+    assert graph._call_order == call_order_before
+    assert graph._pending_cache_writes == {}
+
+
+async def test_writes_are_deferred_until_the_run_ends(chat_service, graph):
+    await graph.astep(InputValueRequest(input_value="hi"))
+
+    assert chat_service.writes == []
+    assert list(graph._pending_cache_writes) == ["chat_input"]
+
+
+async def test_snapshots_are_opt_in_in_production_mode(chat_service, graph):  # noqa: ARG001
+    graph.record_snapshots = True
+    snapshots_before = len(graph._snapshots)
+
+    await _run_steps(graph)
+
+    # One for prepare() and one per step
+    assert len(graph._snapshots) == snapshots_before + 3
+    assert graph._call_order[-2:] == ["chat_input", "chat_output"]
+
+
+async def test_default_mode_caches_graph_after_each_step():
+    writes = []
+
+    class ChatService(RecordingChatService):
+        async def set_cache(self, key, data, lock=None) -> bool:  # noqa: ARG002
+            writes.append((key, data))
+            return True
+
+    chat_input = ChatInput(_id="chat_input")
+    chat_input.set(should_store_message=False)
+    chat_output = ChatOutput(_id="chat_output")
+    chat_output.set(input_value=chat_input.message_response, should_store_message=False)
+    graph = Graph(chat_input, chat_output, flow_id="flow")
+
+    with patch("axf.graph.graph.base.get_chat_service", return_value=ChatService()):
+        await _run_steps(graph)
+
+    assert [key for key, data in writes if data is graph] == ["flow", "flow"]
@@ -0,0 +1,90 @@
+import asyncio
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from axf.components.input_output import ChatInput, ChatOutput
+from axf.graph import Graph
+
+USER_ID = uuid.uuid4()
+
+
+class RecordingVariableService:
+    def __init__(self) -> None:
+        self.prefetches: list[tuple[uuid.UUID, set[str]]] = []
+
+    async def prefetch_variables(self, user_id, names, session):  # noqa: ARG002
+        await asyncio.sleep(0)
+        self.prefetches.append((user_id, set(names)))
+
+
+class FakeSession:
+    pass
+
+
+@pytest.fixture
+def variable_service():
+    service = RecordingVariableService()
+
+    class _SessionScope:
+        async def __aenter__(self):
+            return FakeSession()
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    with (
+        patch("axf.graph.graph.base.get_variable_service", return_value=service),
+        patch("axf.graph.graph.base.session_scope", _SessionScope),
+    ):
+        yield service
+
+
+@pytest.fixture
+def graph():
+    chat_input = ChatInput(_id="chat_input")
+    chat_output = ChatOutput(_id="chat_output")
+    chat_output.set(input_value=chat_input.message_response)
+    graph = Graph(chat_input, chat_output, flow_id="flow", user_id=str(USER_ID))
+    graph.prepare()
+    # Stand-ins for fields such as API keys that reference global variables
+    graph.get_vertex("chat_input").params["api_key"] = "OPENAI_API_KEY"
+    graph.get_vertex("chat_input").load_from_db_fields = ["api_key"]
+    graph.get_vertex("chat_output").params["token"] = "GITHUB_TOKEN"
+    graph.get_vertex("chat_output").load_from_db_fields = ["token", "unset"]
+    return graph
+
+
+def test_collects_load_from_db_variables(graph):
+    assert graph.get_load_from_db_variables() == {"OPENAI_API_KEY", "GITHUB_TOKEN"}
+
+    graph.context = {"request_variables": {"GITHUB_TOKEN": "override"}}
+    assert graph.get_load_from_db_variables() == {"OPENAI_API_KEY"}
+
+
+async def test_prefetches_once_per_run(variable_service, graph):
+    await asyncio.gather(*(graph.prefetch_variables() for _ in range(3)))
+    await graph.prefetch_variables()
+
+    assert variable_service.prefetches == [(USER_ID, {"OPENAI_API_KEY", "GITHUB_TOKEN"})]
+
+    await graph.fork().prefetch_variables()
+    assert len(variable_service.prefetches) == 2
+
+
+async def test_prefetches_again_on_the_next_run(variable_service, graph):
+    for _ in range(2):
+        await graph.initialize_run()
+        await graph.prefetch_variables()
+
+    assert len(variable_service.prefetches) == 2
+
+
+async def test_prefetch_errors_are_not_raised(graph):
+    class FailingVariableService:
+        async def prefetch_variables(self, user_id, names, session):  # noqa: ARG002
+            raise RuntimeError
+
+    with patch("axf.graph.graph.base.get_variable_service", return_value=FailingVariableService()):
+        await graph.prefetch_variables()
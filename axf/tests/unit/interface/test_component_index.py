@@ -0,0 +1,103 @@
+import pkgutil
+import sys
+
+import pytest
+
+from axf.interface import components
+from axf.interface.component_index import ComponentIndex, iter_component_modules, source_digest
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / "idxpkg"
+    for path in ("__init__.py", "a.py", "b/__init__.py", "b/c.py", "b/d/__init__.py", "b/d/e.py", "z.py"):
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text("")
+    (root / "notes.txt").write_text("")
+    (root / "no_package").mkdir()
+    (root / "no_package" / "x.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield root
+    for name in [name for name in sys.modules if name.startswith("idxpkg")]:
+        del sys.modules[name]
+
+
+def test_module_order_matches_walk_packages(package):
+    import idxpkg
+
+    expected = [name for _, name, _ in pkgutil.walk_packages(idxpkg.__path__, prefix="idxpkg.")]
+
+    modules = iter_component_modules(package, prefix="idxpkg.")
+
+    assert [name for name, _ in modules] == expected
+    assert dict(modules)["idxpkg.b"] == package / "b" / "__init__.py"
+
+
+def test_index_round_trip(tmp_path):
+    path = tmp_path / "index.json"
+    index = ComponentIndex(path, key="v1")
+    index.put("pkg.mod", "digest", "pkg", {"Comp": {"display_name": "Comp"}})
+    index.save()
+
+    loaded = ComponentIndex.load(path, key="v1")
+
+    assert loaded.get("pkg.mod", "digest") == ("pkg", {"Comp": {"display_name": "Comp"}})
+    assert loaded.get("pkg.mod", "changed") is None
+    assert (loaded.hits, loaded.misses) == (1, 1)
+
+
+def test_index_of_another_build_or_corrupt_index_is_ignored(tmp_path):
+    path = tmp_path / "index.json"
+    index = ComponentIndex(path, key="v1")
+    index.put("pkg.mod", "digest", "pkg", {})
+    index.save()
+
+    assert ComponentIndex.load(path, key="v2").modules == {}
+    path.write_text("{not json")
+    assert ComponentIndex.load(path, key="v1").modules == {}
+
+
+def test_templates_that_are_not_json_are_not_indexed(tmp_path):
+    index = ComponentIndex(tmp_path / "index.json", key="v1")
+
+    index.put("pkg.mod", "digest", "pkg", {"Comp": {"value": object()}})
+
+    assert index.modules == {}
+
+
+async def test_unchanged_modules_are_read_from_the_index(tmp_path, monkeypatch):
+    loaded: list[str] = []
+
+    def load(modname):
+        loaded.append(modname)
+        if modname == "axf.components.data.api_request":
+            return "data", {"APIRequest": {"display_name": "API Request"}}, True
+        if modname == "axf.components.data.rss":
+            return "data", {"RSSReader": {"display_name": "RSS"}}, False
+        return None
+
+    monkeypatch.setattr(components, "_load_module_components", load)
+    index_path = tmp_path / "index.json"
+
+    first = await components.import_axiestudio_components(index_path)
+    first_loaded, loaded[:] = list(loaded), []
+    second = await components.import_axiestudio_components(index_path)
+
+    assert first == second
+    assert set(first["components"]["data"]) == {"APIRequest", "RSSReader"}
+    assert "axf.components.data.api_request" in first_loaded
+    # Incomplete and failed modules are loaded again, indexed ones are not
+    assert "axf.components.data.api_request" not in loaded
+    assert "axf.components.data.rss" in loaded
+    assert len(loaded) == len(first_loaded) - 1
+
+
+def test_changed_source_is_a_miss(tmp_path):
+    source = tmp_path / "mod.py"
+    source.write_text("A = 1")
+    index = ComponentIndex(tmp_path / "index.json", key="v1")
+    index.put("x.mod", source_digest(source), "x", {})
+
+    source.write_text("A = 2")
+
+    assert index.get("x.mod", source_digest(source)) is None
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from axf.services.http_client.service import HTTPClientService
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=secret")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.connections = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def service():
+    return HTTPClientService(http2=False)
+
+
+def _url(server, path="/"):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{path}"
+
+
+async def test_async_clients_are_shared_per_origin(server, service):
+    client = service.get_async_client(_url(server, "/a"))
+
+    assert service.get_async_client(_url(server, "/b?x=1")) is client
+    assert service.get_async_client(_url(server), verify=False) is not client
+    assert service.get_async_client("http://example.com/a") is not client
+    await service.teardown()
+
+
+async def test_connections_are_reused(server, service):
+    for _ in range(5):
+        response = await service.get_async_client(_url(server)).get(_url(server))
+        assert response.text == "ok"
+
+    assert server.connections == 1
+    stats = service.stats()
+    assert stats["clients_created"] == 1
+    assert stats["clients_reused"] == 4
+    assert stats["requests"] == 5
+    await service.teardown()
+
+
+def test_sync_client_does_not_keep_cookies(server, service):
+    client = service.get_client(_url(server))
+
+    client.get(_url(server))
+    client.get(_url(server))
+
+    assert not client.cookies
+    assert server.connections == 1
+    assert service.get_client(_url(server)) is client
+
+
+async def test_least_recently_used_clients_are_evicted_without_closing():
+    service = HTTPClientService(max_clients=2)
+    first = service.get_client("http://a.example")
+    second = service.get_client("http://b.example")
+    service.get_client("http://a.example")
+    service.get_client("http://c.example")
+
+    assert service.get_client("http://a.example") is first
+    assert service.get_client("http://b.example") is not second
+    assert service.stats()["clients_evicted"] == 2
+    # A caller may still be using an evicted client
+    assert not second.is_closed
+
+    await service.teardown()
+
+    assert second.is_closed
+    assert first.is_closed
+
+
+def test_async_clients_are_bound_to_their_event_loop(service):
+    async def get_client():
+        return service.get_async_client("http://a.example")
+
+    first = asyncio.run(get_client())
+    second = asyncio.run(get_client())
+
+    assert first is not second
+    assert service.stats()["clients"] == 1
+
+
+def test_relative_urls_are_rejected(service):
+    with pytest.raises(ValueError, match="absolute URL"):
+        service.get_client("/path")
@@ -33,8 +33,8 @@ from axiestudio.graph.utils import log_vertex_build
 from axiestudio.schema.message import ErrorMessage
 from axiestudio.schema.schema import OutputValue
 from axiestudio.services.database.models.flow.model import Flow
-from axiestudio.services.deps import get_chat_service, get_telemetry_service, session_scope
-from axiestudio.services.job_queue.service import JobQueueNotFoundError, JobQueueService
+from axiestudio.services.deps import get_chat_service, get_settings_service, get_telemetry_service, session_scope
+from axiestudio.services.job_queue.service import JobQueueFullError, JobQueueNotFoundError, JobQueueService
 from axiestudio.services.telemetry.schema import ComponentPayload, PlaygroundPayload
 
 
@@ -54,11 +54,15 @@ async def start_flow_build(
 ) -> str:
     """Start the flow build process by setting up the queue and starting the build task.
 
+    When the maximum number of builds are running, waits up to `job_admission_timeout` seconds for one to
+    finish and otherwise rejects the build with HTTP 429.
+
     Returns:
         the job_id.
     """
     job_id = str(uuid.uuid4())
     try:
+        await queue_service.wait_for_capacity(get_settings_service().settings.job_admission_timeout)
         _, event_manager = queue_service.create_queue(job_id)
         task_coro = generate_flow_events(
             flow_id=flow_id,
@@ -74,8 +78,12 @@ async def start_flow_build(
             flow_name=flow_name,
         )
         queue_service.start_job(job_id, task_coro)
+    except JobQueueFullError as e:
+        logger.warning(f"Rejected flow build: {e}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"}) from e
     except Exception as e:
         logger.exception("Failed to create queue and start task")
+        await queue_service.cleanup_job(job_id)
         raise HTTPException(status_code=500, detail=str(e)) from e
     return job_id
 
@@ -85,8 +93,18 @@ async def get_flow_events_response(
     job_id: str,
     queue_service: JobQueueService,
     event_delivery: EventDeliveryType,
+    cursor: int | None = None,
+    timeout: float | None = None,
+    max_events: int | None = None,
 ):
-    """Get events for a specific build job, either as a stream or single event."""
+    """Get events for a specific build job, either as a stream or single event.
+
+    In polling mode the response holds the events numbered after ``cursor`` as NDJSON, waiting up to
+    ``timeout`` seconds for the first one, and its ``X-Event-Cursor`` header holds the number of the
+    last event returned. A client resumes after a lost response or a reconnect by sending that number
+    back as the cursor. Without a cursor, each poll continues where the previous one without a cursor
+    stopped.
+    """
     try:
         main_queue, event_manager, event_task, _ = queue_service.get_queue_data(job_id)
         if event_delivery in (EventDeliveryType.STREAMING, EventDeliveryType.DIRECT):
@@ -99,42 +117,27 @@ async def get_flow_events_response(
                 event_task=event_task,
             )
 
-        # Polling mode - get all available events
+        # Polling mode - wait for the events after the cursor
+        settings = get_settings_service().settings
+        event_log = queue_service.get_event_log(job_id)
         try:
-            events: list = []
-            # Get all available events from the queue without blocking
-            while not main_queue.empty():
-                _, value, _ = await main_queue.get()
-                if value is None:
-                    # End of stream, trigger end event
-                    if event_task is not None:
-                        event_task.cancel()
-                    event_manager.on_end(data={})
-                    # Include the end event
-                    events.append(None)
-                    break
-                events.append(value.decode("utf-8"))
-
-            # If no events were available, wait for one (with timeout)
-            if not events:
-                _, value, _ = await main_queue.get()
-                if value is None:
-                    # End of stream, trigger end event
-                    if event_task is not None:
-                        event_task.cancel()
-                    event_manager.on_end(data={})
-                else:
-                    events.append(value.decode("utf-8"))
-
-            # Return as NDJSON format - each line is a complete JSON object
-            content = "\n".join([event for event in events if event is not None])
-            return Response(content=content, media_type="application/x-ndjson")
+            events = await event_log.wait_for_events(
+                cursor,
+                timeout=settings.event_polling_timeout if timeout is None else max(0.0, timeout),
+                max_events=max(1, max_events or settings.event_polling_max_events),
+            )
         except asyncio.CancelledError as exc:
             logger.info(f"Event polling was cancelled for job {job_id}")
             raise HTTPException(status_code=499, detail="Event polling was cancelled") from exc
-        except asyncio.TimeoutError:
-            logger.warning(f"Timeout while waiting for events for job {job_id}")
-            return Response(content="", media_type="application/x-ndjson")  # Return empty response instead of error
+
+        next_cursor = events[-1][0] if events else (event_log.delivered_id if cursor is None else cursor)
+        # Return as NDJSON format - each line is a complete JSON object
+        content = "\n".join(event for _, event in events)
+        return Response(
+            content=content,
+            media_type="application/x-ndjson",
+            headers={"X-Event-Cursor": str(next_cursor)},
+        )
 
     except JobQueueNotFoundError as exc:
         logger.error(f"Job not found: {job_id}. Error: {exc!s}")
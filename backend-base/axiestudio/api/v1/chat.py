@@ -12,6 +12,7 @@ from fastapi import (
     Body,
     Depends,
     HTTPException,
+    Query,
     Request,
     status,
 )
@@ -213,12 +214,22 @@ async def get_build_events(
     queue_service: Annotated[JobQueueService, Depends(get_queue_service)],
     *,
     event_delivery: EventDeliveryType = EventDeliveryType.STREAMING,
+    cursor: Annotated[int | None, Query(ge=0)] = None,
+    timeout: Annotated[float | None, Query(ge=0)] = None,
+    max_events: Annotated[int | None, Query(ge=1)] = None,
 ):
-    """Get events for a specific build job."""
+    """Get events for a specific build job.
+
+    When polling, ``cursor`` is the ``X-Event-Cursor`` of the last response received; the response holds
+    the events after it, waiting up to ``timeout`` seconds for one, and at most ``max_events`` of them.
+    """
     return await get_flow_events_response(
         job_id=job_id,
         queue_service=queue_service,
         event_delivery=event_delivery,
+        cursor=cursor,
+        timeout=timeout,
+        max_events=max_events,
     )
 
 
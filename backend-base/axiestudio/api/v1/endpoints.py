@@ -41,7 +41,9 @@ from axiestudio.graph.schema import RunOutputs
 from axiestudio.helpers.flow import get_flow_by_id_or_endpoint_name
 from axiestudio.helpers.user import get_user_by_flow_id_or_endpoint_name
 from axiestudio.interface.initialize.loading import update_params_with_load_from_db_fields
-from axiestudio.processing.process import process_tweaks, run_graph_internal
+from axiestudio.processing.graph_cache import get_prepared_graph_cache
+from axiestudio.processing.process import apply_tweaks_to_graph, process_tweaks, run_graph_internal
+from axiestudio.processing.run_cache import get_run_result_cache
 from axiestudio.schema.graph import Tweaks
 from axiestudio.services.auth.utils import api_key_security, get_current_active_user, get_webhook_user
 from axiestudio.services.cache.utils import save_uploaded_file
@@ -116,18 +118,26 @@ async def simple_run_flow(
     stream: bool = False,
     api_key_user: User | None = None,
     event_manager: EventManager | None = None,
+    use_cache: bool = False,
+    cache_control: str | None = None,
 ):
     validate_input_and_tweaks(input_request)
+    user_id = api_key_user.id if api_key_user else None
+    run_cache = get_run_result_cache()
+    cache_key = None
+    if use_cache and not stream and event_manager is None and run_cache.is_enabled_for(flow):
+        cache_key = run_cache.fingerprint(flow, input_request, user_id=str(user_id))
+        if (cached := await run_cache.get(cache_key, cache_control)) is not None:
+            return cached
     try:
         task_result: list[RunOutputs] = []
-        user_id = api_key_user.id if api_key_user else None
         flow_id_str = str(flow.id)
         if flow.data is None:
             msg = f"Flow {flow_id_str} has no data"
             raise ValueError(msg)
-        graph_data = flow.data.copy()
-        graph_data = process_tweaks(graph_data, input_request.tweaks or {}, stream=stream)
-        graph = Graph.from_payload(graph_data, flow_id=flow_id_str, user_id=str(user_id), flow_name=flow.name)
+        graph = get_prepared_graph_cache().get_graph(flow, user_id=str(user_id), stream=stream)
+        if input_request.tweaks:
+            apply_tweaks_to_graph(graph, input_request.tweaks)
         inputs = None
         if input_request.input_value is not None:
             inputs = [
@@ -158,12 +168,14 @@ async def simple_run_flow(
             stream=stream,
             event_manager=event_manager,
         )
-
-        return RunResponse(outputs=task_result, session_id=session_id)
-
     except sa.exc.StatementError as exc:
         raise ValueError(str(exc)) from exc
 
+    response = RunResponse(outputs=task_result, session_id=session_id)
+    if cache_key is not None:
+        await run_cache.set(cache_key, response, cache_control)
+    return response
+
 
 async def simple_run_flow_task(
     flow: Flow,
@@ -278,6 +290,7 @@ async def simplified_run_flow(
     input_request: SimplifiedAPIRequest | None = None,
     stream: bool = False,
     api_key_user: Annotated[UserRead, Depends(api_key_security)],
+    request: Request,
 ):
     """Executes a specified flow by ID with support for streaming and telemetry.
 
@@ -305,6 +318,8 @@ async def simplified_run_flow(
         - Tracks execution time and success/failure via telemetry
         - Handles graceful client disconnection in streaming mode
         - Provides detailed error handling with appropriate HTTP status codes
+        - Answers non-streaming runs of flows tagged for the run result cache from the cache;
+          a "Cache-Control: no-cache" or "no-store" request header bypasses it
         - In streaming mode, uses EventManager to handle events:
             - "add_message": New messages during execution
             - "token": Individual tokens during streaming
@@ -346,6 +361,8 @@ async def simplified_run_flow(
             input_request=input_request,
             stream=stream,
             api_key_user=api_key_user,
+            use_cache=True,
+            cache_control=request.headers.get("Cache-Control"),
         )
         end_time = time.perf_counter()
         background_tasks.add_task(
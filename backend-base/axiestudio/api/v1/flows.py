@@ -23,6 +23,7 @@ from axiestudio.api.utils import CurrentActiveUser, DbSession, cascade_delete_fl
 from axiestudio.api.v1.schemas import FlowListCreate
 from axiestudio.helpers.user import get_user_by_flow_id_or_endpoint_name
 from axiestudio.initial_setup.constants import STARTER_FOLDER_NAME
+from axiestudio.initial_setup.flow_sync import notify_flow_path
 from axiestudio.logging import logger
 from axiestudio.services.database.models.flow.model import (
     AccessTypeEnum,
@@ -56,6 +57,7 @@ async def _save_flow_to_fs(flow: Flow) -> None:
                 await f.write(flow.model_dump_json())
             except OSError:
                 logger.exception("Failed to write flow %s to path %s", flow.name, flow.fs_path)
+        notify_flow_path(flow.id, flow.fs_path)
 
 
 async def _new_flow(
@@ -1,14 +1,21 @@
-import json
-import shutil
+import asyncio
 from http import HTTPStatus
 from pathlib import Path
 
-import pandas as pd
 from fastapi import APIRouter, HTTPException
-from langchain_chroma import Chroma
 from pydantic import BaseModel
 
 from axiestudio.api.utils import CurrentActiveUser
+from axiestudio.base.knowledge_bases.stats import (  # noqa: F401
+    calculate_text_metrics,
+    delete_kb,
+    detect_embedding_model,
+    detect_embedding_provider,
+    get_directory_size,
+    get_kb_metadata,
+    get_kb_stats,
+    get_text_columns,
+)
 from axiestudio.services.deps import get_settings_service
 from axiestudio.logging import logger
 
@@ -44,212 +51,39 @@ def get_kb_root_path() -> Path:
     return KNOWLEDGE_BASES_DIR
 
 
-def get_directory_size(path: Path) -> int:
-    """Calculate the total size of all files in a directory."""
-    total_size = 0
-    try:
-        for file_path in path.rglob("*"):
-            if file_path.is_file():
-                total_size += file_path.stat().st_size
-    except (OSError, PermissionError) as e:
-        logger.error(f"Error calculating directory size for {path}: {e}")
-    return total_size
-
-
-def detect_embedding_provider(kb_path: Path) -> str:
-    """Detect the embedding provider from the knowledge base files."""
-    # Check for Chroma-specific files
-    if (kb_path / "chroma.sqlite3").exists() or any(kb_path.glob("*.parquet")):
-        return "Chroma"
-    if (kb_path / "vectors.npy").exists():
-        return "Local"
-
-    return "Unknown"
-
-
-def detect_embedding_model(kb_path: Path) -> str:
-    """Detect the embedding model from config files."""
-    # First check the embedding metadata file (most accurate)
-    metadata_file = kb_path / "embedding_metadata.json"
-    if metadata_file.exists():
-        try:
-            with metadata_file.open("r", encoding="utf-8") as f:
-                metadata = json.load(f)
-                if isinstance(metadata, dict) and "embedding_model" in metadata:
-                    # Check for embedding model field
-                    model_value = str(metadata.get("embedding_model", "unknown"))
-                    if model_value and model_value.lower() != "unknown":
-                        return model_value
-        except (OSError, json.JSONDecodeError) as _:
-            logger.exception("Error reading embedding metadata file '%s'", metadata_file)
-
-    # Check other JSON config files for model information
-    for config_file in kb_path.glob("*.json"):
-        # Skip the embedding metadata file since we already checked it
-        if config_file.name == "embedding_metadata.json":
-            continue
-
-        try:
-            with config_file.open("r", encoding="utf-8") as f:
-                config_data = json.load(f)
-                if not isinstance(config_data, dict):
-                    continue
-
-                # Check for explicit model fields first and return the actual model name
-                model_fields = ["embedding_model", "model", "embedding_model_name", "model_name"]
-                for field in model_fields:
-                    if field in config_data:
-                        model_value = str(config_data[field])
-                        if model_value and model_value.lower() != "unknown":
-                            return model_value
-
-                # Check for OpenAI specific model names
-                if "openai" in json.dumps(config_data).lower():
-                    openai_models = ["text-embedding-ada-002", "text-embedding-3-small", "text-embedding-3-large"]
-                    config_str = json.dumps(config_data).lower()
-                    for model in openai_models:
-                        if model in config_str:
-                            return model
-
-                # Check for HuggingFace model names (usually in model field)
-                if "model" in config_data:
-                    model_name = str(config_data["model"])
-                    # Common HuggingFace embedding models
-                    hf_patterns = ["sentence-transformers", "all-MiniLM", "all-mpnet", "multi-qa"]
-                    if any(pattern in model_name for pattern in hf_patterns):
-                        return model_name
-
-        except (OSError, json.JSONDecodeError) as _:
-            logger.exception("Error reading config file '%s'", config_file)
-            continue
-
-    return "Unknown"
-
+def _kb_info(kb_dir: Path) -> KnowledgeBaseInfo:
+    stats = get_kb_stats(kb_dir)
+    return KnowledgeBaseInfo(
+        id=kb_dir.name,
+        name=kb_dir.name.replace("_", " ").replace("-", " ").title(),
+        embedding_provider=stats.embedding_provider,
+        embedding_model=stats.embedding_model,
+        size=stats.size,
+        words=stats.words,
+        characters=stats.characters,
+        chunks=stats.chunks,
+        avg_chunk_size=stats.avg_chunk_size,
+    )
 
-def get_text_columns(df: pd.DataFrame, schema_data: list | None = None) -> list[str]:
-    """Get the text columns to analyze for word/character counts."""
-    # First try schema-defined text columns
-    if schema_data:
-        text_columns = [
-            col["column_name"]
-            for col in schema_data
-            if col.get("vectorize", False) and col.get("data_type") == "string"
-        ]
-        if text_columns:
-            return [col for col in text_columns if col in df.columns]
 
-    # Fallback to common text column names
-    common_names = ["text", "content", "document", "chunk"]
-    text_columns = [col for col in df.columns if col.lower() in common_names]
-    if text_columns:
-        return text_columns
+def _list_kb_infos(kb_path: Path) -> list[KnowledgeBaseInfo]:
+    knowledge_bases = []
 
-    # Last resort: all string columns
-    return [col for col in df.columns if df[col].dtype == "object"]
-
-
-def calculate_text_metrics(df: pd.DataFrame, text_columns: list[str]) -> tuple[int, int]:
-    """Calculate total words and characters from text columns."""
-    total_words = 0
-    total_characters = 0
-
-    for col in text_columns:
-        if col not in df.columns:
+    for kb_dir in kb_path.iterdir():
+        if not kb_dir.is_dir() or kb_dir.name.startswith("."):
             continue
 
-        text_series = df[col].astype(str).fillna("")
-        total_characters += text_series.str.len().sum()
-        total_words += text_series.str.split().str.len().sum()
-
-    return int(total_words), int(total_characters)
-
-
-def get_kb_metadata(kb_path: Path) -> dict:
-    """Extract metadata from a knowledge base directory."""
-    metadata: dict[str, float | int | str] = {
-        "chunks": 0,
-        "words": 0,
-        "characters": 0,
-        "avg_chunk_size": 0.0,
-        "embedding_provider": "Unknown",
-        "embedding_model": "Unknown",
-    }
-
-    try:
-        # First check embedding metadata file for accurate provider and model info
-        metadata_file = kb_path / "embedding_metadata.json"
-        if metadata_file.exists():
-            try:
-                with metadata_file.open("r", encoding="utf-8") as f:
-                    embedding_metadata = json.load(f)
-                    if isinstance(embedding_metadata, dict):
-                        if "embedding_provider" in embedding_metadata:
-                            metadata["embedding_provider"] = embedding_metadata["embedding_provider"]
-                        if "embedding_model" in embedding_metadata:
-                            metadata["embedding_model"] = embedding_metadata["embedding_model"]
-            except (OSError, json.JSONDecodeError) as _:
-                logger.exception("Error reading embedding metadata file '%s'", metadata_file)
-
-        # Fallback to detection if not found in metadata file
-        if metadata["embedding_provider"] == "Unknown":
-            metadata["embedding_provider"] = detect_embedding_provider(kb_path)
-        if metadata["embedding_model"] == "Unknown":
-            metadata["embedding_model"] = detect_embedding_model(kb_path)
-
-        # Read schema for text column information
-        schema_data = None
-        schema_file = kb_path / "schema.json"
-        if schema_file.exists():
-            try:
-                with schema_file.open("r", encoding="utf-8") as f:
-                    schema_data = json.load(f)
-                    if not isinstance(schema_data, list):
-                        schema_data = None
-            except (ValueError, TypeError, OSError) as _:
-                logger.exception("Error reading schema file '%s'", schema_file)
-
-        # Create vector store
-        chroma = Chroma(
-            persist_directory=str(kb_path),
-            collection_name=kb_path.name,
-        )
-
-        # Access the raw collection
-        collection = chroma._collection
-
-        # Fetch all documents and metadata
-        results = collection.get(include=["documents", "metadatas"])
-
-        # Convert to pandas DataFrame
-        source_chunks = pd.DataFrame(
-            {
-                "document": results["documents"],
-                "metadata": results["metadatas"],
-            }
-        )
-
-        # Process the source data for metadata
         try:
-            metadata["chunks"] = len(source_chunks)
-
-            # Get text columns and calculate metrics
-            text_columns = get_text_columns(source_chunks, schema_data)
-            if text_columns:
-                words, characters = calculate_text_metrics(source_chunks, text_columns)
-                metadata["words"] = words
-                metadata["characters"] = characters
-
-                # Calculate average chunk size
-                if int(metadata["chunks"]) > 0:
-                    metadata["avg_chunk_size"] = round(int(characters) / int(metadata["chunks"]), 1)
-
-        except (OSError, ValueError, TypeError) as _:
-            logger.exception("Error processing Chroma DB '%s'", kb_path.name)
-
-    except (OSError, ValueError, TypeError) as _:
-        logger.exception("Error processing knowledge base directory '%s'", kb_path)
+            # Stored statistics; only knowledge bases without any are scanned
+            knowledge_bases.append(_kb_info(kb_dir))
+        except OSError as _:
+            # Log the exception and skip directories that can't be read
+            logger.exception("Error reading knowledge base directory '%s'", kb_dir)
+            continue
 
-    return metadata
+    # Sort by name alphabetically
+    knowledge_bases.sort(key=lambda x: x.name)
+    return knowledge_bases
 
 
 @router.get("", status_code=HTTPStatus.OK)
@@ -264,40 +98,7 @@ async def list_knowledge_bases(current_user: CurrentActiveUser) -> list[Knowledg
         if not kb_path.exists():
             return []
 
-        knowledge_bases = []
-
-        for kb_dir in kb_path.iterdir():
-            if not kb_dir.is_dir() or kb_dir.name.startswith("."):
-                continue
-
-            try:
-                # Get size of the directory
-                size = get_directory_size(kb_dir)
-
-                # Get metadata from KB files
-                metadata = get_kb_metadata(kb_dir)
-
-                kb_info = KnowledgeBaseInfo(
-                    id=kb_dir.name,
-                    name=kb_dir.name.replace("_", " ").replace("-", " ").title(),
-                    embedding_provider=metadata["embedding_provider"],
-                    embedding_model=metadata["embedding_model"],
-                    size=size,
-                    words=metadata["words"],
-                    characters=metadata["characters"],
-                    chunks=metadata["chunks"],
-                    avg_chunk_size=metadata["avg_chunk_size"],
-                )
-
-                knowledge_bases.append(kb_info)
-
-            except OSError as _:
-                # Log the exception and skip directories that can't be read
-                logger.exception("Error reading knowledge base directory '%s'", kb_dir)
-                continue
-
-        # Sort by name alphabetically
-        knowledge_bases.sort(key=lambda x: x.name)
+        knowledge_bases = await asyncio.to_thread(_list_kb_infos, kb_path)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing knowledge bases: {e!s}") from e
@@ -316,23 +117,7 @@ async def get_knowledge_base(kb_name: str, current_user: CurrentActiveUser) -> K
         if not kb_path.exists() or not kb_path.is_dir():
             raise HTTPException(status_code=404, detail=f"Knowledge base '{kb_name}' not found")
 
-        # Get size of the directory
-        size = get_directory_size(kb_path)
-
-        # Get metadata from KB files
-        metadata = get_kb_metadata(kb_path)
-
-        return KnowledgeBaseInfo(
-            id=kb_name,
-            name=kb_name.replace("_", " ").replace("-", " ").title(),
-            embedding_provider=metadata["embedding_provider"],
-            embedding_model=metadata["embedding_model"],
-            size=size,
-            words=metadata["words"],
-            characters=metadata["characters"],
-            chunks=metadata["chunks"],
-            avg_chunk_size=metadata["avg_chunk_size"],
-        )
+        return await asyncio.to_thread(_kb_info, kb_path)
 
     except HTTPException:
         raise
@@ -352,7 +137,7 @@ async def delete_knowledge_base(kb_name: str, current_user: CurrentActiveUser) -
             raise HTTPException(status_code=404, detail=f"Knowledge base '{kb_name}' not found")
 
         # Delete the entire knowledge base directory
-        shutil.rmtree(kb_path)
+        await asyncio.to_thread(delete_kb, kb_path)
 
     except HTTPException:
         raise
@@ -382,7 +167,7 @@ async def delete_knowledge_bases_bulk(request: BulkDeleteRequest, current_user:
 
             try:
                 # Delete the entire knowledge base directory
-                shutil.rmtree(kb_path)
+                await asyncio.to_thread(delete_kb, kb_path)
                 deleted_count += 1
             except (OSError, PermissionError) as e:
                 logger.exception("Error deleting knowledge base '%s': %s", kb_name, e)
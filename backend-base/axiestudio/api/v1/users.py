@@ -15,6 +15,7 @@ from axiestudio.services.auth.utils import (
     get_password_hash,
     verify_password,
 )
+from axiestudio.services.database.models.api_key.cache import invalidate_user_api_keys
 from axiestudio.services.database.models.user.crud import get_user_by_id, update_user
 from axiestudio.services.database.models.user.model import User, UserCreate, UserRead, UserUpdate
 from axiestudio.services.deps import get_settings_service
@@ -323,6 +324,7 @@ async def delete_user(
         # Now delete the user
         await session.delete(user_db)
         await session.commit()
+        invalidate_user_api_keys(user_id)
 
         return {"detail": "User deleted"}
     except IntegrityError as e:
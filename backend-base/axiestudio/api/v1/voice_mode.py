@@ -7,7 +7,7 @@ import traceback
 import uuid
 from collections import defaultdict
 from datetime import datetime, timezone
-from functools import lru_cache, partial
+from functools import partial
 from typing import Any
 from uuid import UUID, uuid4
 
@@ -33,11 +33,7 @@ from axiestudio.services.database.models.flow.model import Flow
 from axiestudio.services.database.models.message.model import MessageTable
 from axiestudio.services.database.models.user.model import User
 from axiestudio.services.deps import get_variable_service, session_scope
-from axiestudio.utils.voice_utils import (
-    BYTES_PER_24K_FRAME,
-    VAD_SAMPLE_RATE_16K,
-    resample_24k_to_16k,
-)
+from axiestudio.utils.voice_utils import SpeechDetector
 
 router = APIRouter(prefix="/voice", tags=["Voice"])
 
@@ -82,8 +78,8 @@ CLIENT_TO_LF = "Client → LF"
 # --- Helper Functions ---
 
 
-@lru_cache(maxsize=1)
 def get_vad():
+    # One instance per session: VAD runs in worker threads and the detector keeps state between frames
     import webrtcvad
 
     return webrtcvad.Vad(mode=3)
@@ -775,34 +771,23 @@ async def flow_as_tool_websocket(
 
             # Setup for VAD processing.
             vad_queue: asyncio.Queue = asyncio.Queue()
-            vad_audio_buffer = bytearray()
             bot_speaking_flag = [False]
 
             async def process_vad_audio() -> None:
-                nonlocal vad_audio_buffer
                 last_speech_time = datetime.now(tz=timezone.utc)
-                vad = get_vad()
+                speech_detector = SpeechDetector(get_vad())
                 while True:
-                    base64_data = await vad_queue.get()
-                    raw_chunk_24k = base64.b64decode(base64_data)
-                    vad_audio_buffer.extend(raw_chunk_24k)
-                    has_speech = False
-                    while len(vad_audio_buffer) >= BYTES_PER_24K_FRAME:
-                        frame_24k = vad_audio_buffer[:BYTES_PER_24K_FRAME]
-                        del vad_audio_buffer[:BYTES_PER_24K_FRAME]
-                        try:
-                            frame_16k = resample_24k_to_16k(frame_24k)
-                            is_speech = vad.is_speech(frame_16k, VAD_SAMPLE_RATE_16K)
-                            if is_speech:
-                                has_speech = True
-                                logger.trace("!", end="")
-                                if bot_speaking_flag[0]:
-                                    msg_handler.openai_send({"type": "response.cancel"})
-                                    bot_speaking_flag[0] = False
-                        except Exception as e:  # noqa: BLE001
-                            logger.error(f"[ERROR] VAD processing failed (ValueError): {e}")
-                            continue
+                    raw_chunk_24k = base64.b64decode(await vad_queue.get())
+                    # Take what has queued up meanwhile, so a slow worker thread catches up in one call
+                    while not vad_queue.empty():
+                        raw_chunk_24k += base64.b64decode(vad_queue.get_nowait())
+                    # Resampling and VAD run off the event loop
+                    has_speech = await asyncio.to_thread(speech_detector.process, raw_chunk_24k)
                     if has_speech:
+                        logger.trace("!", end="")
+                        if bot_speaking_flag[0]:
+                            msg_handler.openai_send({"type": "response.cancel"})
+                            bot_speaking_flag[0] = False
                         last_speech_time = datetime.now(tz=timezone.utc)
                         logger.trace(".", end="")
                     else:
@@ -0,0 +1,497 @@
+"""Statistics of knowledge bases, kept in a small file in each knowledge base directory.
+
+Computing the statistics of a knowledge base means reading every chunk from its Chroma
+collection and walking its directory, so listing knowledge bases used to cost time in
+proportion to the whole corpus. Instead, the statistics are stored in ``.kb_stats.json``:
+
+* listing reads that file, and computes it only for knowledge bases that have none yet;
+* ingest and removal code calls :func:`record_ingest` / :func:`record_removal` to adjust the
+  counts by the chunks it wrote or removed, without a scan;
+* :class:`KnowledgeBaseStatsReconciler` periodically recomputes the statistics of knowledge
+  bases whose files changed since their statistics were written, which catches writes that
+  did not go through the functions above;
+* deleting a whole knowledge base goes through :func:`delete_kb`, so it can't race with an
+  update of its statistics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pandas as pd
+from langchain_chroma import Chroma
+from pydantic import BaseModel
+
+from axiestudio.logging import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from axiestudio.services.settings.service import SettingsService
+
+STATS_FILE_NAME = ".kb_stats.json"
+STATS_VERSION = 1
+
+
+class KnowledgeBaseStats(BaseModel):
+    embedding_provider: str = "Unknown"
+    embedding_model: str = "Unknown"
+    size: int = 0
+    words: int = 0
+    characters: int = 0
+    chunks: int = 0
+    fingerprint: str = ""
+    updated_at: datetime | None = None
+    version: int = STATS_VERSION
+
+    @property
+    def avg_chunk_size(self) -> float:
+        return round(self.characters / self.chunks, 1) if self.chunks > 0 else 0.0
+
+
+def get_directory_size(path: Path) -> int:
+    """Calculate the total size of all files in a directory."""
+    total_size = 0
+    try:
+        for file_path in path.rglob("*"):
+            if file_path.is_file():
+                total_size += file_path.stat().st_size
+    except (OSError, PermissionError) as e:
+        logger.error(f"Error calculating directory size for {path}: {e}")
+    return total_size
+
+
+def detect_embedding_provider(kb_path: Path) -> str:
+    """Detect the embedding provider from the knowledge base files."""
+    # Check for Chroma-specific files
+    if (kb_path / "chroma.sqlite3").exists() or any(kb_path.glob("*.parquet")):
+        return "Chroma"
+    if (kb_path / "vectors.npy").exists():
+        return "Local"
+
+    return "Unknown"
+
+
+def detect_embedding_model(kb_path: Path) -> str:
+    """Detect the embedding model from config files."""
+    # First check the embedding metadata file (most accurate)
+    metadata_file = kb_path / "embedding_metadata.json"
+    if metadata_file.exists():
+        try:
+            with metadata_file.open("r", encoding="utf-8") as f:
+                metadata = json.load(f)
+                if isinstance(metadata, dict) and "embedding_model" in metadata:
+                    # Check for embedding model field
+                    model_value = str(metadata.get("embedding_model", "unknown"))
+                    if model_value and model_value.lower() != "unknown":
+                        return model_value
+        except (OSError, json.JSONDecodeError) as _:
+            logger.exception("Error reading embedding metadata file '%s'", metadata_file)
+
+    # Check other JSON config files for model information
+    for config_file in kb_path.glob("*.json"):
+        # Skip the embedding metadata file since we already checked it, and the stats file
+        if config_file.name in {"embedding_metadata.json", STATS_FILE_NAME}:
+            continue
+
+        try:
+            with config_file.open("r", encoding="utf-8") as f:
+                config_data = json.load(f)
+                if not isinstance(config_data, dict):
+                    continue
+
+                # Check for explicit model fields first and return the actual model name
+                model_fields = ["embedding_model", "model", "embedding_model_name", "model_name"]
+                for field in model_fields:
+                    if field in config_data:
+                        model_value = str(config_data[field])
+                        if model_value and model_value.lower() != "unknown":
+                            return model_value
+
+                # Check for OpenAI specific model names
+                if "openai" in json.dumps(config_data).lower():
+                    openai_models = ["text-embedding-ada-002", "text-embedding-3-small", "text-embedding-3-large"]
+                    config_str = json.dumps(config_data).lower()
+                    for model in openai_models:
+                        if model in config_str:
+                            return model
+
+                # Check for HuggingFace model names (usually in model field)
+                if "model" in config_data:
+                    model_name = str(config_data["model"])
+                    # Common HuggingFace embedding models
+                    hf_patterns = ["sentence-transformers", "all-MiniLM", "all-mpnet", "multi-qa"]
+                    if any(pattern in model_name for pattern in hf_patterns):
+                        return model_name
+
+        except (OSError, json.JSONDecodeError) as _:
+            logger.exception("Error reading config file '%s'", config_file)
+            continue
+
+    return "Unknown"
+
+
+def get_text_columns(df: pd.DataFrame, schema_data: list | None = None) -> list[str]:
+    """Get the text columns to analyze for word/character counts."""
+    # First try schema-defined text columns
+    if schema_data:
+        text_columns = [
+            col["column_name"]
+            for col in schema_data
+            if col.get("vectorize", False) and col.get("data_type") == "string"
+        ]
+        if text_columns:
+            return [col for col in text_columns if col in df.columns]
+
+    # Fallback to common text column names
+    common_names = ["text", "content", "document", "chunk"]
+    text_columns = [col for col in df.columns if col.lower() in common_names]
+    if text_columns:
+        return text_columns
+
+    # Last resort: all string columns
+    return [col for col in df.columns if df[col].dtype == "object"]
+
+
+def calculate_text_metrics(df: pd.DataFrame, text_columns: list[str]) -> tuple[int, int]:
+    """Calculate total words and characters from text columns."""
+    total_words = 0
+    total_characters = 0
+
+    for col in text_columns:
+        if col not in df.columns:
+            continue
+
+        text_series = df[col].astype(str).fillna("")
+        total_characters += text_series.str.len().sum()
+        total_words += text_series.str.split().str.len().sum()
+
+    return int(total_words), int(total_characters)
+
+
+def get_kb_metadata(kb_path: Path) -> dict:
+    """Extract metadata from a knowledge base directory."""
+    metadata: dict[str, float | int | str] = {
+        "chunks": 0,
+        "words": 0,
+        "characters": 0,
+        "avg_chunk_size": 0.0,
+        "embedding_provider": "Unknown",
+        "embedding_model": "Unknown",
+    }
+
+    try:
+        # First check embedding metadata file for accurate provider and model info
+        metadata_file = kb_path / "embedding_metadata.json"
+        if metadata_file.exists():
+            try:
+                with metadata_file.open("r", encoding="utf-8") as f:
+                    embedding_metadata = json.load(f)
+                    if isinstance(embedding_metadata, dict):
+                        if "embedding_provider" in embedding_metadata:
+                            metadata["embedding_provider"] = embedding_metadata["embedding_provider"]
+                        if "embedding_model" in embedding_metadata:
+                            metadata["embedding_model"] = embedding_metadata["embedding_model"]
+            except (OSError, json.JSONDecodeError) as _:
+                logger.exception("Error reading embedding metadata file '%s'", metadata_file)
+
+        # Fallback to detection if not found in metadata file
+        if metadata["embedding_provider"] == "Unknown":
+            metadata["embedding_provider"] = detect_embedding_provider(kb_path)
+        if metadata["embedding_model"] == "Unknown":
+            metadata["embedding_model"] = detect_embedding_model(kb_path)
+
+        # Read schema for text column information
+        schema_data = None
+        schema_file = kb_path / "schema.json"
+        if schema_file.exists():
+            try:
+                with schema_file.open("r", encoding="utf-8") as f:
+                    schema_data = json.load(f)
+                    if not isinstance(schema_data, list):
+                        schema_data = None
+            except (ValueError, TypeError, OSError) as _:
+                logger.exception("Error reading schema file '%s'", schema_file)
+
+        # Create vector store
+        chroma = Chroma(
+            persist_directory=str(kb_path),
+            collection_name=kb_path.name,
+        )
+
+        # Access the raw collection
+        collection = chroma._collection
+
+        # Fetch all documents and metadata
+        results = collection.get(include=["documents", "metadatas"])
+
+        # Convert to pandas DataFrame
+        source_chunks = pd.DataFrame(
+            {
+                "document": results["documents"],
+                "metadata": results["metadatas"],
+            }
+        )
+
+        # Process the source data for metadata
+        try:
+            metadata["chunks"] = len(source_chunks)
+
+            # Get text columns and calculate metrics
+            text_columns = get_text_columns(source_chunks, schema_data)
+            if text_columns:
+                words, characters = calculate_text_metrics(source_chunks, text_columns)
+                metadata["words"] = words
+                metadata["characters"] = characters
+
+                # Calculate average chunk size
+                if int(metadata["chunks"]) > 0:
+                    metadata["avg_chunk_size"] = round(int(characters) / int(metadata["chunks"]), 1)
+
+        except (OSError, ValueError, TypeError) as _:
+            logger.exception("Error processing Chroma DB '%s'", kb_path.name)
+
+    except (OSError, ValueError, TypeError) as _:
+        logger.exception("Error processing knowledge base directory '%s'", kb_path)
+
+    return metadata
+
+
+def kb_fingerprint(kb_path: Path) -> str:
+    """Return a cheap signature of the files of a knowledge base.
+
+    Chroma rewrites ``chroma.sqlite3`` on every change, so the sizes and modification times of
+    the top-level entries change whenever chunks are added or removed.
+    """
+    entries = []
+    try:
+        for entry in os.scandir(kb_path):
+            if entry.name == STATS_FILE_NAME:
+                continue
+            stat = entry.stat()
+            entries.append(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    except OSError:
+        return ""
+    return "|".join(sorted(entries))
+
+
+def compute_kb_stats(kb_path: Path) -> KnowledgeBaseStats:
+    """Compute the statistics of a knowledge base with a full scan of its collection and directory."""
+    fingerprint = kb_fingerprint(kb_path)
+    metadata = get_kb_metadata(kb_path)
+    return KnowledgeBaseStats(
+        embedding_provider=str(metadata["embedding_provider"]),
+        embedding_model=str(metadata["embedding_model"]),
+        size=get_directory_size(kb_path),
+        words=int(metadata["words"]),
+        characters=int(metadata["characters"]),
+        chunks=int(metadata["chunks"]),
+        fingerprint=fingerprint,
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+_locks: dict[Path, threading.Lock] = {}
+_locks_lock = threading.Lock()
+
+
+def _kb_lock(kb_path: Path) -> threading.Lock:
+    with _locks_lock:
+        return _locks.setdefault(kb_path.resolve(), threading.Lock())
+
+
+def read_kb_stats(kb_path: Path) -> KnowledgeBaseStats | None:
+    """Return the stored statistics of a knowledge base, or None if there are none or they are unreadable."""
+    stats_file = kb_path / STATS_FILE_NAME
+    try:
+        stats = KnowledgeBaseStats.model_validate_json(stats_file.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.debug(f"Ignoring unreadable knowledge base stats file {stats_file}")
+        return None
+    return stats if stats.version == STATS_VERSION else None
+
+
+def write_kb_stats(kb_path: Path, stats: KnowledgeBaseStats) -> None:
+    """Store the statistics of a knowledge base, replacing the file atomically."""
+    stats_file = kb_path / STATS_FILE_NAME
+    fd, tmp_name = tempfile.mkstemp(dir=kb_path, prefix=STATS_FILE_NAME, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(stats.model_dump_json())
+        Path(tmp_name).replace(stats_file)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def refresh_kb_stats(kb_path: Path) -> KnowledgeBaseStats:
+    """Recompute and store the statistics of a knowledge base."""
+    with _kb_lock(kb_path):
+        stats = compute_kb_stats(kb_path)
+        try:
+            write_kb_stats(kb_path, stats)
+        except OSError as e:
+            logger.warning(f"Could not write knowledge base stats for {kb_path}: {e}")
+    return stats
+
+
+def get_kb_stats(kb_path: Path) -> KnowledgeBaseStats:
+    """Return the statistics of a knowledge base, computing and storing them if there are none yet."""
+    stats = read_kb_stats(kb_path)
+    if stats is None:
+        stats = refresh_kb_stats(kb_path)
+    return stats
+
+
+def _text_metrics(texts: Iterable[str | None]) -> tuple[int, int, int]:
+    chunks = words = characters = 0
+    for text in texts:
+        # Same counting as the full scan, which reads the documents as strings
+        value = str(text)
+        chunks += 1
+        words += len(value.split())
+        characters += len(value)
+    return chunks, words, characters
+
+
+def _update_kb_stats(kb_path: Path, texts: Iterable[str | None], sign: int, **fields) -> KnowledgeBaseStats:
+    chunks, words, characters = _text_metrics(texts)
+    with _kb_lock(kb_path):
+        stats = read_kb_stats(kb_path)
+        if stats is None:
+            # Nothing to adjust yet: a full scan already includes the change
+            stats = compute_kb_stats(kb_path)
+        else:
+            stats.chunks = max(stats.chunks + sign * chunks, 0)
+            stats.words = max(stats.words + sign * words, 0)
+            stats.characters = max(stats.characters + sign * characters, 0)
+            stats.size = get_directory_size(kb_path)
+            stats.fingerprint = kb_fingerprint(kb_path)
+            stats.updated_at = datetime.now(timezone.utc)
+        for name, value in fields.items():
+            if value is not None:
+                setattr(stats, name, value)
+        try:
+            write_kb_stats(kb_path, stats)
+        except OSError as e:
+            logger.warning(f"Could not write knowledge base stats for {kb_path}: {e}")
+    return stats
+
+
+def record_ingest(
+    kb_path: Path,
+    texts: Iterable[str | None],
+    *,
+    embedding_provider: str | None = None,
+    embedding_model: str | None = None,
+) -> KnowledgeBaseStats:
+    """Add chunks that were just written to a knowledge base to its statistics.
+
+    Call this after the chunks are persisted, so the stored fingerprint matches the files.
+    """
+    return _update_kb_stats(kb_path, texts, 1, embedding_provider=embedding_provider, embedding_model=embedding_model)
+
+
+def record_removal(kb_path: Path, texts: Iterable[str | None]) -> KnowledgeBaseStats:
+    """Subtract chunks that were just removed from a knowledge base from its statistics."""
+    return _update_kb_stats(kb_path, texts, -1)
+
+
+def delete_kb(kb_path: Path) -> None:
+    """Delete a knowledge base directory, its statistics included.
+
+    The directory is removed under the lock of the knowledge base, so an ingest, removal or
+    refresh running at the same time doesn't write its statistics into a half-deleted directory.
+    """
+    with _kb_lock(kb_path):
+        shutil.rmtree(kb_path)
+    with _locks_lock:
+        _locks.pop(kb_path.resolve(), None)
+
+
+def iter_kb_dirs(root: Path) -> Iterable[Path]:
+    """Yield the knowledge base directories of every user under ``root``."""
+    if not root.exists():
+        return
+    for user_dir in root.iterdir():
+        if not user_dir.is_dir() or user_dir.name.startswith("."):
+            continue
+        for kb_dir in user_dir.iterdir():
+            if kb_dir.is_dir() and not kb_dir.name.startswith("."):
+                yield kb_dir
+
+
+def reconcile_kb_stats(root: Path) -> int:
+    """Recompute the statistics of the knowledge bases whose files changed since they were stored.
+
+    Returns:
+        The number of knowledge bases whose statistics were recomputed.
+    """
+    refreshed = 0
+    for kb_dir in list(iter_kb_dirs(root)):
+        stats = read_kb_stats(kb_dir)
+        if stats is not None and stats.fingerprint == kb_fingerprint(kb_dir):
+            continue
+        try:
+            refresh_kb_stats(kb_dir)
+        except OSError as e:
+            logger.warning(f"Could not reconcile knowledge base stats for {kb_dir}: {e}")
+            continue
+        refreshed += 1
+    return refreshed
+
+
+class KnowledgeBaseStatsReconciler:
+    """Background task that keeps the stored knowledge base statistics in line with the files.
+
+    Args:
+        root: Directory holding one directory of knowledge bases per user.
+        interval: Seconds between two passes.
+    """
+
+    def __init__(self, root: Path, interval: float) -> None:
+        self.root = root
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                refreshed = await asyncio.to_thread(reconcile_kb_stats, self.root)
+                if refreshed:
+                    logger.debug(f"Recomputed the statistics of {refreshed} knowledge bases")
+            except Exception:  # noqa: BLE001
+                logger.exception("Error reconciling knowledge base statistics")
+            await asyncio.sleep(self.interval)
+
+
+def create_kb_stats_reconciler(settings_service: SettingsService) -> KnowledgeBaseStatsReconciler | None:
+    """Start the knowledge base statistics reconciler, unless it is disabled in the settings."""
+    settings = settings_service.settings
+    interval = settings.knowledge_base_stats_reconcile_interval
+    if interval <= 0 or not settings.knowledge_bases_dir:
+        return None
+    reconciler = KnowledgeBaseStatsReconciler(Path(settings.knowledge_bases_dir).expanduser(), interval)
+    reconciler.start()
+    return reconciler
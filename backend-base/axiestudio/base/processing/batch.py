@@ -0,0 +1,190 @@
+"""Run one model call per item of a batch with bounded concurrency.
+
+Sending a whole DataFrame to ``Runnable.abatch`` starts every request at once and loses
+every result when a single one fails. :class:`BatchRunner` instead runs the items of a
+chunk with at most ``max_concurrency`` requests in flight, retries rate-limited and
+transient failures with exponential backoff, and records the error of an item that still
+fails instead of raising it.
+
+When the provider rate limits a request, all requests pause for the backoff delay (or the
+``Retry-After`` the provider asked for) and the concurrency limit is halved. It grows back
+by one request after each run of successful requests, up to ``max_concurrency``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Sequence
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 3
+
+_RATE_LIMIT_STATUS = 429
+_TRANSIENT_STATUSES = frozenset({408, 500, 502, 503, 504, 529})
+_RATE_LIMIT_NAMES = ("RateLimit", "TooManyRequests", "ResourceExhausted")
+_TRANSIENT_NAMES = ("Timeout", "Connect", "ServiceUnavailable", "InternalServer", "Overloaded")
+
+
+def _status_code(exc: BaseException) -> int | None:
+    for source in (exc, getattr(exc, "response", None)):
+        for attribute in ("status_code", "status", "code"):
+            code = getattr(source, attribute, None)
+            if isinstance(code, int) and not isinstance(code, bool):
+                return code
+    return None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Whether ``exc`` tells that the provider is rate limiting (HTTP 429 or the client's equivalent)."""
+    return _status_code(exc) == _RATE_LIMIT_STATUS or any(name in type(exc).__name__ for name in _RATE_LIMIT_NAMES)
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Whether ``exc`` is a timeout, connection or server error that may succeed when retried."""
+    if isinstance(exc, asyncio.TimeoutError | TimeoutError | ConnectionError):
+        return True
+    return _status_code(exc) in _TRANSIENT_STATUSES or any(name in type(exc).__name__ for name in _TRANSIENT_NAMES)
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Return the delay in seconds asked for by the ``Retry-After`` header of the failed response, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if (value := headers.get("retry-after-ms")) is not None:
+            return float(value) / 1000
+        if (value := headers.get("retry-after")) is not None:
+            return float(value)
+    except (TypeError, ValueError):
+        # An HTTP date instead of seconds; fall back to our own backoff
+        return None
+    return None
+
+
+class AdaptiveConcurrencyLimiter:
+    """Caps the requests in flight, lowering the cap while the provider is rate limiting.
+
+    Args:
+        max_concurrency: Upper bound of the cap.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = self.max_concurrency
+        self.in_flight = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        if (pause := self._paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(pause)
+
+    async def release(self, *, rate_limited: bool = False, pause: float = 0.0) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            if rate_limited:
+                # Requests already in flight when the first one was rejected fail too; count that as one signal
+                if time.monotonic() >= self._paused_until:
+                    self.limit = max(1, self.limit // 2)
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self.limit < self.max_concurrency and self._successes >= self.limit:
+                    self.limit += 1
+                    self._successes = 0
+            self._condition.notify(max(0, self.limit - self.in_flight))
+
+
+class RowResult(NamedTuple):
+    index: int
+    value: Any = None
+    error: Exception | None = None
+    attempts: int = 1
+
+
+class BatchRunner:
+    """Calls ``invoke`` once per item, a chunk of items at a time.
+
+    The limiter is shared by all chunks, so a lowered concurrency limit carries over to the
+    next chunk.
+
+    Args:
+        invoke: Coroutine function called with each item.
+        max_concurrency: Maximum number of calls in flight.
+        max_retries: Retries of an item after a rate limit or a transient error.
+        base_delay: Backoff delay in seconds before the first retry; doubled on every further retry.
+        max_delay: Upper bound of the backoff delay.
+    """
+
+    def __init__(
+        self,
+        invoke: Callable[[Any], Awaitable[Any]],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ) -> None:
+        self.invoke = invoke
+        self.limiter = AdaptiveConcurrencyLimiter(max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.rate_limited = 0
+        self.failed = 0
+
+    def _backoff(self, attempt: int, requested: float | None = None) -> float:
+        delay = min(self.max_delay, self.base_delay * 2**attempt) * random.uniform(0.5, 1.0)  # noqa: S311
+        return max(delay, min(requested or 0.0, self.max_delay))
+
+    async def _run_item(self, index: int, item: Any) -> RowResult:
+        attempt = 0
+        while True:
+            await self.limiter.acquire()
+            rate_limited = False
+            delay = 0.0
+            try:
+                value = await self.invoke(item)
+            except Exception as exc:  # noqa: BLE001
+                rate_limited = is_rate_limit_error(exc)
+                if attempt >= self.max_retries or not (rate_limited or is_transient_error(exc)):
+                    self.failed += 1
+                    return RowResult(index, error=exc, attempts=attempt + 1)
+                delay = self._backoff(attempt, retry_after(exc) if rate_limited else None)
+                if rate_limited:
+                    self.rate_limited += 1
+            else:
+                return RowResult(index, value=value, attempts=attempt + 1)
+            finally:
+                await self.limiter.release(rate_limited=rate_limited, pause=delay if rate_limited else 0.0)
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def run_chunk(self, items: Sequence[Any], *, start: int = 0) -> list[RowResult]:
+        """Run ``invoke`` on each item and return the results in the order of the items.
+
+        Args:
+            items: The items of the chunk.
+            start: Index of the first item in the whole batch, used for :attr:`RowResult.index`.
+        """
+        tasks = [asyncio.create_task(self._run_item(start + offset, item)) for offset, item in enumerate(items)]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
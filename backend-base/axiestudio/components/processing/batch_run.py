@@ -5,9 +5,12 @@ from typing import TYPE_CHECKING, Any, cast
 import toml  # type: ignore[import-untyped]
 from axiestudio.logging import logger
 
+from axiestudio.base.processing.batch import DEFAULT_MAX_CONCURRENCY, DEFAULT_MAX_RETRIES, BatchRunner
 from axiestudio.custom.custom_component.component import Component
-from axiestudio.io import BoolInput, DataFrameInput, HandleInput, MessageTextInput, MultilineInput, Output
+from axiestudio.io import BoolInput, DataFrameInput, HandleInput, IntInput, MessageTextInput, MultilineInput, Output
+from axiestudio.schema.artifact import get_artifact_type
 from axiestudio.schema.dataframe import DataFrame
+from axiestudio.services.tracing.schema import Log
 
 if TYPE_CHECKING:
     from langchain_core.runnables import Runnable
@@ -18,6 +21,7 @@ class BatchRunComponent(Component):
     description = "Runs an LLM on each row of a DataFrame column. If no column is specified, all columns are used."
     documentation: str = "https://docs.axiestudio.org/components-processing#batch-run"
     icon = "List"
+    retry_base_delay = 1.0
 
     inputs = [
         HandleInput(
@@ -57,6 +61,33 @@ class BatchRunComponent(Component):
             required=False,
             advanced=True,
         ),
+        IntInput(
+            name="chunk_size",
+            display_name="Chunk Size",
+            info="Number of rows sent to the model before the next rows are read. Smaller chunks use less memory.",
+            value=100,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_concurrency",
+            display_name="Max Concurrent Requests",
+            info=(
+                "Maximum number of requests to the model in flight at the same time. "
+                "Lowered automatically while the provider is rate limiting."
+            ),
+            value=DEFAULT_MAX_CONCURRENCY,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_retries",
+            display_name="Max Retries",
+            info=(
+                "Number of times a row is retried after a rate limit or a transient error. "
+                "Rows that still fail get an empty response and their error in the metadata."
+            ),
+            value=DEFAULT_MAX_RETRIES,
+            advanced=True,
+        ),
         BoolInput(
             name="enable_metadata",
             display_name="Enable Metadata",
@@ -110,9 +141,32 @@ class BatchRunComponent(Component):
                 "processing_status": "failed",
             }
 
+    def _build_conversation(self, system_msg: str, text: str) -> list[dict[str, str]]:
+        if system_msg:
+            return [{"role": "system", "content": system_msg}, {"role": "user", "content": text}]
+        return [{"role": "user", "content": text}]
+
+    def _send_rows(self, rows: list[dict[str, Any]], name: str) -> None:
+        """Send partial rows to the build events only.
+
+        Unlike :meth:`log`, nothing is kept in the logs or traces: the returned DataFrame is the
+        only full copy of the rows.
+        """
+        if self._event_manager is None or not self._current_output:
+            return
+        data = Log(message=rows, type=get_artifact_type(rows), name=name).model_dump()
+        data["output"] = self._current_output
+        data["component_id"] = self._id
+        self._event_manager.on_log(data=data)
+
     async def run_batch(self) -> DataFrame:
         """Process each row in df[column_name] with the language model asynchronously.
 
+        Rows are sent in chunks of ``chunk_size``, with at most ``max_concurrency`` requests in
+        flight. A row that fails after its retries gets an empty response instead of failing
+        the whole batch. The rows of each chunk are sent to the build events as soon as the chunk
+        is done, so partial results arrive before the whole DataFrame is returned.
+
         Returns:
             DataFrame: A new DataFrame containing:
                 - All original columns
@@ -139,25 +193,10 @@ class BatchRunComponent(Component):
             raise ValueError(msg)
 
         try:
-            # Determine text input for each row
-            if col_name:
-                user_texts = df[col_name].astype(str).tolist()
-            else:
-                user_texts = [
-                    self._format_row_as_toml(cast(dict[str, Any], row)) for row in df.to_dict(orient="records")
-                ]
-
-            total_rows = len(user_texts)
+            total_rows = len(df)
+            chunk_size = max(1, self.chunk_size or 1)
             logger.info(f"Processing {total_rows} rows with batch run")
 
-            # Prepare the batch of conversations
-            conversations = [
-                [{"role": "system", "content": system_msg}, {"role": "user", "content": text}]
-                if system_msg
-                else [{"role": "user", "content": text}]
-                for text in user_texts
-            ]
-
             # Configure the model with project info and callbacks
             model = model.with_config(
                 {
@@ -166,35 +205,59 @@ class BatchRunComponent(Component):
                     "callbacks": self.get_langchain_callbacks(),
                 }
             )
-            # Process batches and track progress
-            responses_with_idx = list(
-                zip(
-                    range(len(conversations)),
-                    await model.abatch(list(conversations)),
-                    strict=True,
-                )
+            runner = BatchRunner(
+                model.ainvoke,
+                max_concurrency=self.max_concurrency or DEFAULT_MAX_CONCURRENCY,
+                max_retries=self.max_retries if self.max_retries is not None else DEFAULT_MAX_RETRIES,
+                base_delay=self.retry_base_delay,
             )
 
-            # Sort by index to maintain order
-            responses_with_idx.sort(key=lambda x: x[0])
-
-            # Build the final data with enhanced metadata
             rows: list[dict[str, Any]] = []
-            for idx, (original_row, response) in enumerate(
-                zip(df.to_dict(orient="records"), responses_with_idx, strict=False)
-            ):
-                response_text = response[1].content if hasattr(response[1], "content") else str(response[1])
-                row = self._create_base_row(
-                    cast(dict[str, Any], original_row), model_response=response_text, batch_index=idx
-                )
-                self._add_metadata(row, success=True, system_msg=system_msg)
-                rows.append(row)
+            progress_step = max(1, total_rows // 10)
+            for start in range(0, total_rows, chunk_size):
+                # Only one chunk of conversations and responses is held at a time
+                records = cast("list[dict[str, Any]]", df.iloc[start : start + chunk_size].to_dict(orient="records"))
+                if col_name:
+                    user_texts = [str(record[col_name]) for record in records]
+                else:
+                    user_texts = [self._format_row_as_toml(record) for record in records]
+                conversations = [self._build_conversation(system_msg, text) for text in user_texts]
+
+                results = await runner.run_chunk(conversations, start=start)
+
+                chunk_rows: list[dict[str, Any]] = []
+                for original_row, result in zip(records, results, strict=True):
+                    if result.error is None:
+                        response = result.value
+                        response_text = response.content if hasattr(response, "content") else str(response)
+                        row = self._create_base_row(
+                            original_row, model_response=response_text, batch_index=result.index
+                        )
+                        self._add_metadata(row, success=True, system_msg=system_msg)
+                    else:
+                        row = self._create_base_row(original_row, model_response="", batch_index=result.index)
+                        self._add_metadata(row, success=False, error=f"{type(result.error).__name__}: {result.error}")
+                    chunk_rows.append(row)
+                rows.extend(chunk_rows)
+                self._send_rows(chunk_rows, name=f"Rows {start + 1}-{start + len(chunk_rows)}")
 
                 # Log progress
-                if (idx + 1) % max(1, total_rows // 10) == 0:
-                    logger.info(f"Processed {idx + 1}/{total_rows} rows")
+                processed = len(rows)
+                if processed // progress_step != start // progress_step or processed == total_rows:
+                    logger.info(f"Processed {processed}/{total_rows} rows")
+                    self.log(f"Processed {processed}/{total_rows} rows ({runner.failed} failed)", name="Progress")
 
-            logger.info("Batch processing completed successfully")
+            if runner.failed:
+                if runner.failed == total_rows:
+                    first_error = next(result.error for result in results if result.error is not None)
+                    msg = f"All {total_rows} rows failed: {first_error}"
+                    raise RuntimeError(msg) from first_error
+                logger.warning(
+                    f"Batch processing completed with {runner.failed} failed rows "
+                    f"({runner.retries} retries, {runner.rate_limited} rate limited)"
+                )
+            else:
+                logger.info("Batch processing completed successfully")
             return DataFrame(rows)
 
         except (KeyError, AttributeError) as e:
@@ -3,8 +3,9 @@ from __future__ import annotations
 import ast
 import asyncio
 import inspect
+import time
 from collections.abc import AsyncIterator, Iterator
-from copy import deepcopy
+from copy import copy, deepcopy
 from textwrap import dedent
 from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple, get_type_hints
 from uuid import UUID
@@ -30,11 +31,13 @@ from axiestudio.field_typing import Tool  # noqa: TC001 Needed by _add_toolkit_o
 # Lazy import to avoid circular dependency
 # from axiestudio.graph.utils import has_chat_output
 from axiestudio.helpers.custom import format_type
+from axiestudio.logging import logger
 from axiestudio.memory import astore_message, aupdate_messages, delete_message
 from axiestudio.schema.artifact import get_artifact_type, post_process_raw
 from axiestudio.schema.data import Data
 from axiestudio.schema.message import ErrorMessage, Message
 from axiestudio.schema.properties import Source
+from axiestudio.services.deps import get_settings_service
 from axiestudio.services.tracing.schema import Log
 from axiestudio.template.field.base import UNDEFINED, Input, Output
 from axiestudio.template.frontend_node.custom_components import ComponentFrontendNode
@@ -94,6 +97,31 @@ class PlaceholderGraph(NamedTuple):
     flow_name: str | None
 
 
+class _StreamedText:
+    """Accumulates the chunks of a streamed message.
+
+    Chunks are kept in a list and joined only when the text is needed, so streaming ``n`` tokens
+    costs ``O(n)`` instead of the ``O(n^2)`` of repeated string concatenation.
+    """
+
+    def __init__(self, message: Message, *, update_interval: float = 0.0) -> None:
+        self.message = message
+        self.chunks: list[str] = []
+        self.update_interval = update_interval
+        self._last_update = time.monotonic()
+
+    def text(self) -> str:
+        if len(self.chunks) > 1:
+            self.chunks = ["".join(self.chunks)]
+        return self.chunks[0] if self.chunks else ""
+
+    def update_due(self) -> bool:
+        return self.update_interval > 0 and time.monotonic() - self._last_update >= self.update_interval
+
+    def mark_updated(self) -> None:
+        self._last_update = time.monotonic()
+
+
 class Component(CustomComponent):
     inputs: list[InputTypes] = []
     outputs: list[Output] = []
@@ -334,6 +362,18 @@ class Component(CustomComponent):
         memo[id(self)] = new_component
         return new_component
 
+    def _reset_run_state(self, vertex: Vertex) -> None:
+        super()._reset_run_state(vertex)
+        # Inputs and outputs hold their current value, so each run needs its own objects
+        self._inputs = {name: copy(input_) for name, input_ in self._inputs.items()}
+        self._outputs_map = {name: copy(output) for name, output in self._outputs_map.items()}
+        self._attributes = dict(self._attributes)
+        self._parameters = dict(self._parameters)
+        self._ctx = {}
+        self._current_output = ""
+        self._event_manager = None
+        self._state_model = None
+
     def set_class_code(self) -> None:
         # Get the source code of the calling class
         if self._code:
@@ -1570,40 +1610,39 @@ class Component(CustomComponent):
             msg = "The message must be an iterator or an async iterator."
             raise TypeError(msg)
 
-        if isinstance(iterator, AsyncIterator):
-            return await self._handle_async_iterator(iterator, message.id, message)
+        stream = _StreamedText(message, update_interval=self._get_stream_update_interval())
         try:
-            complete_message = ""
-            first_chunk = True
-            for chunk in iterator:
-                complete_message = await self._process_chunk(
-                    chunk.content, complete_message, message.id, message, first_chunk=first_chunk
-                )
-                first_chunk = False
-        except Exception as e:
-            raise StreamingError(cause=e, source=message.properties.source) from e
-        else:
-            return complete_message
+            if isinstance(iterator, AsyncIterator):
+                await self._handle_async_iterator(iterator, message.id, message, stream)
+            else:
+                try:
+                    for chunk in iterator:
+                        await self._process_chunk(
+                            chunk.content, stream, message.id, message, first_chunk=not stream.chunks
+                        )
+                except Exception as e:
+                    raise StreamingError(cause=e, source=message.properties.source) from e
+        except asyncio.CancelledError:
+            # Keep what was generated so far, e.g. when the client disconnected
+            await self._persist_streamed_text(stream)
+            raise
+        return stream.text()
 
-    async def _handle_async_iterator(self, iterator: AsyncIterator, message_id: str, message: Message) -> str:
-        complete_message = ""
-        first_chunk = True
+    async def _handle_async_iterator(
+        self, iterator: AsyncIterator, message_id: str, message: Message, stream: _StreamedText
+    ) -> None:
         async for chunk in iterator:
-            complete_message = await self._process_chunk(
-                chunk.content, complete_message, message_id, message, first_chunk=first_chunk
-            )
-            first_chunk = False
-        return complete_message
+            await self._process_chunk(chunk.content, stream, message_id, message, first_chunk=not stream.chunks)
 
     async def _process_chunk(
-        self, chunk: str, complete_message: str, message_id: str, message: Message, *, first_chunk: bool = False
-    ) -> str:
-        complete_message += chunk
+        self, chunk: str, stream: _StreamedText, message_id: str, message: Message, *, first_chunk: bool = False
+    ) -> None:
+        stream.chunks.append(chunk)
         if self._event_manager:
             if first_chunk:
                 # Send the initial message only on the first chunk
                 msg_copy = message.model_copy()
-                msg_copy.text = complete_message
+                msg_copy.text = chunk
                 await self._send_message_event(msg_copy, id_=message_id)
             await asyncio.to_thread(
                 self._event_manager.on_token,
@@ -1612,7 +1651,26 @@ class Component(CustomComponent):
                     "id": str(message_id),
                 },
             )
-        return complete_message
+        if stream.update_due():
+            await self._persist_streamed_text(stream)
+
+    def _get_stream_update_interval(self) -> float:
+        try:
+            settings_service = get_settings_service()
+            if settings_service is not None:
+                return settings_service.settings.stream_message_update_interval
+        except Exception:  # noqa: BLE001
+            logger.debug("Could not read the stream message update interval")
+        return 0.0
+
+    async def _persist_streamed_text(self, stream: _StreamedText) -> None:
+        """Store the text streamed so far, so a partial response is kept if the stream stops."""
+        stream.message.text = stream.text()
+        stream.mark_updated()
+        try:
+            await self._update_stored_message(stream.message)
+        except Exception:  # noqa: BLE001
+            logger.debug(f"Could not store partial message {stream.message.id}")
 
     async def send_error(
         self,
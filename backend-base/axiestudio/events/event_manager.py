@@ -27,10 +27,16 @@ class PartialEventCallback(Protocol):
     def __call__(self, *, data: LoggableType): ...
 
 
+# Events a client can do without: the full text of a streamed message is also sent in its message event
+DROPPABLE_EVENT_TYPES = frozenset({"token"})
+
+
 class EventManager:
-    def __init__(self, queue: asyncio.Queue):
+    def __init__(self, queue: asyncio.Queue, max_queued_events: int | None = None):
         self.queue = queue
         self.events: dict[str, PartialEventCallback] = {}
+        self.max_queued_events = max_queued_events
+        self.dropped_events = 0
 
     @staticmethod
     def _validate_callback(callback: EventCallback) -> None:
@@ -66,6 +72,15 @@ class EventManager:
         self.events[name] = callback_
 
     def send_event(self, *, event_type: str, data: LoggableType):
+        if (
+            self.max_queued_events is not None
+            and event_type in DROPPABLE_EVENT_TYPES
+            and self.queue.qsize() >= self.max_queued_events
+        ):
+            if not self.dropped_events:
+                logger.warning(f"{self.queue.qsize()} events are waiting to be read, dropping {event_type} events")
+            self.dropped_events += 1
+            return
         try:
             if isinstance(data, dict) and event_type in {"message", "error", "warning", "info", "token"}:
                 data = create_event_by_type(event_type, **data)
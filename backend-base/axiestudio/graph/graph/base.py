@@ -40,7 +40,13 @@ from axiestudio.logging.logger import LogConfig, configure, logger
 from axiestudio.schema.dotdict import dotdict
 from axiestudio.schema.schema import INPUT_FIELD_NAME, InputType, OutputValue
 from axiestudio.services.cache.utils import CacheMiss
-from axiestudio.services.deps import get_chat_service, get_tracing_service
+from axiestudio.services.deps import (
+    get_chat_service,
+    get_settings_service,
+    get_tracing_service,
+    get_variable_service,
+    session_scope,
+)
 from axiestudio.utils.async_helpers import run_until_complete
 
 if TYPE_CHECKING:
@@ -103,7 +109,9 @@ class Graph:
         self.vertices_to_run: set[str] = set()
         self.stop_vertex: str | None = None
         self.inactive_vertices: set = set()
-        self.edges: list[CycleEdge] = []
+        self._edges_by_source: dict[str, list[CycleEdge]] = {}
+        self._edges_by_target: dict[str, list[CycleEdge]] = {}
+        self.edges = []
         self.vertices: list[Vertex] = []
         self.run_manager = RunnableVerticesManager()
         self._vertices: list[NodeData] = []
@@ -125,6 +133,16 @@ class Graph:
         self._call_order: list[str] = []
         self._snapshots: list[dict[str, Any]] = []
         self._end_trace_tasks: set[asyncio.Task] = set()
+        # Maximum number of vertices built at the same time by `process`, None for no limit
+        self.max_concurrency: int | None = None
+        # Production mode skips the per-step debug snapshots (unless record_snapshots is set) and,
+        # instead of caching the whole graph after every step, writes the changed vertex results
+        # to the cache in one batch at the end of the run.
+        self.production_mode = False
+        self.record_snapshots = False
+        self._pending_cache_writes: dict[str, Any] = {}
+        # Loads the load_from_db variables of a run; shared by the vertices built concurrently
+        self._variables_prefetch: asyncio.Future | None = None
 
         if context and not isinstance(context, dict):
             msg = "Context must be a dictionary"
@@ -196,6 +214,47 @@ class Graph:
         self.define_vertices_lists()
         return self
 
+    @property
+    def edges(self) -> list[CycleEdge]:
+        """The edges of the graph.
+
+        Assign a new list to replace them; the edges are also indexed by source and target vertex,
+        so changes made to the list in place are not seen by the lookups of a vertex's edges.
+        """
+        return self._edge_list
+
+    @edges.setter
+    def edges(self, edges: list[CycleEdge]) -> None:
+        self._edge_list = edges
+        self._edges_by_source = defaultdict(list)
+        self._edges_by_target = defaultdict(list)
+        for edge in edges:
+            self._index_edge(edge)
+
+    def _index_edge(self, edge: CycleEdge) -> None:
+        self._edges_by_source[edge.source_id].append(edge)
+        self._edges_by_target[edge.target_id].append(edge)
+
+    def _append_edge(self, edge: CycleEdge) -> None:
+        self._edge_list.append(edge)
+        self._index_edge(edge)
+
+    def _remove_edges_of_vertex(self, vertex_id: str) -> None:
+        removed = [*self._edges_by_source.pop(vertex_id, []), *self._edges_by_target.pop(vertex_id, [])]
+        if not removed:
+            return
+        removed_ids = {id(edge) for edge in removed}
+        for edge in removed:
+            if edge.target_id != vertex_id and edge.target_id in self._edges_by_target:
+                self._edges_by_target[edge.target_id] = [
+                    other for other in self._edges_by_target[edge.target_id] if id(other) not in removed_ids
+                ]
+            if edge.source_id != vertex_id and edge.source_id in self._edges_by_source:
+                self._edges_by_source[edge.source_id] = [
+                    other for other in self._edges_by_source[edge.source_id] if id(other) not in removed_ids
+                ]
+        self._edge_list = [edge for edge in self._edge_list if id(edge) not in removed_ids]
+
     def dumps(
         self,
         name: str | None = None,
@@ -616,6 +675,8 @@ class Graph:
         self._run_id = str(run_id)
 
     async def initialize_run(self) -> None:
+        # Variables may have changed since the last run of this graph
+        self._variables_prefetch = None
         if not self._run_id:
             self.set_run_id()
         if self.tracing_service:
@@ -752,7 +813,7 @@ class Graph:
         # Process the graph
         try:
             cache_service = get_chat_service()
-            if self.flow_id:
+            if self.flow_id and not self.production_mode:
                 await cache_service.set_cache(self.flow_id, self)
         except Exception:  # noqa: BLE001
             logger.exception("Error setting cache")
@@ -799,6 +860,7 @@ class Graph:
         stream: bool = False,
         fallback_to_env_vars: bool = False,
         event_manager: EventManager | None = None,
+        concurrency: int = 1,
     ) -> list[RunOutputs]:
         """Runs the graph with the given inputs.
 
@@ -811,10 +873,16 @@ class Graph:
             stream (bool, optional): Whether to stream the results or not. Defaults to False.
             fallback_to_env_vars (bool, optional): Whether to fallback to environment variables. Defaults to False.
             event_manager (EventManager | None): The event manager for the graph.
+            concurrency (int, optional): Maximum number of inputs run at the same time. Above 1, each input
+                runs on its own fork of the graph (see :meth:`fork`), so the runs don't share any state.
+                Outputs are returned in the order of the inputs either way. Defaults to 1.
 
         Returns:
             List[RunOutputs]: The outputs of the graph.
         """
+        if concurrency < 1:
+            msg = f"concurrency must be at least 1, got {concurrency}"
+            raise ValueError(msg)
         # inputs is {"message": "Hello, world!"}
         # we need to go through self.inputs and update the self.raw_params
         # of the vertices that are inputs
@@ -836,6 +904,16 @@ class Graph:
             self.session_id = session_id
         for _ in range(len(inputs) - len(types)):
             types.append("chat")  # default to chat
+        if concurrency > 1 and len(inputs) > 1:
+            return await self._arun_concurrently(
+                list(zip(inputs, inputs_components, types, strict=True)),
+                concurrency=concurrency,
+                outputs=outputs or [],
+                stream=stream,
+                session_id=session_id or "",
+                fallback_to_env_vars=fallback_to_env_vars,
+                event_manager=event_manager,
+            )
         for run_inputs, components, input_type in zip(inputs, inputs_components, types, strict=True):
             run_outputs = await self._run(
                 inputs=run_inputs,
@@ -852,6 +930,49 @@ class Graph:
             vertex_outputs.append(run_output_object)
         return vertex_outputs
 
+    async def _arun_concurrently(
+        self,
+        runs: list[tuple[dict[str, str], list[str], InputType | None]],
+        *,
+        concurrency: int,
+        outputs: list[str],
+        stream: bool,
+        session_id: str,
+        fallback_to_env_vars: bool,
+        event_manager: EventManager | None,
+    ) -> list[RunOutputs]:
+        """Runs each input on its own fork of the graph, at most ``concurrency`` at a time."""
+        if not self._prepared:
+            self.prepare()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(run_inputs: dict[str, str], components: list[str], input_type: InputType | None):
+            async with semaphore:
+                run_outputs = await self.fork()._run(
+                    inputs=run_inputs,
+                    input_components=components,
+                    input_type=input_type,
+                    outputs=outputs,
+                    stream=stream,
+                    session_id=session_id,
+                    fallback_to_env_vars=fallback_to_env_vars,
+                    event_manager=event_manager,
+                )
+            self.increment_run_count()
+            run_output_object = RunOutputs(inputs=run_inputs, outputs=run_outputs)
+            logger.debug(f"Run outputs: {run_output_object}")
+            return run_output_object
+
+        tasks = [asyncio.create_task(run_one(*run)) for run in runs]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            # One failed run fails the batch; don't leave the others running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
     def next_vertex_to_build(self):
         """Returns the next vertex to be built.
 
@@ -947,8 +1068,8 @@ class Graph:
 
     def get_edge(self, source_id: str, target_id: str) -> CycleEdge | None:
         """Returns the edge between two vertices."""
-        for edge in self.edges:
-            if edge.source_id == source_id and edge.target_id == target_id:
+        for edge in self._edges_by_source.get(source_id, ()):
+            if edge.target_id == target_id:
                 return edge
         return None
 
@@ -996,6 +1117,9 @@ class Graph:
             "_is_output_vertices": self._is_output_vertices,
             "has_session_id_vertices": self.has_session_id_vertices,
             "_sorted_vertices_layers": self._sorted_vertices_layers,
+            "max_concurrency": self.max_concurrency,
+            "production_mode": self.production_mode,
+            "record_snapshots": self.record_snapshots,
         }
 
     def __deepcopy__(self, memo):
@@ -1026,18 +1150,92 @@ class Graph:
             # Deep copy vertices and edges
             new_graph.add_nodes_and_edges(copy.deepcopy(self._vertices, memo), copy.deepcopy(self._edges, memo))
 
+        new_graph.max_concurrency = self.max_concurrency
+        new_graph.production_mode = self.production_mode
+        new_graph.record_snapshots = self.record_snapshots
+
         # Store the newly created object in memo
         memo[id(self)] = new_graph
 
         return new_graph
 
+    def fork(self) -> Graph:
+        """Returns a per-run copy of a prepared graph.
+
+        The copy shares everything that does not change while the graph runs: the raw flow
+        data, the parsed vertex templates, the compiled component classes and the edges between
+        plain vertices. Only run state is duplicated: the run manager, the run queue and layers,
+        the adjacency maps (the run manager consumes them in place) and the built state of each
+        vertex and component. This is much cheaper than ``copy.deepcopy(graph)``, which rebuilds
+        the graph from its raw data and instantiates every component again.
+
+        Returns:
+            Graph: A graph that can be run independently of this one.
+
+        Raises:
+            ValueError: If the graph has not been prepared.
+        """
+        if not self._prepared:
+            msg = "Graph not prepared. Call prepare() first."
+            raise ValueError(msg)
+        new_graph = object.__new__(type(self))
+        new_graph.__dict__.update(self.__dict__)
+
+        new_graph._lock = None
+        new_graph._run_id = ""
+        new_graph._start_time = datetime.now(timezone.utc)
+        new_graph._state_model = None
+        new_graph._context = dotdict(self._context)
+        new_graph._snapshots = []
+        new_graph._call_order = []
+        new_graph._end_trace_tasks = set()
+        new_graph._pending_cache_writes = {}
+        new_graph._variables_prefetch = None
+        new_graph.run_manager = self.run_manager.copy()
+        new_graph._run_queue = deque(self._run_queue)
+        new_graph._first_layer = list(self._first_layer)
+        new_graph.vertices_layers = [list(layer) for layer in self.vertices_layers]
+        new_graph._sorted_vertices_layers = [list(layer) for layer in self._sorted_vertices_layers]
+        if self.run_manager.vertices_to_run is self.vertices_to_run:
+            new_graph.vertices_to_run = new_graph.run_manager.vertices_to_run
+        else:
+            new_graph.vertices_to_run = set(self.vertices_to_run)
+        new_graph.inactivated_vertices = set(self.inactivated_vertices)
+        new_graph.inactive_vertices = set(self.inactive_vertices)
+        new_graph.activated_vertices = list(self.activated_vertices)
+        new_graph._is_input_vertices = list(self._is_input_vertices)
+        new_graph._is_output_vertices = list(self._is_output_vertices)
+        new_graph.has_session_id_vertices = list(self.has_session_id_vertices)
+        if self._is_state_vertices is not None:
+            new_graph._is_state_vertices = list(self._is_state_vertices)
+        new_graph.predecessor_map = defaultdict(list, {key: list(value) for key, value in self.predecessor_map.items()})
+        new_graph.successor_map = defaultdict(list, {key: list(value) for key, value in self.successor_map.items()})
+        new_graph.parent_child_map = defaultdict(
+            list, {key: list(value) for key, value in self.parent_child_map.items()}
+        )
+        new_graph.in_degree_map = defaultdict(int, self.in_degree_map)
+
+        new_graph.vertices = [vertex.fork(new_graph) for vertex in self.vertices]
+        new_graph.vertex_map = {vertex.id: vertex for vertex in new_graph.vertices}
+        for vertex in new_graph.vertices:
+            vertex.rebind_params(new_graph.vertex_map)
+        new_graph.edges = [edge.fork() for edge in self.edges]
+        return new_graph
+
     def __setstate__(self, state):
         run_manager = state["run_manager"]
         if isinstance(run_manager, RunnableVerticesManager):
             state["run_manager"] = run_manager
         else:
             state["run_manager"] = RunnableVerticesManager.from_dict(run_manager)
+        state.setdefault("max_concurrency", None)
+        state.setdefault("production_mode", False)
+        state.setdefault("record_snapshots", False)
+        state.setdefault("_pending_cache_writes", {})
+        state.setdefault("_variables_prefetch", None)
+        edges = state.pop("edges", [])
         self.__dict__.update(state)
+        self.edges = edges
         self.vertex_map = {vertex.id: vertex for vertex in self.vertices}
         self.tracing_service = get_tracing_service()
         self.set_run_id(self._run_id)
@@ -1092,13 +1290,9 @@ class Graph:
 
     def update_edges_from_vertex(self, other_vertex: Vertex) -> None:
         """Updates the edges of a vertex in the Graph."""
-        new_edges = []
-        for edge in self.edges:
-            if other_vertex.id in {edge.source_id, edge.target_id}:
-                continue
-            new_edges.append(edge)
-        new_edges += other_vertex.edges
-        self.edges = new_edges
+        self._remove_edges_of_vertex(other_vertex.id)
+        for edge in other_vertex.edges:
+            self._append_edge(edge)
 
     def vertex_data_is_identical(self, vertex: Vertex, other_vertex: Vertex) -> bool:
         data_is_equivalent = vertex == other_vertex
@@ -1207,8 +1401,12 @@ class Graph:
         """Updates the edges of a vertex."""
         # Vertex has edges, so we need to update the edges
         for edge in vertex.edges:
-            if edge not in self.edges and edge.source_id in self.vertex_map and edge.target_id in self.vertex_map:
-                self.edges.append(edge)
+            if (
+                edge.source_id in self.vertex_map
+                and edge.target_id in self.vertex_map
+                and edge not in self._edges_by_source.get(edge.source_id, ())
+            ):
+                self._append_edge(edge)
 
     def _build_graph(self) -> None:
         """Builds the graph from the vertices and edges."""
@@ -1270,7 +1468,7 @@ class Graph:
             return
         self.vertices.remove(vertex)
         self.vertex_map.pop(vertex_id)
-        self.edges = [edge for edge in self.edges if vertex_id not in {edge.source_id, edge.target_id}]
+        self._remove_edges_of_vertex(vertex_id)
 
     def _build_vertex_params(self) -> None:
         """Identifies and handles the LLM vertex within the graph."""
@@ -1324,6 +1522,7 @@ class Graph:
             msg = "Graph not prepared. Call prepare() first."
             raise ValueError(msg)
         if not self._run_queue:
+            await self.flush_cache_writes()
             self._end_all_traces_async()
             return Finish()
         vertex_id = self.get_next_in_queue()
@@ -1334,7 +1533,7 @@ class Graph:
             inputs_dict=inputs.model_dump() if inputs else {},
             files=files,
             get_cache=chat_service.get_cache,
-            set_cache=chat_service.set_cache,
+            set_cache=self._defer_cache_write if self.production_mode else chat_service.set_cache,
             event_manager=event_manager,
         )
 
@@ -1347,7 +1546,8 @@ class Graph:
         self.reset_inactivated_vertices()
         self.reset_activated_vertices()
 
-        await chat_service.set_cache(str(self.flow_id or self._run_id), self)
+        if not self.production_mode:
+            await chat_service.set_cache(str(self.flow_id or self._run_id), self)
         self._record_snapshot(vertex_id)
         return vertex_build_result
 
@@ -1364,10 +1564,30 @@ class Graph:
         )
 
     def _record_snapshot(self, vertex_id: str | None = None) -> None:
+        if self.production_mode and not self.record_snapshots:
+            return
         self._snapshots.append(self.get_snapshot())
         if vertex_id:
             self._call_order.append(vertex_id)
 
+    async def _defer_cache_write(self, key: str, data: Any, lock: asyncio.Lock | None = None) -> bool:  # noqa: ARG002
+        """Queues a cache write until the end of the run; a later write to the same key replaces it."""
+        self._pending_cache_writes[key] = data
+        return True
+
+    async def flush_cache_writes(self) -> None:
+        """Writes the cache entries queued during the run in production mode."""
+        if not self._pending_cache_writes:
+            return
+        pending, self._pending_cache_writes = self._pending_cache_writes, {}
+        chat_service = get_chat_service()
+        results = await asyncio.gather(
+            *(chat_service.set_cache(key, data) for key, data in pending.items()), return_exceptions=True
+        )
+        for key, result in zip(pending, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(f"Error setting cache for {key}: {result}")
+
     def step(
         self,
         inputs: InputValueRequest | None = None,
@@ -1423,6 +1643,8 @@ class Graph:
         try:
             params = ""
             should_build = False
+            if vertex.load_from_db_fields:
+                await self.prefetch_variables(user_id)
             if not vertex.frozen:
                 should_build = True
             else:
@@ -1492,6 +1714,42 @@ class Graph:
             result_dict=result_dict, params=params, valid=valid, artifacts=artifacts, vertex=vertex
         )
 
+    def get_load_from_db_variables(self) -> set[str]:
+        """Returns the names of the global variables that the vertices load from the database.
+
+        Variables overridden by the ``request_variables`` of the graph context are left out.
+        """
+        request_variables = self.context.get("request_variables") or {}
+        names: set[str] = set()
+        for vertex in self.vertices:
+            for field in vertex.load_from_db_fields:
+                name = vertex.params.get(field)
+                if name and isinstance(name, str) and name not in request_variables:
+                    names.add(name)
+        return names
+
+    async def prefetch_variables(self, user_id: str | uuid.UUID | None = None) -> None:
+        """Loads every ``load_from_db`` variable of the graph with one query, once per run.
+
+        The variable service keeps them in its cache, so building the vertices doesn't query the
+        variables one field at a time. Vertices built concurrently wait for the same prefetch.
+        Failures are only logged: the vertices then load their variables one by one as before.
+        """
+        if self._variables_prefetch is None:
+            self._variables_prefetch = asyncio.ensure_future(self._prefetch_variables(user_id or self.user_id))
+        await asyncio.shield(self._variables_prefetch)
+
+    async def _prefetch_variables(self, user_id: str | uuid.UUID | None) -> None:
+        try:
+            names = self.get_load_from_db_variables()
+            if user_id is None or not names or get_settings_service().settings.use_noop_database:
+                return
+            user_uuid = user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id))
+            async with session_scope() as session:
+                await get_variable_service().prefetch_variables(user_id=user_uuid, names=names, session=session)
+        except Exception:  # noqa: BLE001
+            logger.opt(exception=True).debug("Could not prefetch the variables of the graph")
+
     def get_vertex_edges(
         self,
         vertex_id: str,
@@ -1502,22 +1760,26 @@ class Graph:
         """Returns a list of edges for a given vertex."""
         # The idea here is to return the edges that have the vertex_id as source or target
         # or both
-        return [
-            edge
-            for edge in self.edges
-            if (edge.source_id == vertex_id and is_source is not False)
-            or (edge.target_id == vertex_id and is_target is not False)
-        ]
+        edges: list[CycleEdge] = []
+        if is_source is not False:
+            edges.extend(self._edges_by_source.get(vertex_id, ()))
+        if is_target is not False:
+            # A self-loop is already in the outgoing edges
+            edges.extend(
+                edge
+                for edge in self._edges_by_target.get(vertex_id, ())
+                if is_source is False or edge.source_id != vertex_id
+            )
+        return edges
 
     def get_vertices_with_target(self, vertex_id: str) -> list[Vertex]:
         """Returns the vertices connected to a vertex."""
         vertices: list[Vertex] = []
-        for edge in self.edges:
-            if edge.target_id == vertex_id:
-                vertex = self.get_vertex(edge.source_id)
-                if vertex is None:
-                    continue
-                vertices.append(vertex)
+        for edge in self._edges_by_target.get(vertex_id, ()):
+            vertex = self.get_vertex(edge.source_id)
+            if vertex is None:
+                continue
+            vertices.append(vertex)
         return vertices
 
     async def process(
@@ -1527,49 +1789,78 @@ class Graph:
         start_component_id: str | None = None,
         event_manager: EventManager | None = None,
     ) -> Graph:
-        """Processes the graph with vertices in each layer run in parallel."""
+        """Processes the graph, building each vertex as soon as all of its predecessors are built.
+
+        Independent branches run concurrently, so a slow vertex only delays the vertices that depend on it.
+        At most ``self.max_concurrency`` vertices are built at once (no limit if None); when more are ready,
+        the ones with the lowest average build time start first.
+        """
+        if self.max_concurrency is not None and self.max_concurrency < 1:
+            msg = f"max_concurrency must be at least 1, got {self.max_concurrency}"
+            raise ValueError(msg)
         has_webhook_component = "webhook" in start_component_id.lower() if start_component_id else False
         first_layer = self.sort_vertices(start_component_id=start_component_id)
         vertex_task_run_count: dict[str, int] = {}
-        to_process = deque(first_layer)
-        layer_index = 0
+        ready: list[str] = []
+        running: dict[asyncio.Task, str] = {}
+        rerun_requested: set[str] = set()
         chat_service = get_chat_service()
+
+        def schedule(vertex_ids: list[str]) -> None:
+            for vertex_id in vertex_ids:
+                if vertex_id in ready:
+                    continue
+                if vertex_id in running.values():
+                    # Runnable again while it is still building (e.g. in a loop): build it again once it finishes
+                    rerun_requested.add(vertex_id)
+                    continue
+                # Mark queued vertices as being run so they are not found runnable again while they wait
+                self.run_manager.add_to_vertices_being_run(vertex_id)
+                ready.append(vertex_id)
+
         await self.initialize_run()
         lock = asyncio.Lock()
-        while to_process:
-            current_batch = list(to_process)  # Copy current deque items to a list
-            to_process.clear()  # Clear the deque for new items
-            tasks = []
-            for vertex_id in current_batch:
-                vertex = self.get_vertex(vertex_id)
-                task = asyncio.create_task(
-                    self.build_vertex(
-                        vertex_id=vertex_id,
-                        user_id=self.user_id,
-                        inputs_dict={},
-                        fallback_to_env_vars=fallback_to_env_vars,
-                        get_cache=chat_service.get_cache,
-                        set_cache=chat_service.set_cache,
-                        event_manager=event_manager,
-                    ),
-                    name=f"{vertex.id} Run {vertex_task_run_count.get(vertex_id, 0)}",
-                )
-                tasks.append(task)
-                vertex_task_run_count[vertex_id] = vertex_task_run_count.get(vertex_id, 0) + 1
-
-            logger.debug(f"Running layer {layer_index} with {len(tasks)} tasks, {current_batch}")
-            try:
-                next_runnable_vertices = await self._execute_tasks(
-                    tasks, lock=lock, has_webhook_component=has_webhook_component
-                )
-            except Exception:
-                logger.exception(f"Error executing tasks in layer {layer_index}")
-                raise
-            if not next_runnable_vertices:
-                break
-            to_process.extend(next_runnable_vertices)
-            layer_index += 1
+        schedule(first_layer)
+        try:
+            while ready or running:
+                ready = self.sort_by_avg_build_time([ready])[0]
+                while ready and (self.max_concurrency is None or len(running) < self.max_concurrency):
+                    vertex_id = ready.pop(0)
+                    task = asyncio.create_task(
+                        self.build_vertex(
+                            vertex_id=vertex_id,
+                            user_id=self.user_id,
+                            inputs_dict={},
+                            fallback_to_env_vars=fallback_to_env_vars,
+                            get_cache=chat_service.get_cache,
+                            set_cache=self._defer_cache_write if self.production_mode else chat_service.set_cache,
+                            event_manager=event_manager,
+                        ),
+                        name=f"{vertex_id} Run {vertex_task_run_count.get(vertex_id, 0)}",
+                    )
+                    running[task] = vertex_id
+                    vertex_task_run_count[vertex_id] = vertex_task_run_count.get(vertex_id, 0) + 1
+
+                logger.debug(f"Running {sorted(running.values())}, {len(ready)} vertices waiting for a slot")
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=running.__getitem__):
+                    next_runnable_vertices = await self._complete_vertex_task(
+                        task,
+                        lock=lock,
+                        has_webhook_component=has_webhook_component,
+                        rerun_requested=rerun_requested,
+                    )
+                    del running[task]
+                    schedule(next_runnable_vertices)
+        except Exception:
+            logger.exception("Error processing graph")
+            raise
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
 
+        await self.flush_cache_writes()
         logger.debug("Graph processing complete")
         return self
 
@@ -1661,61 +1952,50 @@ class Graph:
             artifacts={},
         )
 
-    async def _execute_tasks(
-        self, tasks: list[asyncio.Task], lock: asyncio.Lock, *, has_webhook_component: bool = False
+    async def _complete_vertex_task(
+        self,
+        task: asyncio.Task,
+        lock: asyncio.Lock,
+        *,
+        has_webhook_component: bool = False,
+        rerun_requested: set[str] | None = None,
     ) -> list[str]:
-        """Executes tasks in parallel, handling exceptions for each task.
+        """Records the result of a finished vertex build and returns the vertices it made runnable.
 
         Args:
-            tasks: List of tasks to execute
+            task: The finished build task
             lock: Async lock for synchronization
             has_webhook_component: Whether the graph has a webhook component
+            rerun_requested: Vertices that became runnable again while they were building. If the finished
+                vertex is one of them, it is removed from the set and returned so it is built again.
         """
-        results = []
-        completed_tasks = await asyncio.gather(*tasks, return_exceptions=True)
-        vertices: list[Vertex] = []
-
-        for i, result in enumerate(completed_tasks):
-            task_name = tasks[i].get_name()
-            vertex_id = tasks[i].get_name().split(" ")[0]
-
-            if isinstance(result, Exception):
-                logger.error(f"Task {task_name} failed with exception: {result}")
-                if has_webhook_component:
-                    await self._log_vertex_build_from_exception(vertex_id, result)
-
-                # Cancel all remaining tasks
-                for t in tasks[i + 1 :]:
-                    t.cancel()
-                raise result
-            if isinstance(result, VertexBuildResult):
-                if self.flow_id is not None:
-                    await log_vertex_build(
-                        flow_id=self.flow_id,
-                        vertex_id=result.vertex.id,
-                        valid=result.valid,
-                        params=result.params,
-                        data=result.result_dict,
-                        artifacts=result.artifacts,
-                    )
-
-                vertices.append(result.vertex)
-            else:
-                msg = f"Invalid result from task {task_name}: {result}"
-                raise TypeError(msg)
-
-        for v in vertices:
-            # set all executed vertices as non-runnable to not run them again.
-            # they could be calculated as predecessor or successors of parallel vertices
-            # This could usually happen with input vertices like ChatInput
-            self.run_manager.remove_vertex_from_runnables(v.id)
-
-            logger.debug(f"Vertex {v.id}, result: {v.built_result}, object: {v.built_object}")
-
-        for v in vertices:
-            next_runnable_vertices = await self.get_next_runnable_vertices(lock, vertex=v, cache=False)
-            results.extend(next_runnable_vertices)
-        return list(set(results))
+        task_name = task.get_name()
+        vertex_id = task_name.partition(" ")[0]
+        exception = task.exception()
+        if exception is not None:
+            logger.error(f"Task {task_name} failed with exception: {exception}")
+            if has_webhook_component:
+                await self._log_vertex_build_from_exception(vertex_id, exception)
+            raise exception
+        result = task.result()
+        if not isinstance(result, VertexBuildResult):
+            msg = f"Invalid result from task {task_name}: {result}"
+            raise TypeError(msg)
+        if self.flow_id is not None:
+            await log_vertex_build(
+                flow_id=self.flow_id,
+                vertex_id=result.vertex.id,
+                valid=result.valid,
+                params=result.params,
+                data=result.result_dict,
+                artifacts=result.artifacts,
+            )
+        logger.debug(f"Vertex {vertex_id}, result: {result.vertex.built_result}, object: {result.vertex.built_object}")
+        next_runnable_vertices = await self.get_next_runnable_vertices(lock, vertex=result.vertex, cache=False)
+        if rerun_requested is not None and vertex_id in rerun_requested:
+            rerun_requested.discard(vertex_id)
+            next_runnable_vertices = [*next_runnable_vertices, vertex_id]
+        return next_runnable_vertices
 
     def topological_sort(self) -> list[Vertex]:
         """Performs a topological sort of the vertices in the graph.
@@ -1837,21 +2117,14 @@ class Graph:
         The count reflects the number of edges between the input vertex and each neighbor.
         """
         neighbors: dict[Vertex, int] = {}
-        for edge in self.edges:
-            if edge.source_id == vertex.id:
-                neighbor = self.get_vertex(edge.target_id)
-                if neighbor is None:
-                    continue
-                if neighbor not in neighbors:
-                    neighbors[neighbor] = 0
-                neighbors[neighbor] += 1
-            elif edge.target_id == vertex.id:
-                neighbor = self.get_vertex(edge.source_id)
-                if neighbor is None:
-                    continue
-                if neighbor not in neighbors:
-                    neighbors[neighbor] = 0
-                neighbors[neighbor] += 1
+        for edge in self.get_vertex_edges(vertex.id):
+            neighbor_id = edge.target_id if edge.source_id == vertex.id else edge.source_id
+            neighbor = self.get_vertex(neighbor_id)
+            if neighbor is None:
+                continue
+            if neighbor not in neighbors:
+                neighbors[neighbor] = 0
+            neighbors[neighbor] += 1
         return neighbors
 
     @property
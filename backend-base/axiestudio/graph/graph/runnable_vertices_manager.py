@@ -29,6 +29,23 @@ class RunnableVerticesManager:
         instance.ran_at_least_once = data.get("ran_at_least_once", set())
         return instance
 
+    def copy(self) -> "RunnableVerticesManager":
+        """Returns an independent copy of the run state.
+
+        Containers are copied one level deep, which is all the run state holds, so
+        this is much cheaper than ``copy.deepcopy``.
+        """
+        instance = type(self)()
+        instance.run_map = defaultdict(list, {key: list(value) for key, value in self.run_map.items()})
+        instance.run_predecessors = defaultdict(
+            list, {key: list(value) for key, value in self.run_predecessors.items()}
+        )
+        instance.vertices_to_run = set(self.vertices_to_run)
+        instance.vertices_being_run = set(self.vertices_being_run)
+        instance.cycle_vertices = set(self.cycle_vertices)
+        instance.ran_at_least_once = set(self.ran_at_least_once)
+        return instance
+
     def __getstate__(self) -> object:
         return {
             "run_map": self.run_map,
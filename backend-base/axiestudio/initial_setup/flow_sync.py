@@ -0,0 +1,249 @@
+"""Keep flows that are backed by a file in sync with their file.
+
+The directories of flow files are watched with ``watchfiles`` (inotify and its equivalents),
+so only files that actually changed are read. Bursts of events, such as an editor saving a
+file in several steps, are debounced into a single batch; the files of a batch are parsed
+in a worker thread and written to the database in a single commit. Without ``watchfiles``
+the known files are polled with ``stat`` instead.
+
+The set of file-backed flows is read from the database at start-up and then every
+``fs_flows_refresh_interval``; flows saved with a file path through the API of this
+process are picked up at once through :func:`notify_flow_path`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+import orjson
+from sqlmodel import col, select
+
+from axiestudio.logging import logger
+from axiestudio.processing.graph_cache import get_prepared_graph_cache
+from axiestudio.processing.run_cache import get_run_result_cache
+from axiestudio.services.database.models.flow.model import Flow
+from axiestudio.services.deps import session_scope
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
+
+try:
+    from watchfiles import awatch
+except ImportError:  # pragma: no cover - depends on the installation
+    awatch = None
+
+SYNCED_FIELDS = ("name", "description", "data", "locked")
+
+
+def _read_flow_files(paths: Iterable[Path], mtimes: dict[Path, int]) -> dict[Path, tuple[int, dict[str, Any]]]:
+    """Read and parse the files whose modification time changed. Runs in a worker thread."""
+    updates = {}
+    for path in paths:
+        try:
+            mtime = path.stat().st_mtime_ns
+            if mtime == mtimes.get(path):
+                continue
+            content = path.read_bytes()
+        except FileNotFoundError:
+            continue
+        except OSError:
+            logger.exception(f"Error while reading flow file {path}")
+            continue
+        if not content.strip():
+            # Files are created empty before the flow is first written to them
+            continue
+        try:
+            data = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Possibly a partial write; the next change event reads it again
+            logger.warning(f"Flow file {path} is not valid JSON")
+            continue
+        if isinstance(data, dict):
+            updates[path] = (mtime, data)
+    return updates
+
+
+def _apply_flow_file(flow: Flow, update_data: dict[str, Any]) -> bool:
+    changed = False
+    for field_name in SYNCED_FIELDS:
+        if (new_value := update_data.get(field_name)) and getattr(flow, field_name) != new_value:
+            setattr(flow, field_name, new_value)
+            changed = True
+    if (folder_id := update_data.get("folder_id")) and flow.folder_id != UUID(str(folder_id)):
+        flow.folder_id = UUID(str(folder_id))
+        changed = True
+    return changed
+
+
+class FlowFileSync:
+    """Watches the files of file-backed flows and writes their changes to the database.
+
+    Args:
+        debounce: Milliseconds to wait for a burst of file events to settle.
+        refresh_interval: Seconds between two reads of the set of file-backed flows.
+        poll_interval: Seconds between two checks of the files when ``watchfiles`` is not available.
+        use_watcher: Use file system notifications if ``watchfiles`` is installed.
+    """
+
+    def __init__(
+        self,
+        *,
+        debounce: int = 500,
+        refresh_interval: float = 60.0,
+        poll_interval: float = 10.0,
+        use_watcher: bool = True,
+    ) -> None:
+        self.debounce = debounce
+        self.refresh_interval = refresh_interval
+        self.poll_interval = poll_interval
+        self.use_watcher = use_watcher and awatch is not None
+        self.flows_by_path: dict[Path, set[UUID]] = {}
+        self.mtimes: dict[Path, int] = {}
+        self.synced_files = 0
+        self._paths_changed = asyncio.Event()
+
+    @staticmethod
+    def _resolve(path: str) -> Path:
+        return Path(path).expanduser().resolve()
+
+    def add_flow_path(self, flow_id: UUID, fs_path: str) -> None:
+        path = self._resolve(fs_path)
+        for flow_ids in self.flows_by_path.values():
+            flow_ids.discard(flow_id)
+        if flow_id not in self.flows_by_path.get(path, ()):
+            self.flows_by_path.setdefault(path, set()).add(flow_id)
+            self._paths_changed.set()
+        self._drop_unused_paths()
+
+    def _drop_unused_paths(self) -> None:
+        for path in [path for path, flow_ids in self.flows_by_path.items() if not flow_ids]:
+            del self.flows_by_path[path]
+            self.mtimes.pop(path, None)
+            self._paths_changed.set()
+
+    async def refresh(self) -> None:
+        """Read the set of file-backed flows from the database."""
+        async with session_scope() as session:
+            rows = (await session.exec(select(Flow.id, Flow.fs_path).where(col(Flow.fs_path).is_not(None)))).all()
+        flows_by_path: dict[Path, set[UUID]] = defaultdict(set)
+        for flow_id, fs_path in rows:
+            flows_by_path[self._resolve(fs_path)].add(flow_id)
+        if flows_by_path.keys() != self.flows_by_path.keys():
+            self._paths_changed.set()
+        self.flows_by_path = dict(flows_by_path)
+        for path in [path for path in self.mtimes if path not in self.flows_by_path]:
+            del self.mtimes[path]
+
+    async def sync(self, paths: Iterable[Path]) -> int:
+        """Write the changed files among ``paths`` to their flows in one transaction.
+
+        Returns:
+            The number of flows that were updated.
+        """
+        updates = await asyncio.to_thread(_read_flow_files, list(paths), dict(self.mtimes))
+        if not updates:
+            return 0
+        update_by_flow = {
+            flow_id: (path, data) for path, (_, data) in updates.items() for flow_id in self.flows_by_path.get(path, ())
+        }
+        updated = 0
+        if update_by_flow:
+            async with session_scope() as session:
+                flows = (await session.exec(select(Flow).where(col(Flow.id).in_(update_by_flow)))).all()
+                for flow in flows:
+                    path, data = update_by_flow[flow.id]
+                    try:
+                        if _apply_flow_file(flow, data):
+                            session.add(flow)
+                            updated += 1
+                    except (TypeError, ValueError):
+                        logger.exception(f"Couldn't update flow {flow.id} in database from path {path}")
+        for path, (mtime, _) in updates.items():
+            self.mtimes[path] = mtime
+        self.synced_files += len(updates)
+        _invalidate_flow_caches(update_by_flow)
+        if updated:
+            logger.debug(f"Updated {updated} flows from {len(updates)} changed files")
+        return updated
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception:  # noqa: BLE001
+                logger.exception("Error while reading file-backed flows")
+
+    async def _watch(self) -> AsyncIterator[set[Path]]:
+        while True:
+            self._paths_changed.clear()
+            directories = {path.parent for path in self.flows_by_path if path.parent.is_dir()}
+            if not directories:
+                await self._paths_changed.wait()
+                continue
+            # Restart the watcher when the set of directories changes
+            async for changes in awatch(
+                *directories,
+                debounce=self.debounce,
+                stop_event=self._paths_changed,
+                recursive=False,
+                watch_filter=lambda _, path: Path(path) in self.flows_by_path,
+            ):
+                yield {Path(path) for _, path in changes}
+            # New files are synced at once, later changes come from the watcher
+            yield {path for path in self.flows_by_path if path not in self.mtimes}
+
+    async def _poll(self) -> AsyncIterator[set[Path]]:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            # Only the known files are checked; _read_flow_files skips unchanged ones
+            yield set(self.flows_by_path)
+
+    async def run(self) -> None:
+        await self.refresh()
+        await self.sync(list(self.flows_by_path))
+        refresher = asyncio.create_task(self._refresh_periodically())
+        changes = self._watch() if self.use_watcher else self._poll()
+        try:
+            async for paths in changes:
+                if paths:
+                    await self.sync(paths)
+        finally:
+            refresher.cancel()
+            await asyncio.gather(refresher, return_exceptions=True)
+
+
+def _invalidate_flow_caches(flow_ids: Iterable[UUID]) -> None:
+    """Drop what is cached per flow for flows whose data changed without a new ``updated_at``."""
+    graph_cache = get_prepared_graph_cache()
+    run_cache = get_run_result_cache()
+    for flow_id in flow_ids:
+        graph_cache.invalidate(str(flow_id))
+        run_cache.forget_flow(str(flow_id))
+
+
+_flow_file_sync: FlowFileSync | None = None
+
+
+def get_flow_file_sync() -> FlowFileSync | None:
+    """Return the running flow file sync of this process, if any."""
+    return _flow_file_sync
+
+
+def notify_flow_path(flow_id: UUID, fs_path: str | None) -> None:
+    """Start syncing a flow from its file without waiting for the next refresh."""
+    if _flow_file_sync is not None and fs_path:
+        _flow_file_sync.add_flow_path(flow_id, fs_path)
+
+
+async def run_flow_file_sync(flow_file_sync: FlowFileSync) -> None:
+    global _flow_file_sync  # noqa: PLW0603
+    _flow_file_sync = flow_file_sync
+    try:
+        await flow_file_sync.run()
+    finally:
+        _flow_file_sync = None
@@ -22,7 +22,7 @@ from emoji import demojize, purely_emoji
 from axiestudio.logging import logger
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import selectinload
-from sqlmodel import col, select
+from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from axiestudio.base.constants import (
@@ -33,6 +33,7 @@ from axiestudio.base.constants import (
     SKIPPED_FIELD_ATTRIBUTES,
 )
 from axiestudio.initial_setup.constants import STARTER_FOLDER_DESCRIPTION, STARTER_FOLDER_NAME
+from axiestudio.initial_setup.flow_sync import FlowFileSync, run_flow_file_sync
 from axiestudio.services.auth.utils import create_super_user
 from axiestudio.services.database.models.flow.model import Flow, FlowCreate
 from axiestudio.services.database.models.folder.constants import DEFAULT_FOLDER_NAME
@@ -1057,47 +1058,20 @@ async def get_or_create_default_folder(session: AsyncSession, user_id: UUID) ->
 
 
 async def sync_flows_from_fs():
-    flow_mtimes = {}
-    fs_flows_polling_interval = get_settings_service().settings.fs_flows_polling_interval / 1000
+    settings = get_settings_service().settings
+    flow_file_sync = FlowFileSync(
+        debounce=settings.fs_flows_sync_debounce,
+        refresh_interval=settings.fs_flows_refresh_interval / 1000,
+        poll_interval=settings.fs_flows_polling_interval / 1000,
+    )
     try:
-        while True:
-            try:
-                async with session_scope() as session:
-                    stmt = select(Flow).where(col(Flow.fs_path).is_not(None))
-                    flows = (await session.exec(stmt)).all()
-                    for flow in flows:
-                        mtime = flow_mtimes.setdefault(flow.id, 0)
-                        path = anyio.Path(flow.fs_path)
-                        try:
-                            if await path.exists():
-                                new_mtime = (await path.stat()).st_mtime
-                                if new_mtime > mtime:
-                                    update_data = orjson.loads(await path.read_text(encoding="utf-8"))
-                                    try:
-                                        for field_name in ("name", "description", "data", "locked"):
-                                            if new_value := update_data.get(field_name):
-                                                setattr(flow, field_name, new_value)
-                                        if folder_id := update_data.get("folder_id"):
-                                            flow.folder_id = UUID(folder_id)
-                                        await session.commit()
-                                        await session.refresh(flow)
-                                    except Exception:  # noqa: BLE001
-                                        logger.exception(f"Couldn't update flow {flow.id} in database from path {path}")
-                                    flow_mtimes[flow.id] = new_mtime
-                        except Exception:  # noqa: BLE001
-                            logger.exception(f"Error while handling flow file {path}")
-            except asyncio.CancelledError:
-                logger.debug("Flow sync cancelled")
-                break
-            except (sa.exc.OperationalError, ValueError) as e:
-                if "no active connection" in str(e) or "connection is closed" in str(e):
-                    logger.debug("Database connection lost, assuming shutdown")
-                    break  # Exit gracefully, don't error
-                raise  # Re-raise if it's a real connection problem
-            except Exception:  # noqa: BLE001
-                logger.exception("Error while syncing flows from database")
-                break
-
-            await asyncio.sleep(fs_flows_polling_interval)
+        await run_flow_file_sync(flow_file_sync)
     except asyncio.CancelledError:
         logger.debug("Flow sync task cancelled")
+    except (sa.exc.OperationalError, ValueError) as e:
+        if "no active connection" in str(e) or "connection is closed" in str(e):
+            logger.debug("Database connection lost, assuming shutdown")
+            return
+        raise  # Re-raise if it's a real connection problem
+    except Exception:  # noqa: BLE001
+        logger.exception("Error while syncing flows from database")
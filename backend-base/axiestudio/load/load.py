@@ -127,7 +127,7 @@ def load_flow_from_json(
 
 async def arun_flow_from_json(
     flow: Path | str | dict,
-    input_value: str,
+    input_value: str | list[str],
     *,
     session_id: str | None = None,
     tweaks: dict | None = None,
@@ -141,12 +141,14 @@ async def arun_flow_from_json(
     cache: str | None = None,
     disable_logs: bool | None = True,
     fallback_to_env_vars: bool = False,
+    concurrency: int = 1,
 ) -> list[RunOutputs]:
     """Run a flow from a JSON file or dictionary.
 
     Args:
         flow (Union[Path, str, dict]): The path to the JSON file or the JSON dictionary representing the flow.
-        input_value (str): The input value to be processed by the flow.
+        input_value (str | list[str]): The input value to be processed by the flow, or a list of input values
+            to run the flow once for each.
         session_id (str | None, optional): The session ID to be used for the flow. Defaults to None.
         tweaks (Optional[dict], optional): Optional tweaks to be applied to the flow. Defaults to None.
         input_type (str, optional): The type of the input value. Defaults to "chat".
@@ -160,6 +162,7 @@ async def arun_flow_from_json(
         disable_logs (Optional[bool], optional): Whether to disable logs. Defaults to True.
         fallback_to_env_vars (bool, optional): Whether Global Variables should fallback to environment variables if
             not found. Defaults to False.
+        concurrency (int, optional): Maximum number of input values run at the same time. Defaults to 1.
 
     Returns:
         List[RunOutputs]: A list of RunOutputs objects representing the results of running the flow.
@@ -185,6 +188,7 @@ async def arun_flow_from_json(
         output_type=output_type,
         output_component=output_component,
         fallback_to_env_vars=fallback_to_env_vars,
+        concurrency=concurrency,
     )
     await logger.complete()
     return result
@@ -192,7 +196,7 @@ async def arun_flow_from_json(
 
 def run_flow_from_json(
     flow: Path | str | dict,
-    input_value: str,
+    input_value: str | list[str],
     *,
     session_id: str | None = None,
     tweaks: dict | None = None,
@@ -206,6 +210,7 @@ def run_flow_from_json(
     cache: str | None = None,
     disable_logs: bool | None = True,
     fallback_to_env_vars: bool = False,
+    concurrency: int = 1,
 ) -> list[RunOutputs]:
     """Run a flow from a JSON file or dictionary.
 
@@ -215,7 +220,8 @@ def run_flow_from_json(
 
     Args:
         flow (Union[Path, str, dict]): The path to the JSON file or the JSON dictionary representing the flow.
-        input_value (str): The input value to be processed by the flow.
+        input_value (str | list[str]): The input value to be processed by the flow, or a list of input values
+            to run the flow once for each.
         session_id (str | None, optional): The session ID to be used for the flow. Defaults to None.
         tweaks (Optional[dict], optional): Optional tweaks to be applied to the flow. Defaults to None.
         input_type (str, optional): The type of the input value. Defaults to "chat".
@@ -229,6 +235,7 @@ def run_flow_from_json(
         disable_logs (Optional[bool], optional): Whether to disable logs. Defaults to True.
         fallback_to_env_vars (bool, optional): Whether Global Variables should fallback to environment variables if
             not found. Defaults to False.
+        concurrency (int, optional): Maximum number of input values run at the same time. Defaults to 1.
 
     Returns:
         List[RunOutputs]: A list of RunOutputs objects representing the results of running the flow.
@@ -249,5 +256,6 @@ def run_flow_from_json(
             cache=cache,
             disable_logs=disable_logs,
             fallback_to_env_vars=fallback_to_env_vars,
+            concurrency=concurrency,
         )
     )
@@ -25,6 +25,7 @@ from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoin
 
 from axiestudio.api import health_check_router, log_router, router
 from axiestudio.api.v1.mcp_projects import init_mcp_servers
+from axiestudio.base.knowledge_bases.stats import create_kb_stats_reconciler
 from axiestudio.initial_setup.setup import (
     create_or_update_starter_projects,
     initialize_super_user_if_needed,
@@ -88,32 +89,6 @@ _tasks: list[asyncio.Task] = []
 MAX_PORT = 65535
 
 
-class RequestCancelledMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app) -> None:
-        super().__init__(app)
-
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        sentinel = object()
-
-        async def cancel_handler():
-            while True:
-                if await request.is_disconnected():
-                    return sentinel
-                await asyncio.sleep(0.1)
-
-        handler_task = asyncio.create_task(call_next(request))
-        cancel_task = asyncio.create_task(cancel_handler())
-
-        done, pending = await asyncio.wait([handler_task, cancel_task], return_when=asyncio.FIRST_COMPLETED)
-
-        for task in pending:
-            task.cancel()
-
-        if cancel_task in done:
-            return Response("Request was cancelled", status_code=499)
-        return await handler_task
-
-
 class JavaScriptMIMETypeMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         try:
@@ -159,6 +134,7 @@ def get_lifespan(*, fix_migration=False, version=None):
 
         temp_dirs: list[TemporaryDirectory] = []
         sync_flows_from_fs_task = None
+        kb_stats_reconciler = None
 
         try:
             start_time = asyncio.get_event_loop().time()
@@ -223,6 +199,7 @@ def get_lifespan(*, fix_migration=False, version=None):
             logger.debug("Loading flows")
             await load_flows_from_directory()
             sync_flows_from_fs_task = asyncio.create_task(sync_flows_from_fs())
+            kb_stats_reconciler = create_kb_stats_reconciler(get_settings_service())
             queue_service = get_queue_service()
             if not queue_service.is_started():  # Start if not already started
                 queue_service.start()
@@ -303,6 +280,8 @@ def get_lifespan(*, fix_migration=False, version=None):
                     if sync_flows_from_fs_task:
                         sync_flows_from_fs_task.cancel()
                         await asyncio.wait([sync_flows_from_fs_task])
+                    if kb_stats_reconciler:
+                        await kb_stats_reconciler.stop()
 
                     # Stop verification scheduler
                     if VERIFICATION_SCHEDULER_AVAILABLE:
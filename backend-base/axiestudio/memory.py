@@ -1,21 +1,267 @@
 import asyncio
 import json
+from collections import OrderedDict
 from collections.abc import Sequence
+from typing import Any
 from uuid import UUID
 
 from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_core.messages import BaseMessage
 from axiestudio.logging import logger
-from sqlalchemy import delete
+from sqlalchemy import delete, update
 from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from axiestudio.schema.message import Message
 from axiestudio.services.database.models.message.model import MessageRead, MessageTable
-from axiestudio.services.deps import session_scope
+from axiestudio.services.deps import get_settings_service, session_scope
 from axiestudio.utils.async_helpers import run_until_complete
 
 
+class MessageSink:
+    """Write-behind buffer for message inserts and updates.
+
+    Stored messages get their id and timestamp when they are created, so callers don't need to
+    wait for the database: :meth:`add` and :meth:`update` return at once and the rows are written
+    by a shared flush, when ``max_batch_size`` rows are pending or ``flush_interval`` seconds after
+    the first pending row. Concurrent runs share the flush, so a chat turn costs a fraction of a
+    commit instead of one commit (and a refresh) per store and per update.
+
+    Reads and deletes in this module flush first, so a session always reads its own writes.
+    Rows written or queued by the sink are remembered (up to ``max_known_messages``) so that
+    updates to them, e.g. of a streamed message, don't need to load the row first.
+
+    If a batch fails, its rows are written one by one. A row that still fails stays pending for
+    the next flush, up to ``max_retries`` more times; after that it is logged and discarded.
+    """
+
+    def __init__(
+        self,
+        *,
+        flush_interval: float = 0.05,
+        max_batch_size: int = 100,
+        max_known_messages: int = 1000,
+        max_retries: int = 3,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.max_known_messages = max_known_messages
+        self.max_retries = max_retries
+        self._inserts: dict[UUID, MessageTable] = {}
+        self._updates: dict[UUID, dict[str, Any]] = {}
+        self._failures: dict[UUID, int] = {}
+        self._known: OrderedDict[UUID, MessageTable] = OrderedDict()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._flush_task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._inserts) + len(self._updates)
+
+    def usable(self) -> bool:
+        """Whether the sink can be used from the running event loop.
+
+        The sink is bound to the first loop it is used on; calls made from another loop
+        (e.g. the deprecated sync helpers) write directly instead.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if self._loop is None:
+            self._loop = loop
+            self._flush_lock = asyncio.Lock()
+        return loop is self._loop
+
+    async def add(self, messages: list[MessageTable]) -> list[MessageRead]:
+        for message in messages:
+            self._inserts[message.id] = message
+            self._remember(message)
+        await self._after_write()
+        return [_message_read(message) for message in messages]
+
+    async def update(self, messages: list[Message]) -> list[MessageRead] | None:
+        """Queue updates of messages this sink knows about.
+
+        Returns:
+            The updated messages, or None if any of them is unknown to the sink, in which case
+            nothing is queued and the caller has to update the database directly.
+        """
+        if any(message.id is None or _as_uuid(message.id) not in self._known for message in messages):
+            return None
+        updated = []
+        for message in messages:
+            message_id = _as_uuid(message.id)
+            row = self._known[message_id]
+            self._known.move_to_end(message_id)
+            changes = message.model_dump(exclude_unset=True, exclude_none=True)
+            row.sqlmodel_update(changes)
+            if row.flow_id and isinstance(row.flow_id, str):
+                row.flow_id = UUID(row.flow_id)
+            if message_id not in self._inserts:
+                columns = self._updates.setdefault(message_id, {})
+                columns.update(
+                    {key: getattr(row, key) for key in changes if key in MessageTable.model_fields and key != "id"}
+                )
+            updated.append(_message_read(row))
+        await self._after_write()
+        return updated
+
+    def _remember(self, message: MessageTable) -> None:
+        self._known[message.id] = message
+        self._known.move_to_end(message.id)
+        while len(self._known) > self.max_known_messages:
+            self._known.popitem(last=False)
+
+    def forget(self, message_ids: Sequence[UUID]) -> None:
+        for message_id in message_ids:
+            self._known.pop(message_id, None)
+
+    def forget_session(self, session_id: str) -> None:
+        self.forget([message_id for message_id, row in self._known.items() if row.session_id == session_id])
+
+    async def _after_write(self) -> None:
+        if self.pending >= self.max_batch_size:
+            await self.flush()
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None or self._flush_task.done() or self._flush_task is asyncio.current_task():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush()
+        except Exception:  # noqa: BLE001
+            logger.exception("Error flushing messages")
+
+    async def flush(self) -> None:
+        """Write every pending insert and update."""
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            if not self.pending:
+                return
+            inserts, self._inserts = list(self._inserts.values()), {}
+            updates, self._updates = self._updates, {}
+            rows = [_copy_message_table(message) for message in inserts]
+            update_rows = [{"id": message_id, **columns} for message_id, columns in updates.items() if columns]
+            try:
+                async with session_scope() as session:
+                    session.add_all(rows)
+                    await session.flush()
+                    if update_rows:
+                        await session.execute(update(MessageTable), update_rows)
+            except Exception:  # noqa: BLE001
+                logger.exception(
+                    f"Error writing a batch of {len(rows) + len(update_rows)} messages, retrying one by one"
+                )
+                await self._write_one_by_one(inserts, update_rows)
+            else:
+                if self._failures:
+                    for message_id in (*(message.id for message in inserts), *updates):
+                        self._failures.pop(message_id, None)
+            if self.pending:
+                self._schedule_flush()
+
+    async def _write_one_by_one(self, inserts: list[MessageTable], update_rows: list[dict[str, Any]]) -> None:
+        for message in inserts:
+            try:
+                async with session_scope() as session:
+                    session.add(_copy_message_table(message))
+            except Exception:  # noqa: BLE001
+                if self._keep_for_retry(message.id):
+                    self._inserts.setdefault(message.id, message)
+                else:
+                    logger.exception(f"Could not store message {message.id}")
+                    self.forget([message.id])
+            else:
+                self._failures.pop(message.id, None)
+        for row in update_rows:
+            message_id = row["id"]
+            try:
+                async with session_scope() as session:
+                    await session.execute(update(MessageTable), [row])
+            except Exception:  # noqa: BLE001
+                if self._keep_for_retry(message_id):
+                    # Columns updated since this flush started are newer, keep them
+                    columns = self._updates.setdefault(message_id, {})
+                    for key, value in row.items():
+                        if key != "id":
+                            columns.setdefault(key, value)
+                else:
+                    logger.exception(f"Could not update message {message_id}")
+            else:
+                self._failures.pop(message_id, None)
+
+    def _keep_for_retry(self, message_id: UUID) -> bool:
+        failures = self._failures.get(message_id, 0) + 1
+        if failures > self.max_retries:
+            self._failures.pop(message_id, None)
+            return False
+        self._failures[message_id] = failures
+        logger.warning(f"Could not write message {message_id}, retrying with the next flush ({failures})")
+        return True
+
+    async def aclose(self) -> None:
+        # Rows that fail stay pending a bounded number of times, so this ends
+        while self.pending and self._flush_lock is not None:
+            await self.flush()
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+
+
+def _as_uuid(value: str | UUID) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def _copy_message_table(message: MessageTable) -> MessageTable:
+    return MessageTable.model_validate({name: getattr(message, name) for name in MessageTable.model_fields})
+
+
+def _message_read(message: MessageTable) -> MessageRead:
+    """Build the MessageRead of a row without changing the row, which may still be pending."""
+    data = {name: getattr(message, name) for name in MessageTable.model_fields}
+    if isinstance(data["properties"], str):
+        data["properties"] = json.loads(data["properties"])
+    data["content_blocks"] = [json.loads(j) if isinstance(j, str) else j for j in data["content_blocks"]]
+    data["category"] = data["category"] or ""
+    return MessageRead.model_validate(data)
+
+
+_message_sink: MessageSink | None = None
+
+
+def get_message_sink() -> MessageSink | None:
+    """Return the write-behind message sink, or None if it is disabled in the settings."""
+    global _message_sink  # noqa: PLW0603
+    if _message_sink is None:
+        settings = get_settings_service().settings
+        if not settings.message_write_behind:
+            return None
+        _message_sink = MessageSink(
+            flush_interval=settings.message_flush_interval,
+            max_batch_size=settings.message_flush_batch_size,
+        )
+    return _message_sink if _message_sink.usable() else None
+
+
+async def flush_messages() -> None:
+    """Write the messages the sink is holding, if any."""
+    if _message_sink is not None and _message_sink.pending and _message_sink.usable():
+        await _message_sink.flush()
+
+
+async def close_message_sink() -> None:
+    global _message_sink  # noqa: PLW0603
+    if _message_sink is not None and _message_sink.usable():
+        await _message_sink.aclose()
+    _message_sink = None
+
+
 def _get_variable_query(
     sender: str | None = None,
     sender_name: str | None = None,
@@ -93,6 +339,7 @@ async def aget_messages(
     Returns:
         List[Data]: A list of Data objects representing the retrieved messages.
     """
+    await flush_messages()
     async with session_scope() as session:
         stmt = _get_variable_query(sender, sender_name, session_id, order_by, order, flow_id, limit)
         messages = await session.exec(stmt)
@@ -119,6 +366,8 @@ async def aadd_messages(messages: Message | list[Message], flow_id: str | UUID |
 
     try:
         messages_models = [MessageTable.from_message(msg, flow_id=flow_id) for msg in messages]
+        if sink := get_message_sink():
+            return [await Message.create(**message.model_dump()) for message in await sink.add(messages_models)]
         async with session_scope() as session:
             messages_models = await aadd_messagetables(messages_models, session)
         return [await Message.create(**message.model_dump()) for message in messages_models]
@@ -131,6 +380,9 @@ async def aupdate_messages(messages: Message | list[Message]) -> list[Message]:
     if not isinstance(messages, list):
         messages = [messages]
 
+    if (sink := get_message_sink()) and (updated := await sink.update(messages)) is not None:
+        return updated
+    await flush_messages()
     async with session_scope() as session:
         updated_messages: list[MessageTable] = []
         for message in messages:
@@ -173,14 +425,7 @@ async def aadd_messagetables(messages: list[MessageTable], session: AsyncSession
         logger.exception(e)
         raise
 
-    new_messages = []
-    for msg in messages:
-        msg.properties = json.loads(msg.properties) if isinstance(msg.properties, str) else msg.properties  # type: ignore[arg-type]
-        msg.content_blocks = [json.loads(j) if isinstance(j, str) else j for j in msg.content_blocks]  # type: ignore[arg-type]
-        msg.category = msg.category or ""
-        new_messages.append(msg)
-
-    return [MessageRead.model_validate(message, from_attributes=True) for message in new_messages]
+    return [_message_read(message) for message in messages]
 
 
 def delete_messages(session_id: str) -> None:
@@ -200,6 +445,9 @@ async def adelete_messages(session_id: str) -> None:
     Args:
         session_id (str): The session ID associated with the messages to delete.
     """
+    await flush_messages()
+    if _message_sink is not None:
+        _message_sink.forget_session(session_id)
     async with session_scope() as session:
         stmt = (
             delete(MessageTable)
@@ -215,6 +463,9 @@ async def delete_message(id_: str) -> None:
     Args:
         id_ (str): The ID of the message to delete.
     """
+    await flush_messages()
+    if _message_sink is not None:
+        _message_sink.forget([_as_uuid(id_)])
     async with session_scope() as session:
         message = await session.get(MessageTable, id_)
         if message:
@@ -1,3 +1,6 @@
+import asyncio
+
+import anyio
 from fastapi import HTTPException
 from axiestudio.logging import logger
 
@@ -57,3 +60,63 @@ class ContentSizeLimitMiddleware:
 
         wrapper = self.receive_wrapper(receive)
         await self.app(scope, wrapper, send)
+
+
+class RequestCancelledMiddleware:
+    """Cancels the handling of an HTTP request as soon as the client disconnects.
+
+    A single watcher task per request owns the ASGI receive channel and hands every message
+    to the application through a one-slot queue, so request bodies are still read at the
+    application's pace. Once the body has been read, the server's ``receive()`` only returns
+    when the client goes away, so the watcher sleeps until then instead of polling. On
+    ``http.disconnect`` it cancels the scope the application runs in. Responses are passed
+    through untouched, so streaming responses are not buffered.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue = asyncio.Queue(maxsize=1)
+        disconnect_message = None
+        response_complete = False
+
+        async def receive_from_watcher():
+            if disconnect_message is not None and messages.empty():
+                return disconnect_message
+            return await messages.get()
+
+        async def send_and_track(message):
+            nonlocal response_complete
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        async def watch(cancel_scope: anyio.CancelScope) -> None:
+            nonlocal disconnect_message
+            while True:
+                try:
+                    message = await receive()
+                except Exception:  # noqa: BLE001
+                    # The server could not read from the connection, so treat it as gone
+                    message = {"type": "http.disconnect"}
+                if message["type"] == "http.disconnect":
+                    disconnect_message = message
+                    if messages.empty():
+                        # Wake up the application if it is waiting for a message
+                        messages.put_nowait(message)
+                    if not response_complete:
+                        cancel_scope.cancel()
+                    return
+                await messages.put(message)
+
+        with anyio.CancelScope() as cancel_scope:
+            watcher = asyncio.create_task(watch(cancel_scope))
+            try:
+                await self.app(scope, receive_from_watcher, send_and_track)
+            finally:
+                watcher.cancel()
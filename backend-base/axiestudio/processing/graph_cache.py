@@ -0,0 +1,133 @@
+"""Cache of prepared graphs for the run endpoints.
+
+Building a graph from a flow's data and preparing it is a large share of the time of a
+short run, and it gives the same result for every run of a flow until the flow changes.
+:class:`PreparedGraphCache` keeps one prepared, tweak-free graph per flow and hands out
+forks of it. An entry is rebuilt when the flow's ``updated_at`` changes, and the least
+recently used entries are dropped when the cache is full.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from axiestudio.graph.graph.base import Graph
+from axiestudio.logging import logger
+from axiestudio.processing.process import process_tweaks
+from axiestudio.services.deps import get_settings_service
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from axiestudio.services.database.models.flow.model import Flow
+
+DEFAULT_MAX_SIZE = 128
+
+
+class _CacheKey(NamedTuple):
+    flow_id: str
+    user_id: str
+    stream: bool
+
+
+class _CacheEntry(NamedTuple):
+    updated_at: datetime
+    graph: Graph
+
+
+class PreparedGraphCache:
+    """LRU cache of prepared graphs keyed by flow id, user id and stream mode.
+
+    Args:
+        max_size: Maximum number of prepared graphs kept. ``0`` disables the cache.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        if max_size < 0:
+            msg = "max_size must be a non-negative integer"
+            raise ValueError(msg)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[_CacheKey, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_graph(self, flow: Flow, *, user_id: str, stream: bool = False) -> Graph:
+        """Return a graph of ``flow`` that is ready to run, without tweaks applied.
+
+        The returned graph is a fork, so the caller may tweak and run it freely.
+        """
+        flow_id = str(flow.id)
+        if self.max_size == 0 or flow.updated_at is None:
+            return self._build(flow, user_id=user_id, stream=stream)
+
+        key = _CacheKey(flow_id, user_id, stream)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.updated_at == flow.updated_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.graph.fork()
+            self.misses += 1
+
+        graph = self._build(flow, user_id=user_id, stream=stream)
+        with self._lock:
+            current = self._entries.get(key)
+            # Don't replace a newer version that a concurrent request stored meanwhile
+            if current is None or current.updated_at <= flow.updated_at:
+                self._entries[key] = _CacheEntry(flow.updated_at, graph)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return graph.fork()
+
+    @staticmethod
+    def _build(flow: Flow, *, user_id: str, stream: bool) -> Graph:
+        flow_id = str(flow.id)
+        if flow.data is None:
+            msg = f"Flow {flow_id} has no data"
+            raise ValueError(msg)
+        graph_data = process_tweaks(flow.data.copy(), {}, stream=stream)
+        graph = Graph.from_payload(graph_data, flow_id=flow_id, user_id=user_id, flow_name=flow.name)
+        graph.production_mode = True
+        return graph.prepare()
+
+    def invalidate(self, flow_id: str) -> None:
+        """Drop every prepared graph of a flow."""
+        with self._lock:
+            for key in [key for key in self._entries if key.flow_id == flow_id]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+_cache: PreparedGraphCache | None = None
+
+
+def get_prepared_graph_cache() -> PreparedGraphCache:
+    """Return the process-wide prepared graph cache, sized from the settings on first use."""
+    global _cache  # noqa: PLW0603
+    if _cache is None:
+        max_size = DEFAULT_MAX_SIZE
+        try:
+            max_size = get_settings_service().settings.prepared_graph_cache_size
+        except Exception:  # noqa: BLE001
+            logger.debug("Could not read prepared graph cache settings, using defaults")
+        _cache = PreparedGraphCache(max_size=max_size)
+    return _cache
@@ -0,0 +1,216 @@
+"""Cache of run results for the flows that opt in.
+
+Many flows give the same outputs for the same request, e.g. prompt templating, extraction or
+classification at temperature 0. A flow opts in by carrying the ``run_result_cache_tag``
+tag (``cache`` by default). The ``/run`` endpoint then answers a repeated request from
+:class:`RunResultCache`, without building or running the graph.
+
+The key is a fingerprint of the flow id, version (its ``updated_at``) and content (a hash of
+its ``data``), the user and the whole request: input, output selection, tweaks and session.
+Saving the flow therefore starts a new set of entries, and so does code that changes a flow
+without a new ``updated_at``, such as the file sync. The key holds nothing that lives only
+in one process, so it stays valid across restarts and workers that share the disk tier.
+Hashing the data on every request would cost as much as serializing the flow, so the digest
+is kept per flow id and version; the file sync drops it through
+:meth:`RunResultCache.forget_flow` when it changes the data. Changes the key can't see, such
+as a changed global variable, last at most ``run_result_cache_ttl`` seconds. Entries live in
+an :class:`AsyncInMemoryCache` LRU and, if ``run_result_cache_disk_size`` is set, also in an
+:class:`AsyncDiskCache` under the config directory that holds more entries than memory does.
+
+Every ``STATS_LOG_INTERVAL`` lookups the cache logs its :meth:`RunResultCache.stats`, hit
+ratio included.
+
+A request bypasses the cache with a ``Cache-Control`` header: ``no-cache`` (or ``max-age=0``)
+runs the flow and stores the new result; ``no-store`` neither reads nor writes the cache.
+
+A request answered from the cache doesn't run the flow, so it stores no chat messages in its
+session.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from axiestudio.logging import logger
+from axiestudio.services.cache.disk import AsyncDiskCache
+from axiestudio.services.cache.service import AsyncInMemoryCache
+from axiestudio.services.cache.utils import CACHE_MISS
+from axiestudio.services.deps import get_settings_service
+
+if TYPE_CHECKING:
+    from axiestudio.api.v1.schemas import RunResponse, SimplifiedAPIRequest
+    from axiestudio.services.cache.base import AsyncBaseCacheService
+    from axiestudio.services.database.models.flow.model import Flow
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = 300.0
+DEFAULT_TAG = "cache"
+STATS_LOG_INTERVAL = 1000
+
+
+class CacheDirectives(NamedTuple):
+    read: bool = True
+    write: bool = True
+
+
+def parse_cache_control(header: str | None) -> CacheDirectives:
+    """Read the directives of a ``Cache-Control`` request header that apply to the run cache."""
+    if not header:
+        return CacheDirectives()
+    directives = {part.strip().lower().replace(" ", "") for part in header.split(",")}
+    if "no-store" in directives:
+        return CacheDirectives(read=False, write=False)
+    if "no-cache" in directives or "max-age=0" in directives:
+        return CacheDirectives(read=False, write=True)
+    return CacheDirectives()
+
+
+class RunResultCache:
+    """Two-tier cache of run responses keyed by request fingerprint.
+
+    Cached responses are shared between requests; treat them as read-only.
+
+    Args:
+        max_size: Maximum number of responses kept in memory. ``0`` disables the cache.
+        ttl: Seconds a response is served from the cache.
+        tag: Flow tag that opts a flow in.
+        disk_size: Maximum number of responses kept on disk. ``0`` disables the disk tier.
+        disk_dir: Directory of the disk tier.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl: float = DEFAULT_TTL,
+        tag: str = DEFAULT_TAG,
+        disk_size: int = 0,
+        disk_dir: str | Path | None = None,
+    ) -> None:
+        if max_size < 0 or disk_size < 0:
+            msg = "max_size and disk_size must be non-negative integers"
+            raise ValueError(msg)
+        self.max_size = max_size
+        self.tag = tag
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._digests: OrderedDict[tuple[str, str | None], str] = OrderedDict()
+        self._memory: AsyncInMemoryCache = AsyncInMemoryCache(max_size=max_size, expiration_time=ttl)
+        self._disk: AsyncBaseCacheService | None = None
+        if max_size and disk_size and disk_dir is not None:
+            self._disk = AsyncDiskCache(cache_dir=str(disk_dir), max_size=disk_size, expiration_time=ttl)
+
+    def is_enabled_for(self, flow: Flow) -> bool:
+        """Whether ``flow`` opted in; a flow without a version can't be cached."""
+        return bool(self.max_size) and flow.updated_at is not None and self.tag in (flow.tags or [])
+
+    def fingerprint(self, flow: Flow, input_request: SimplifiedAPIRequest, *, user_id: str | None) -> str:
+        """Return a stable key for a run of ``flow`` with ``input_request``."""
+        flow_id = str(flow.id)
+        version = flow.updated_at.isoformat() if flow.updated_at else None
+        payload = {
+            "flow_id": flow_id,
+            "version": version,
+            "content": self._content_digest(flow, (flow_id, version)),
+            "user_id": user_id,
+            "request": input_request.model_dump(mode="json"),
+        }
+        data = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _content_digest(self, flow: Flow, version_key: tuple[str, str | None]) -> str:
+        digest = self._digests.get(version_key)
+        if digest is not None:
+            self._digests.move_to_end(version_key)
+            return digest
+        flow_data = json.dumps(flow.data, sort_keys=True, separators=(",", ":"), default=str)
+        digest = hashlib.sha256(flow_data.encode("utf-8")).hexdigest()
+        self._digests[version_key] = digest
+        if len(self._digests) > self.max_size:
+            self._digests.popitem(last=False)
+        return digest
+
+    def forget_flow(self, flow_id: str) -> None:
+        """Drop the content digests of ``flow_id``, whose data changed without a new ``updated_at``."""
+        for version_key in [version_key for version_key in self._digests if version_key[0] == flow_id]:
+            del self._digests[version_key]
+
+    async def get(self, key: str, cache_control: str | None = None) -> RunResponse | None:
+        """Return the cached response for ``key``, or ``None`` if it must be run."""
+        if not parse_cache_control(cache_control).read:
+            self.bypassed += 1
+            return None
+        value = await self._memory.get(key)
+        if value is CACHE_MISS and self._disk is not None:
+            value = await self._disk.get(key)
+            if value is not CACHE_MISS:
+                self.disk_hits += 1
+                await self._memory.set(key, value)
+        if value is CACHE_MISS:
+            self.misses += 1
+            value = None
+        else:
+            self.hits += 1
+        if (self.hits + self.misses) % STATS_LOG_INTERVAL == 0:
+            logger.info(f"Run result cache: {self.stats()}")
+        return value
+
+    async def set(self, key: str, response: RunResponse, cache_control: str | None = None) -> None:
+        """Store the response of a run, unless the request asked not to."""
+        if not parse_cache_control(cache_control).write:
+            return
+        await self._memory.set(key, response)
+        if self._disk is not None:
+            try:
+                await self._disk.set(key, response)
+            except Exception:  # noqa: BLE001
+                # Outputs that can't be pickled stay in memory only
+                logger.debug(f"Could not store run result {key} on disk", exc_info=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the size and lookup counters of the cache, with the memory and disk hit ratio."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._memory.cache),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    async def clear(self) -> None:
+        await self._memory.clear()
+        if self._disk is not None:
+            await self._disk.clear()
+        self._digests.clear()
+        self.hits = self.disk_hits = self.misses = self.bypassed = 0
+
+
+_cache: RunResultCache | None = None
+
+
+def get_run_result_cache() -> RunResultCache:
+    """Return the process-wide run result cache, configured from the settings on first use."""
+    global _cache  # noqa: PLW0603
+    if _cache is None:
+        try:
+            settings = get_settings_service().settings
+            disk_dir = Path(settings.config_dir) / "run_result_cache" if settings.config_dir else None
+            _cache = RunResultCache(
+                max_size=settings.run_result_cache_size,
+                ttl=settings.run_result_cache_ttl,
+                tag=settings.run_result_cache_tag,
+                disk_size=settings.run_result_cache_disk_size,
+                disk_dir=disk_dir,
+            )
+        except Exception:  # noqa: BLE001
+            logger.debug("Could not read run result cache settings, using defaults")
+            _cache = RunResultCache()
+    return _cache
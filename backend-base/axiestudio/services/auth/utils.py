@@ -16,7 +16,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.websockets import WebSocket
 
-from axiestudio.services.database.models.api_key.crud import check_key
+from axiestudio.services.database.models.api_key.crud import check_key, verify_key
 from axiestudio.services.database.models.user.crud import get_user_by_id, get_user_by_username, update_user_last_login_at
 from axiestudio.services.database.models.user.model import User, UserRead
 from axiestudio.services.deps import get_db_service, get_session, get_settings_service
@@ -51,47 +51,40 @@ async def api_key_security(
     header_param: Annotated[str, Security(api_key_header)],
 ) -> UserRead | None:
     settings_service = get_settings_service()
-    result: ApiKey | User | None
+    api_key = query_param or header_param
 
-    async with get_db_service().with_session() as db:
-        if settings_service.auth_settings.AUTO_LOGIN:
-            # Get the first user
-            if not settings_service.auth_settings.SUPERUSER:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Missing first superuser credentials",
-                )
-            if not query_param and not header_param:
-                if settings_service.auth_settings.skip_auth_auto_login:
+    if settings_service.auth_settings.AUTO_LOGIN:
+        # Get the first user
+        if not settings_service.auth_settings.SUPERUSER:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Missing first superuser credentials",
+            )
+        if not api_key:
+            if settings_service.auth_settings.skip_auth_auto_login:
+                async with get_db_service().with_session() as db:
                     result = await get_user_by_username(db, settings_service.auth_settings.SUPERUSER)
                     logger.warning(AUTO_LOGIN_WARNING)
                     return UserRead.model_validate(result, from_attributes=True)
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=AUTO_LOGIN_ERROR,
-                )
-            result = await check_key(db, query_param or header_param)
-
-        elif not query_param and not header_param:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="An API key must be passed as query or header",
-            )
-
-        else:
-            result = await check_key(db, query_param or header_param)
-
-        if not result:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="Invalid or missing API key",
+                detail=AUTO_LOGIN_ERROR,
             )
 
-        if isinstance(result, User):
-            return UserRead.model_validate(result, from_attributes=True)
+    elif not api_key:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="An API key must be passed as query or header",
+        )
 
-    msg = "Invalid result type"
-    raise ValueError(msg)
+    # Verified keys are cached for a few seconds, so most requests don't touch the database here
+    user = await verify_key(api_key)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or missing API key",
+        )
+    return user
 
 
 async def ws_api_key_security(
@@ -0,0 +1,233 @@
+"""In-process caching for API key authentication.
+
+Checking an API key used to cost a query for the key and its user plus a separate commit
+to count the use, on every authenticated request. :class:`VerifiedApiKeyCache` keeps the
+users of recently verified keys for a few seconds, and :class:`ApiKeyUsageTracker`
+accumulates the uses of each key in memory and writes them in one periodic batch.
+
+Only keys that were found are cached, so a new key works at once. Deleting a key or
+updating or deleting its user invalidates the cached entries in this process; other
+processes see the change when their entries expire.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, NamedTuple
+
+from sqlalchemy import update
+
+from axiestudio.logging import logger
+from axiestudio.services.database.models.api_key.model import ApiKey
+from axiestudio.services.deps import get_settings_service, session_scope
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from axiestudio.services.database.models.user.model import UserRead
+
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_SIZE = 10_000
+
+
+class VerifiedApiKey(NamedTuple):
+    api_key_id: UUID
+    user: UserRead
+    expires_at: float
+
+
+class VerifiedApiKeyCache:
+    """TTL cache of verified API keys and their users.
+
+    Keys are stored as SHA-256 digests, so the cache never holds a usable API key.
+
+    Args:
+        ttl: Seconds a verified key is trusted without checking the database. ``0`` disables the cache.
+        max_size: Maximum number of cached keys; the least recently used are dropped first.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, VerifiedApiKey] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    @staticmethod
+    def _digest(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    def get(self, api_key: str) -> VerifiedApiKey | None:
+        if not self.enabled:
+            return None
+        digest = self._digest(api_key)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry
+
+    def put(self, api_key: str, api_key_id: UUID, user: UserRead) -> VerifiedApiKey:
+        entry = VerifiedApiKey(api_key_id, user, time.monotonic() + self.ttl)
+        if not self.enabled:
+            return entry
+        digest = self._digest(api_key)
+        with self._lock:
+            self._entries[digest] = entry
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate_key(self, api_key: str) -> None:
+        with self._lock:
+            self._entries.pop(self._digest(api_key), None)
+
+    def invalidate_user(self, user_id: UUID | str) -> None:
+        user_id = str(user_id)
+        with self._lock:
+            for digest in [digest for digest, entry in self._entries.items() if str(entry.user.id) == user_id]:
+                del self._entries[digest]
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+class ApiKeyUsageTracker:
+    """Accumulates API key uses and writes them in batches.
+
+    Each flush adds the counted uses to ``total_uses`` and sets ``last_used_at`` of every
+    used key in a single transaction, ``flush_interval`` seconds after the first use that is
+    not written yet. Like the message sink, the tracker is bound to the event loop it is
+    first used on.
+    """
+
+    def __init__(self, flush_interval: float = 10.0) -> None:
+        self.flush_interval = flush_interval
+        self._uses: dict[UUID, tuple[int, datetime]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._flush_task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._uses)
+
+    def usable(self) -> bool:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if self._loop is None:
+            self._loop = loop
+            self._flush_lock = asyncio.Lock()
+        return loop is self._loop
+
+    def record(self, api_key_id: UUID) -> None:
+        count, _ = self._uses.get(api_key_id, (0, None))
+        self._uses[api_key_id] = (count + 1, datetime.now(timezone.utc))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush()
+        except Exception:  # noqa: BLE001
+            logger.exception("Error writing API key usage")
+
+    async def flush(self) -> None:
+        """Write the accumulated uses."""
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            if not self._uses:
+                return
+            uses, self._uses = self._uses, {}
+            try:
+                async with session_scope() as session:
+                    for api_key_id, (count, last_used_at) in uses.items():
+                        await session.execute(
+                            update(ApiKey)
+                            .where(ApiKey.id == api_key_id)
+                            .values(total_uses=ApiKey.total_uses + count, last_used_at=last_used_at)
+                        )
+            except Exception:  # noqa: BLE001
+                logger.exception(f"Could not write the usage of {len(uses)} API keys")
+
+    async def aclose(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
+
+
+_verified_api_key_cache: VerifiedApiKeyCache | None = None
+_usage_tracker: ApiKeyUsageTracker | None = None
+
+
+def get_verified_api_key_cache() -> VerifiedApiKeyCache:
+    """Return the process-wide verified API key cache, configured from the settings on first use."""
+    global _verified_api_key_cache  # noqa: PLW0603
+    if _verified_api_key_cache is None:
+        ttl = DEFAULT_TTL
+        try:
+            ttl = get_settings_service().settings.api_key_cache_ttl
+        except Exception:  # noqa: BLE001
+            logger.debug("Could not read API key cache settings, using defaults")
+        _verified_api_key_cache = VerifiedApiKeyCache(ttl=ttl)
+    return _verified_api_key_cache
+
+
+def get_api_key_usage_tracker() -> ApiKeyUsageTracker | None:
+    """Return the API key usage tracker, or None if uses should be written at once."""
+    global _usage_tracker  # noqa: PLW0603
+    if _usage_tracker is None:
+        flush_interval = get_settings_service().settings.api_key_usage_flush_interval
+        if flush_interval <= 0:
+            return None
+        _usage_tracker = ApiKeyUsageTracker(flush_interval=flush_interval)
+    return _usage_tracker if _usage_tracker.usable() else None
+
+
+def invalidate_api_key(api_key: str) -> None:
+    if _verified_api_key_cache is not None:
+        _verified_api_key_cache.invalidate_key(api_key)
+
+
+def invalidate_user_api_keys(user_id: UUID | str) -> None:
+    if _verified_api_key_cache is not None:
+        _verified_api_key_cache.invalidate_user(user_id)
+
+
+async def close_api_key_usage_tracker() -> None:
+    global _usage_tracker  # noqa: PLW0603
+    if _usage_tracker is not None and _usage_tracker.usable():
+        await _usage_tracker.aclose()
+    _usage_tracker = None
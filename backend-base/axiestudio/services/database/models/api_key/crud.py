@@ -7,8 +7,13 @@ from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from axiestudio.services.database.models.api_key.cache import (
+    get_api_key_usage_tracker,
+    get_verified_api_key_cache,
+    invalidate_api_key,
+)
 from axiestudio.services.database.models.api_key.model import ApiKey, ApiKeyCreate, ApiKeyRead, UnmaskedApiKeyRead
-from axiestudio.services.database.models.user.model import User
+from axiestudio.services.database.models.user.model import User, UserRead
 from axiestudio.services.deps import get_settings_service, session_scope
 
 if TYPE_CHECKING:
@@ -45,22 +50,55 @@ async def delete_api_key(session: AsyncSession, api_key_id: UUID) -> None:
     if api_key is None:
         msg = "API Key not found"
         raise ValueError(msg)
+    key = api_key.api_key
     await session.delete(api_key)
     await session.commit()
+    invalidate_api_key(key)
 
 
 async def check_key(session: AsyncSession, api_key: str) -> User | None:
     """Check if the API key is valid."""
-    query: SelectOfScalar = select(ApiKey).options(selectinload(ApiKey.user)).where(ApiKey.api_key == api_key)
-    api_key_object: ApiKey | None = (await session.exec(query)).first()
+    api_key_object = await _get_api_key(session, api_key)
     if api_key_object is not None:
-        settings_service = get_settings_service()
-        if settings_service.settings.disable_track_apikey_usage is not True:
-            await update_total_uses(api_key_object.id)
+        await track_key_use(api_key_object.id)
         return api_key_object.user
     return None
 
 
+async def verify_key(api_key: str) -> UserRead | None:
+    """Return the user of a valid API key, using the verified key cache.
+
+    Unlike :func:`check_key`, this only opens a database session when the key is not cached.
+    """
+    cache = get_verified_api_key_cache()
+    verified = cache.get(api_key)
+    if verified is None:
+        async with session_scope() as session:
+            api_key_object = await _get_api_key(session, api_key)
+            if api_key_object is None or api_key_object.user is None:
+                return None
+            user = UserRead.model_validate(api_key_object.user, from_attributes=True)
+        verified = cache.put(api_key, api_key_object.id, user)
+    await track_key_use(verified.api_key_id)
+    return verified.user.model_copy()
+
+
+async def _get_api_key(session: AsyncSession, api_key: str) -> ApiKey | None:
+    query: SelectOfScalar = select(ApiKey).options(selectinload(ApiKey.user)).where(ApiKey.api_key == api_key)
+    return (await session.exec(query)).first()
+
+
+async def track_key_use(api_key_id: UUID) -> None:
+    """Count a use of an API key, in the next batch if usage tracking is batched."""
+    settings_service = get_settings_service()
+    if settings_service.settings.disable_track_apikey_usage is True:
+        return
+    if (tracker := get_api_key_usage_tracker()) is not None:
+        tracker.record(api_key_id)
+        return
+    await update_total_uses(api_key_id)
+
+
 async def update_total_uses(api_key_id: UUID):
     """Update the total uses and last used at."""
     async with session_scope() as session:
@@ -8,6 +8,7 @@ from sqlalchemy.orm.attributes import flag_modified
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from axiestudio.services.database.models.api_key.cache import invalidate_user_api_keys
 from axiestudio.services.database.models.user.model import User, UserUpdate
 from typing import List
 
@@ -82,6 +83,8 @@ async def update_user_instance(user_db: User | None, user: UserUpdate, db: Async
         await db.rollback()
         raise HTTPException(status_code=400, detail=str(e)) from e
 
+    # Cached API key verifications carry a copy of the user, e.g. its is_active flag
+    invalidate_user_api_keys(user_db.id)
     return user_db
 
 
@@ -0,0 +1,122 @@
+"""Numbered, replayable build events for clients that poll.
+
+A polling client used to take events straight off the job queue, so an event was gone once
+a response carrying it was sent, even if the response never reached the client. The
+:class:`JobEventLog` of a job moves the events of the queue into a buffer and
+numbers them; each poll names the last event it received and gets the events after it, so
+a client that lost a response or reconnected asks again with the same cursor.
+
+Events the client has not acknowledged yet are always kept. Of the acknowledged ones, the
+last ``max_size`` are kept, for clients that resume from an older cursor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+from collections import deque
+from typing import TYPE_CHECKING
+
+from axiestudio.logging import logger
+
+if TYPE_CHECKING:
+    from axiestudio.events.event_manager import EventManager
+
+DEFAULT_REPLAY_BUFFER_SIZE = 1000
+
+
+class JobEventLog:
+    """The events of one build job, numbered from 1 in the order they were sent.
+
+    Args:
+        queue: The job queue the event manager of the job writes to.
+        event_manager: The event manager of the job.
+        event_task: The task building the job, cancelled once the job has sent its last event.
+        max_size: Number of acknowledged events kept for replay; older events are dropped first.
+    """
+
+    def __init__(
+        self,
+        queue: asyncio.Queue,
+        event_manager: EventManager,
+        event_task: asyncio.Task | None,
+        max_size: int = DEFAULT_REPLAY_BUFFER_SIZE,
+    ) -> None:
+        self.queue = queue
+        self.event_manager = event_manager
+        self.event_task = event_task
+        self.last_id = 0
+        self.delivered_id = 0
+        self.acknowledged_id = 0
+        self.finished = False
+        self.max_size = max(1, max_size)
+        self._events: deque[tuple[int, str]] = deque()
+        self._changed = asyncio.Condition()
+        self._pump_task: asyncio.Task | None = None
+
+    def _append(self, value: bytes) -> None:
+        self.last_id += 1
+        self._events.append((self.last_id, value.decode("utf-8")))
+
+    async def _pump(self) -> None:
+        while True:
+            _, value, _ = await self.queue.get()
+            async with self._changed:
+                if value is None:
+                    # End of stream, trigger end event
+                    if self.event_task is not None:
+                        self.event_task.cancel()
+                    self.event_manager.on_end(data={})
+                    while not self.queue.empty():
+                        _, value, _ = self.queue.get_nowait()
+                        if value is not None:
+                            self._append(value)
+                    self.finished = True
+                    self._changed.notify_all()
+                    return
+                self._append(value)
+                self._changed.notify_all()
+
+    def _acknowledge(self, cursor: int) -> None:
+        self.acknowledged_id = max(self.acknowledged_id, cursor)
+        while self._events and self._events[0][0] <= self.acknowledged_id - self.max_size:
+            self._events.popleft()
+
+    def events_after(self, cursor: int, max_events: int) -> list[tuple[int, str]]:
+        """Return up to ``max_events`` kept events numbered after ``cursor``."""
+        if not self._events or cursor >= self.last_id:
+            return []
+        first_id = self._events[0][0]
+        if cursor + 1 < first_id:
+            logger.debug(f"Events {cursor + 1} to {first_id - 1} were dropped from the replay buffer")
+        start = max(0, cursor + 1 - first_id)
+        return list(itertools.islice(self._events, start, start + max_events))
+
+    async def wait_for_events(
+        self, cursor: int | None = None, *, timeout: float, max_events: int
+    ) -> list[tuple[int, str]]:
+        """Wait until there are events after ``cursor`` and return them.
+
+        Args:
+            cursor: Number of the last event the client received. ``None`` continues after the
+                last event returned to a poll without a cursor.
+            timeout: Seconds to wait for an event before returning an empty list.
+            max_events: Maximum number of events returned.
+        """
+        if self._pump_task is None:
+            self._pump_task = asyncio.create_task(self._pump())
+        after = self.delivered_id if cursor is None else cursor
+        self._acknowledge(after)
+        async with self._changed:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._changed.wait_for(lambda: self.last_id > after or self.finished), timeout)
+            events = self.events_after(after, max_events)
+        if cursor is None and events:
+            self.delivered_id = max(self.delivered_id, events[-1][0])
+        return events
+
+    async def aclose(self) -> None:
+        if self._pump_task is not None and not self._pump_task.done():
+            self._pump_task.cancel()
+            await asyncio.gather(self._pump_task, return_exceptions=True)
@@ -1,11 +1,26 @@
+from typing import TYPE_CHECKING
+
+from typing_extensions import override
+
 from axiestudio.services.base import Service
 from axiestudio.services.factory import ServiceFactory
 from axiestudio.services.job_queue.service import JobQueueService
 
+if TYPE_CHECKING:
+    from axiestudio.services.settings.service import SettingsService
+
 
 class JobQueueServiceFactory(ServiceFactory):
     def __init__(self):
         super().__init__(JobQueueService)
 
-    def create(self) -> Service:
-        return JobQueueService()
+    @override
+    def create(self, settings_service: "SettingsService") -> Service:
+        settings = settings_service.settings
+        return JobQueueService(
+            event_replay_buffer_size=settings.event_replay_buffer_size,
+            max_concurrent_jobs=settings.max_concurrent_jobs,
+            finished_job_retention=settings.finished_job_retention,
+            max_finished_jobs=settings.max_finished_jobs,
+            max_queued_events_per_job=settings.max_queued_events_per_job,
+        )
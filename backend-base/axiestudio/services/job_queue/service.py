@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+from collections import OrderedDict, deque
+from functools import partial
 
 from axiestudio.logging import logger
 
 from axiestudio.events.event_manager import EventManager
 from axiestudio.services.base import Service
+from axiestudio.services.job_queue.event_log import DEFAULT_REPLAY_BUFFER_SIZE, JobEventLog
 
 
 class JobQueueNotFoundError(Exception):
@@ -16,6 +19,14 @@ class JobQueueNotFoundError(Exception):
         super().__init__(f"Job queue not found for job_id: {job_id}")
 
 
+class JobQueueFullError(Exception):
+    """Exception raised when a new job is rejected because the maximum number of jobs are running."""
+
+    def __init__(self, max_concurrent_jobs: int) -> None:
+        self.max_concurrent_jobs = max_concurrent_jobs
+        super().__init__(f"Too many jobs running; the limit is {max_concurrent_jobs}")
+
+
 class JobQueueService(Service):
     """Asynchronous service for managing job-specific queues and their associated tasks.
 
@@ -27,9 +38,13 @@ class JobQueueService(Service):
       - Automatically perform periodic cleanup of inactive or completed job queues.
 
     The cleanup process follows a two-phase approach:
-      1. When a task is cancelled or fails, it is marked for cleanup by setting a timestamp
+      1. When a task finishes, succeeds, fails or is cancelled, it is marked for cleanup by setting a timestamp
       2. The actual cleanup only occurs after CLEANUP_GRACE_PERIOD seconds have elapsed
-         since the task was marked
+         since the task was marked, or earlier when more than max_finished_jobs jobs are finished
+
+    Admission control: at most max_concurrent_jobs jobs (if set) are registered and not finished at once.
+    create_queue rejects jobs above the limit with JobQueueFullError; callers that prefer to queue first
+    await wait_for_capacity.
 
     Attributes:
         name (str): Unique identifier for the service.
@@ -39,6 +54,9 @@ class JobQueueService(Service):
               * The associated EventManager instance.
               * The asyncio.Task processing the job (if any).
               * The cleanup timestamp (if any).
+        _event_logs (dict[str, JobEventLog]): The numbered events of the jobs whose events are polled.
+        _active_jobs (set[str]): The jobs counted against max_concurrent_jobs.
+        _finished_jobs (OrderedDict[str, None]): The finished jobs still registered, oldest first.
         _cleanup_task (asyncio.Task | None): Background task for periodic cleanup.
         _closed (bool): Flag indicating whether the service is currently active.
         CLEANUP_GRACE_PERIOD (int): Number of seconds to wait after a task is marked for cleanup
@@ -46,7 +64,7 @@ class JobQueueService(Service):
               * Pending operations to complete
               * Related systems to finish their work
               * Inspection or recovery if needed
-            Default is 300 seconds (5 minutes).
+            Default is 300 seconds (5 minutes), set by finished_job_retention.
 
     Example:
         service = JobQueueService()
@@ -61,17 +79,43 @@ class JobQueueService(Service):
 
     name = "job_queue_service"
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        event_replay_buffer_size: int = DEFAULT_REPLAY_BUFFER_SIZE,
+        *,
+        max_concurrent_jobs: int = 0,
+        finished_job_retention: float = 300,
+        max_finished_jobs: int = 1000,
+        max_queued_events_per_job: int | None = None,
+    ) -> None:
         """Initialize the JobQueueService.
 
         Sets up the internal registry for job queues, initializes the cleanup task, and sets the service state
         to active.
+
+        Args:
+            event_replay_buffer_size (int): Number of events kept per polled job for clients that resume
+                from a cursor.
+            max_concurrent_jobs (int): Maximum number of jobs registered and not finished at once; 0 for no limit.
+            finished_job_retention (float): Seconds a finished job is kept for clients that still read its events.
+            max_finished_jobs (int): Maximum number of finished jobs kept; the oldest ones are cleaned up first.
+            max_queued_events_per_job (int | None): Number of unread events of a job above which its token
+                events are dropped; None for no limit.
         """
         self._queues: dict[str, tuple[asyncio.Queue, EventManager, asyncio.Task | None, float | None]] = {}
+        self._event_logs: dict[str, JobEventLog] = {}
+        self.event_replay_buffer_size = event_replay_buffer_size
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.max_finished_jobs = max_finished_jobs
+        self.max_queued_events_per_job = max_queued_events_per_job
+        self._active_jobs: set[str] = set()
+        self._finished_jobs: OrderedDict[str, None] = OrderedDict()
+        self._capacity_waiters: deque[asyncio.Future] = deque()
+        self._eviction_tasks: set[asyncio.Task] = set()
         self._cleanup_task: asyncio.Task | None = None
         self._closed = False
         self.ready = False
-        self.CLEANUP_GRACE_PERIOD = 300  # 5 minutes before cleaning up marked tasks
+        self.CLEANUP_GRACE_PERIOD = finished_job_retention  # 5 minutes before cleaning up marked tasks by default
 
     def is_started(self) -> bool:
         """Check if the JobQueueService has started.
@@ -117,11 +161,52 @@ class JobQueueService(Service):
         # Clean up each registered job queue.
         for job_id in list(self._queues.keys()):
             await self.cleanup_job(job_id)
+        if self._eviction_tasks:
+            await asyncio.wait(self._eviction_tasks)
         logger.debug("JobQueueService stopped: all job queues have been cleaned up.")
 
     async def teardown(self) -> None:
         await self.stop()
 
+    def has_capacity(self) -> bool:
+        """Check if a new job can be created without exceeding max_concurrent_jobs."""
+        return not self.max_concurrent_jobs or len(self._active_jobs) < self.max_concurrent_jobs
+
+    async def wait_for_capacity(self, timeout: float | None = None) -> None:
+        """Wait until a new job can be created without exceeding max_concurrent_jobs.
+
+        Args:
+            timeout (float | None): Seconds to wait for a running job to finish; None waits indefinitely.
+
+        Raises:
+            JobQueueFullError: If no job finished within the timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not self.has_capacity():
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                raise JobQueueFullError(self.max_concurrent_jobs)
+            waiter = loop.create_future()
+            self._capacity_waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                if waiter in self._capacity_waiters:
+                    self._capacity_waiters.remove(waiter)
+
+    def _release_capacity(self, job_id: str) -> None:
+        if job_id not in self._active_jobs:
+            return
+        self._active_jobs.discard(job_id)
+        # Every waiter checks again; the ones that lost the race wait for the next job to finish
+        while self._capacity_waiters:
+            waiter = self._capacity_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
     def create_queue(self, job_id: str) -> tuple[asyncio.Queue, EventManager]:
         """Create and register a new queue along with its corresponding event manager for a job.
 
@@ -132,6 +217,9 @@ class JobQueueService(Service):
             tuple[asyncio.Queue, EventManager]: A tuple containing:
                 - The asyncio.Queue instance for handling the job's tasks or messages.
                 - The EventManager instance for event handling tied to the queue.
+
+        Raises:
+            JobQueueFullError: If max_concurrent_jobs jobs are already running.
         """
         if self._closed:
             msg = "Queue service is closed"
@@ -142,11 +230,15 @@ class JobQueueService(Service):
             msg = f"Queue for job_id {job_id} already exists"
             raise ValueError(msg)
 
+        if not self.has_capacity():
+            raise JobQueueFullError(self.max_concurrent_jobs)
+
         main_queue: asyncio.Queue = asyncio.Queue()
         event_manager: EventManager = self._create_default_event_manager(main_queue)
 
         # Register the queue without an active task.
         self._queues[job_id] = (main_queue, event_manager, None, None)
+        self._active_jobs.add(job_id)
         logger.debug(f"Queue and event manager successfully created for job_id {job_id}")
         return main_queue, event_manager
 
@@ -182,8 +274,28 @@ class JobQueueService(Service):
         # Initiate the new asynchronous task.
         task = asyncio.create_task(task_coro)
         self._queues[job_id] = (main_queue, event_manager, task, None)
+        self._finished_jobs.pop(job_id, None)
+        self._active_jobs.add(job_id)
+        task.add_done_callback(partial(self._on_job_done, job_id))
         logger.debug(f"New task started for job_id {job_id}")
 
+    def _on_job_done(self, job_id: str, task: asyncio.Task) -> None:
+        """Mark a finished job for cleanup and free its slot."""
+        entry = self._queues.get(job_id)
+        if entry is None or entry[2] is not task:
+            # The job was cleaned up or its task was replaced
+            return
+        main_queue, event_manager, _, _ = entry
+        self._queues[job_id] = (main_queue, event_manager, task, asyncio.get_running_loop().time())
+        self._release_capacity(job_id)
+        self._finished_jobs[job_id] = None
+        while len(self._finished_jobs) > self.max_finished_jobs:
+            oldest_job_id, _ = self._finished_jobs.popitem(last=False)
+            logger.debug(f"Too many finished jobs, cleaning up job_id {oldest_job_id}")
+            eviction = asyncio.create_task(self.cleanup_job(oldest_job_id))
+            self._eviction_tasks.add(eviction)
+            eviction.add_done_callback(self._eviction_tasks.discard)
+
     def get_queue_data(self, job_id: str) -> tuple[asyncio.Queue, EventManager, asyncio.Task | None, float | None]:
         """Retrieve the complete data structure associated with a job's queue.
 
@@ -208,6 +320,22 @@ class JobQueueService(Service):
         except KeyError as exc:
             raise JobQueueNotFoundError(job_id) from exc
 
+    def get_event_log(self, job_id: str) -> JobEventLog:
+        """Return the numbered events of a job, for clients that poll for them.
+
+        Once the events of a job are polled, its queue is read by the event log only.
+
+        Raises:
+            JobQueueNotFoundError: If the job_id is not found.
+            RuntimeError: If the service is closed.
+        """
+        main_queue, event_manager, task, _ = self.get_queue_data(job_id)
+        event_log = self._event_logs.get(job_id)
+        if event_log is None:
+            event_log = JobEventLog(main_queue, event_manager, task, max_size=self.event_replay_buffer_size)
+            self._event_logs[job_id] = event_log
+        return event_log
+
     async def cleanup_job(self, job_id: str) -> None:
         """Clean up and release resources for a specific job.
 
@@ -226,6 +354,8 @@ class JobQueueService(Service):
 
         logger.debug(f"Commencing cleanup for job_id {job_id}")
         main_queue, _event_manager, task, _ = self._queues[job_id]
+        if event_log := self._event_logs.pop(job_id, None):
+            await event_log.aclose()
 
         # Cancel the associated task if it is still running.
         if task and not task.done():
@@ -233,7 +363,7 @@ class JobQueueService(Service):
             task.cancel()
             await asyncio.wait([task])
             # Log any exceptions that occurred during the task's execution.
-            if exc := task.exception():
+            if not task.cancelled() and (exc := task.exception()):
                 logger.error(f"Error in task for job_id {job_id}: {exc}")
             logger.debug(f"Task cancellation complete for job_id {job_id}")
 
@@ -249,6 +379,8 @@ class JobQueueService(Service):
         logger.debug(f"Removed {items_cleared} items from queue for job_id {job_id}")
         # Remove the job entry from the registry
         self._queues.pop(job_id, None)
+        self._finished_jobs.pop(job_id, None)
+        self._release_capacity(job_id)
         logger.debug(f"Cleanup successful for job_id {job_id}: resources have been released.")
 
     async def _periodic_cleanup(self) -> None:
@@ -272,7 +404,7 @@ class JobQueueService(Service):
                 logger.error(f"Exception encountered during periodic cleanup: {exc}")
 
     async def _cleanup_old_queues(self) -> None:
-        """Scan all registered job queues and clean up those with completed or failed tasks."""
+        """Scan all registered job queues and clean up those whose tasks finished more than the grace period ago."""
         current_time = asyncio.get_running_loop().time()
 
         for job_id in list(self._queues.keys()):
@@ -281,13 +413,11 @@ class JobQueueService(Service):
                 logger.debug(
                     f"Queue {job_id} status - Done: {task.done()}, "
                     f"Cancelled: {task.cancelled()}, "
-                    f"Has exception: {task.exception() is not None if task.done() else 'N/A'}"
+                    f"Has exception: {not task.cancelled() and task.exception() is not None if task.done() else 'N/A'}"
                 )
 
-                # Check if task should be marked for cleanup
-                # FIXED: Only cleanup tasks that are cancelled OR (done AND have exceptions)
-                # This prevents successful tasks from being cleaned up prematurely
-                if task and (task.cancelled() or (task.done() and task.exception() is not None)):
+                # Successful tasks are marked too; the grace period leaves clients time to read their events
+                if task.done():
                     if cleanup_time is None:
                         # Mark for cleanup by setting the timestamp
                         self._queues[job_id] = (
@@ -296,7 +426,7 @@ class JobQueueService(Service):
                             self._queues[job_id][2],
                             current_time,
                         )
-                        logger.debug(f"Job queue for job_id {job_id} marked for cleanup - Task cancelled or failed")
+                        logger.debug(f"Job queue for job_id {job_id} marked for cleanup - Task finished")
                     elif current_time - cleanup_time >= self.CLEANUP_GRACE_PERIOD:
                         # Enough time has passed, perform the actual cleanup
                         logger.debug(f"Cleaning up job_id {job_id} after grace period")
@@ -311,7 +441,7 @@ class JobQueueService(Service):
         Returns:
             EventManager: The configured EventManager instance.
         """
-        manager = EventManager(queue)
+        manager = EventManager(queue, max_queued_events=self.max_queued_events_per_job)
         # Registering predefined events
         event_names_types = [
             ("on_token", "token"),
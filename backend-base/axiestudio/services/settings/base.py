@@ -178,6 +178,9 @@ class Settings(BaseSettings):
 
     store_environment_variables: bool = True
     """Whether to store environment variables as Global Variables in the database."""
+    variable_cache_ttl: float = Field(default=10.0, ge=0)
+    """Seconds decrypted Global Variables are kept in memory for flow runs. Changing or deleting a variable
+    drops the user's cached variables at once. Set to 0 to read every variable from the database."""
     variables_to_get_from_environment: list[str] = VARIABLES_TO_GET_FROM_ENVIRONMENT
     """List of environment variables to get from the environment and store in the database."""
     worker_timeout: int = 300
@@ -225,6 +228,12 @@ class Settings(BaseSettings):
     """The maximum file size for the upload in MB."""
     deactivate_tracing: bool = False
     """If set to True, tracing will be deactivated."""
+    tracing_sample_rate: float = Field(default=1.0, ge=0.0, le=1.0)
+    """Fraction of graph runs that are traced, e.g. 0.01 traces 1% of the runs. Decided once per run."""
+    tracing_max_queue_size: int = Field(default=10000, ge=1)
+    """Number of trace events waiting for export above which new span events are dropped."""
+    tracing_batch_size: int = Field(default=100, ge=1)
+    """Maximum number of trace events the export thread handles at once."""
     max_transactions_to_keep: int = 3000
     """The maximum number of transactions to keep in the database."""
     max_vertex_builds_to_keep: int = 3000
@@ -234,7 +243,12 @@ class Settings(BaseSettings):
     webhook_polling_interval: int = 5000
     """The polling interval for the webhook in ms."""
     fs_flows_polling_interval: int = 10000
-    """The polling interval in milliseconds for synchronizing flows from the file system."""
+    """The polling interval in milliseconds for synchronizing flows from the file system, used when file system
+    notifications (the watchfiles package) are not available."""
+    fs_flows_refresh_interval: int = 60000
+    """The interval in milliseconds at which the list of flows stored in files is read from the database."""
+    fs_flows_sync_debounce: int = 500
+    """Milliseconds to wait for changes to flow files to settle before they are synchronized."""
     ssl_cert_file: str | None = None
     """Path to the SSL certificate file on the local system."""
     ssl_key_file: str | None = None
@@ -265,9 +279,62 @@ class Settings(BaseSettings):
     Default is 24 hours (86400 seconds). Minimum is 600 seconds (10 minutes)."""
     event_delivery: Literal["polling", "streaming", "direct"] = "streaming"
     """How to deliver build events to the frontend. Can be 'polling', 'streaming' or 'direct'."""
+    event_polling_timeout: float = Field(default=30.0, ge=0)
+    """Seconds a polling request for build events waits for a new event before it returns an empty response."""
+    event_polling_max_events: int = Field(default=100, ge=1)
+    """Maximum number of build events returned by one polling request."""
+    event_replay_buffer_size: int = Field(default=1000, ge=1)
+    """Number of build events kept per polled job, so a client that reconnects can resume from its cursor."""
+    max_concurrent_jobs: int = Field(default=0, ge=0)
+    """Maximum number of flow builds running at once per worker; 0 means no limit. A build above the limit waits up
+    to `job_admission_timeout` seconds for another one to finish and is otherwise rejected with HTTP 429."""
+    job_admission_timeout: float = Field(default=0.0, ge=0)
+    """Seconds a flow build waits for a free slot when `max_concurrent_jobs` builds are running."""
+    finished_job_retention: float = Field(default=300.0, ge=0)
+    """Seconds the events of a finished build are kept for clients that have not read them yet."""
+    max_finished_jobs: int = Field(default=1000, ge=0)
+    """Maximum number of finished builds kept; the oldest are released first."""
+    max_queued_events_per_job: int = Field(default=10000, ge=1)
+    """Number of unread events of a build above which its token events are dropped."""
     lazy_load_components: bool = False
     """If set to True, Axie Studio will only partially load components at startup and fully load them on demand.
     This significantly reduces startup time but may cause a slight delay when a component is first used."""
+    use_component_index: bool = True
+    """If set to True, the templates of the built-in components are stored in an index file and read from it at
+    startup, so unchanged component modules are not imported."""
+    component_index_path: str | None = None
+    """Location of the component index file. Defaults to component_index.json in the config directory."""
+    knowledge_base_stats_reconcile_interval: float = Field(default=300.0, ge=0)
+    """Seconds between two checks for knowledge bases whose stored statistics are out of date. 0 disables the
+    check; statistics are then only updated by ingest and removal, or computed when missing."""
+    prepared_graph_cache_size: int = Field(default=128, ge=0)
+    """Maximum number of prepared flow graphs kept in memory by the run endpoints. Set to 0 to disable the cache."""
+    run_result_cache_size: int = Field(default=1024, ge=0)
+    """Maximum number of run results kept in memory for flows tagged with `run_result_cache_tag`. Repeated
+    identical requests to the run endpoint of such a flow are answered from the cache. Set to 0 to disable it."""
+    run_result_cache_ttl: float = Field(default=300.0, gt=0)
+    """Seconds a cached run result is served."""
+    run_result_cache_tag: str = "cache"
+    """The flow tag that opts a flow in to the run result cache. A request answered from the cache doesn't run the
+    flow, so it stores no chat messages in its session."""
+    run_result_cache_disk_size: int = Field(default=0, ge=0)
+    """Maximum number of run results also kept on disk, in the config directory. Set to 0 to keep them in memory
+    only."""
+    message_write_behind: bool = False
+    """If set to True, stored and updated messages are written to the database in shared batches
+    instead of one commit per message. Reads and deletes of messages flush the pending writes first."""
+    message_flush_interval: float = Field(default=0.05, gt=0)
+    """Seconds a message can wait before its batch is written, if message_write_behind is enabled."""
+    message_flush_batch_size: int = Field(default=100, ge=1)
+    """Number of pending messages that triggers a write, if message_write_behind is enabled."""
+    stream_message_update_interval: float = Field(default=0.0, ge=0)
+    """Seconds between updates of a message in the database while it is streamed. 0 stores it only at the end."""
+    api_key_cache_ttl: float = Field(default=30.0, ge=0)
+    """Seconds a verified API key is trusted without checking the database. Deleting a key or updating its user
+    invalidates it at once in the same process. Set to 0 to check every request against the database."""
+    api_key_usage_flush_interval: float = Field(default=10.0, ge=0)
+    """Seconds API key uses are counted in memory before they are written in one batch.
+    Set to 0 to write every use at once."""
 
     # Starter Projects
     create_starter_projects: bool = True
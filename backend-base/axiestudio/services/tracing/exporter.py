@@ -0,0 +1,135 @@
+"""Run tracer callbacks on a worker thread, off the event loop.
+
+The start and end hooks of the tracers (LangSmith, Langfuse, Phoenix, Opik, ...) may do
+network I/O. :class:`TraceExporter` queues them and a single worker thread runs them in
+batches, in the order they were submitted. Each callback runs in the ``contextvars``
+context of the graph run it belongs to, so tracers relying on context variables (such as
+OpenTelemetry) see the same context as when they ran in the run's own task.
+
+The queue is bounded: when the worker can't keep up, span events are dropped and counted
+instead of growing the queue or slowing down the event loop. Events that end a whole run,
+or a span whose start was queued, are never dropped, so every trace that was started is
+also closed.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from axiestudio.logging import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from contextvars import Context
+
+DEFAULT_MAX_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 100
+
+
+class TraceExporter:
+    """A bounded queue of tracer callbacks drained by a dedicated thread.
+
+    Args:
+        max_queue_size: Number of queued callbacks above which span events are dropped.
+        batch_size: Maximum number of callbacks the worker takes from the queue at once.
+    """
+
+    def __init__(self, max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.max_queue_size = max(1, max_queue_size)
+        self.batch_size = max(1, batch_size)
+        self.submitted = 0
+        self.exported = 0
+        self.dropped = 0
+        self.errors = 0
+        self._pending: deque[tuple[Context, Callable[..., Any], tuple]] = deque()
+        self._condition = threading.Condition()
+        self._closing = False
+        self._overloaded = False
+        self._thread: threading.Thread | None = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker, name="axiestudio-trace-exporter", daemon=True)
+            self._thread.start()
+
+    def submit(self, context: Context, func: Callable[..., Any], args: tuple, *, critical: bool = False) -> bool:
+        """Queue ``func(*args)`` to run in ``context`` on the worker thread.
+
+        Args:
+            context: The context of the graph run the callback belongs to.
+            func: The tracer callback.
+            args: The arguments of the callback.
+            critical: Queue the callback even when the queue is full.
+
+        Returns:
+            Whether the callback was queued; ``False`` if it was dropped.
+        """
+        with self._condition:
+            if self._closing:
+                return False
+            if not critical and len(self._pending) >= self.max_queue_size:
+                self.dropped += 1
+                if not self._overloaded:
+                    self._overloaded = True
+                    logger.warning(
+                        f"Trace export queue is full ({self.max_queue_size} events), dropping trace events "
+                        f"({self.dropped} dropped so far)"
+                    )
+                return False
+            self._ensure_started()
+            self._pending.append((context, func, args))
+            self.submitted += 1
+            self._condition.notify()
+            return True
+
+    def _worker(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closing)
+                if not self._pending:
+                    return
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                if self._overloaded and len(self._pending) < self.max_queue_size // 2:
+                    self._overloaded = False
+            errors = 0
+            for context, func, args in batch:
+                try:
+                    context.run(func, *args)
+                except Exception:  # noqa: BLE001
+                    errors += 1
+                    logger.exception("Error processing trace_func")
+            with self._condition:
+                self.exported += len(batch) - errors
+                self.errors += errors
+                self._condition.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until the callbacks queued so far have run.
+
+        Returns:
+            Whether they all ran before ``timeout`` seconds.
+        """
+        with self._condition:
+            target = self.submitted
+            return self._condition.wait_for(lambda: self.exported + self.errors >= target, timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Run the queued callbacks and stop the worker thread, waiting at most ``timeout`` seconds."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(f"Trace exporter did not finish within {timeout} seconds, {len(self._pending)} lost")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": len(self._pending),
+            "submitted": self.submitted,
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
@@ -4,12 +4,13 @@ import asyncio
 import os
 from collections import defaultdict
 from contextlib import asynccontextmanager
-from contextvars import ContextVar
+from contextvars import Context, ContextVar, copy_context
 from typing import TYPE_CHECKING, Any
 
 from axiestudio.logging import logger
 
 from axiestudio.services.base import Service
+from axiestudio.services.tracing.exporter import TraceExporter
 
 if TYPE_CHECKING:
     from uuid import UUID
@@ -75,9 +76,10 @@ class TraceContext:
         self.all_inputs: dict[str, dict] = defaultdict(dict)
         self.all_outputs: dict[str, dict] = defaultdict(dict)
 
-        self.traces_queue: asyncio.Queue = asyncio.Queue()
-        self.running = False
-        self.worker_task: asyncio.Task | None = None
+        self.sampled = True
+        self.context: Context | None = None
+        # Component traces whose start was dropped by the exporter; their end is dropped too
+        self.dropped_traces: set[str] = set()
 
 
 class ComponentTraceContext:
@@ -119,26 +121,30 @@ class TracingService(Service):
 
     def __init__(self, settings_service: SettingsService):
         self.settings_service = settings_service
-        self.deactivated = self.settings_service.settings.deactivate_tracing
+        settings = self.settings_service.settings
+        self.deactivated = settings.deactivate_tracing
+        self.sample_rate = settings.tracing_sample_rate
+        self.sampled_out = 0
+        self.exporter = TraceExporter(
+            max_queue_size=settings.tracing_max_queue_size,
+            batch_size=settings.tracing_batch_size,
+        )
 
-    async def _trace_worker(self, trace_context: TraceContext) -> None:
-        while trace_context.running or not trace_context.traces_queue.empty():
-            trace_func, args = await trace_context.traces_queue.get()
-            try:
-                trace_func(*args)
-            except Exception:  # noqa: BLE001
-                logger.exception("Error processing trace_func")
-            finally:
-                trace_context.traces_queue.task_done()
+    def _should_sample(self, run_id: UUID | None) -> bool:
+        # Decided once per run from its id, so every span of a run is either kept or dropped
+        if self.sample_rate >= 1:
+            return True
+        if self.sample_rate <= 0 or run_id is None:
+            return False
+        return run_id.int % 10_000 < self.sample_rate * 10_000
 
-    async def _start(self, trace_context: TraceContext) -> None:
-        if trace_context.running or self.deactivated:
-            return
-        try:
-            trace_context.running = True
-            trace_context.worker_task = asyncio.create_task(self._trace_worker(trace_context))
-        except Exception:  # noqa: BLE001
-            logger.exception("Error starting tracing service")
+    def _submit(self, trace_context: TraceContext, trace_func, args: tuple, *, critical: bool = False) -> bool:
+        context = trace_context.context or copy_context()
+        return self.exporter.submit(context, trace_func, args, critical=critical)
+
+    def stats(self) -> dict[str, int]:
+        """Counters of the trace pipeline: queued, exported, dropped and sampled out events."""
+        return {**self.exporter.stats(), "sampled_out": self.sampled_out}
 
     def _initialize_langsmith_tracer(self, trace_context: TraceContext) -> None:
         langsmith_tracer = _get_langsmith_tracer()
@@ -212,7 +218,7 @@ class TracingService(Service):
         """Start a trace for a graph run.
 
         - create a trace context
-        - start a worker for this trace context
+        - decide whether the run is sampled; an unsampled run gets no tracers
         - initialize the tracers
         """
         if self.deactivated:
@@ -221,36 +227,35 @@ class TracingService(Service):
             project_name = project_name or os.getenv("LANGCHAIN_PROJECT", "Axie Studio")
             trace_context = TraceContext(run_id, run_name, project_name, user_id, session_id)
             trace_context_var.set(trace_context)
-            await self._start(trace_context)
+            if not self._should_sample(run_id):
+                trace_context.sampled = False
+                self.sampled_out += 1
+                return
             self._initialize_langsmith_tracer(trace_context)
             self._initialize_langwatch_tracer(trace_context)
             self._initialize_langfuse_tracer(trace_context)
             self._initialize_arize_phoenix_tracer(trace_context)
             self._initialize_opik_tracer(trace_context)
+            # Tracer callbacks run on the exporter thread, in the context the run started with
+            trace_context.context = copy_context()
         except Exception as e:  # noqa: BLE001
             logger.debug(f"Error initializing tracers: {e}")
 
-    async def _stop(self, trace_context: TraceContext) -> None:
-        try:
-            trace_context.running = False
-            # check the qeue is empty
-            if not trace_context.traces_queue.empty():
-                await trace_context.traces_queue.join()
-            if trace_context.worker_task:
-                trace_context.worker_task.cancel()
-                trace_context.worker_task = None
-
-        except Exception:  # noqa: BLE001
-            logger.exception("Error stopping tracing service")
-
-    def _end_all_tracers(self, trace_context: TraceContext, outputs: dict, error: Exception | None = None) -> None:
+    def _end_all_tracers(
+        self,
+        trace_context: TraceContext,
+        all_inputs: dict[str, dict],
+        all_outputs: dict[str, dict],
+        outputs: dict,
+        error: Exception | None = None,
+    ) -> None:
         for tracer in trace_context.tracers.values():
             if tracer.ready:
                 try:
                     # why all_inputs and all_outputs? why metadata=outputs?
                     tracer.end(
-                        trace_context.all_inputs,
-                        outputs=trace_context.all_outputs,
+                        all_inputs,
+                        outputs=all_outputs,
                         error=error,
                         metadata=outputs,
                     )
@@ -260,8 +265,7 @@ class TracingService(Service):
     async def end_tracers(self, outputs: dict, error: Exception | None = None) -> None:
         """End the trace for a graph run.
 
-        - stop worker for current trace_context
-        - call end for all the tracers
+        - queue the end of all the tracers after the component traces of the run
         """
         if self.deactivated:
             return
@@ -269,8 +273,17 @@ class TracingService(Service):
         if trace_context is None:
             msg = "called end_tracers but no trace context found"
             raise RuntimeError(msg)
-        await self._stop(trace_context)
-        self._end_all_tracers(trace_context, outputs, error)
+        if not trace_context.sampled:
+            return
+        # The callback runs later on the exporter thread, so it gets copies of what the run collected
+        all_inputs = {name: dict(values) for name, values in trace_context.all_inputs.items()}
+        all_outputs = {name: dict(values) for name, values in trace_context.all_outputs.items()}
+        self._submit(
+            trace_context,
+            self._end_all_tracers,
+            (trace_context, all_inputs, all_outputs, outputs, error),
+            critical=True,
+        )
 
     @staticmethod
     def _cleanup_inputs(inputs: dict[str, Any]):
@@ -285,9 +298,7 @@ class TracingService(Service):
         component_trace_context: ComponentTraceContext,
         trace_context: TraceContext,
     ) -> None:
-        inputs = self._cleanup_inputs(component_trace_context.inputs)
-        component_trace_context.inputs = inputs
-        component_trace_context.inputs_metadata = component_trace_context.inputs_metadata or {}
+        inputs = component_trace_context.inputs
         for tracer in trace_context.tracers.values():
             if not tracer.ready:
                 continue
@@ -307,6 +318,8 @@ class TracingService(Service):
         self,
         component_trace_context: ComponentTraceContext,
         trace_context: TraceContext,
+        outputs: dict[str, Any],
+        logs: list[Log | dict[Any, Any]],
         error: Exception | None = None,
     ) -> None:
         for tracer in trace_context.tracers.values():
@@ -315,9 +328,9 @@ class TracingService(Service):
                     tracer.end_trace(
                         trace_id=component_trace_context.trace_id,
                         trace_name=component_trace_context.trace_name,
-                        outputs=trace_context.all_outputs[component_trace_context.trace_name],
+                        outputs=outputs,
                         error=error,
-                        logs=component_trace_context.logs[component_trace_context.trace_name],
+                        logs=logs,
                     )
                 except Exception:  # noqa: BLE001
                     logger.exception(f"Error ending trace {component_trace_context.trace_name}")
@@ -353,18 +366,40 @@ class TracingService(Service):
             msg = "called trace_component but no trace context found"
             raise RuntimeError(msg)
         trace_context.all_inputs[trace_name] |= inputs or {}
-        await trace_context.traces_queue.put((self._start_component_traces, (component_trace_context, trace_context)))
+        if not trace_context.sampled:
+            yield self
+            return
+        component_trace_context.inputs = self._cleanup_inputs(inputs or {})
+        if not self._submit(trace_context, self._start_component_traces, (component_trace_context, trace_context)):
+            trace_context.dropped_traces.add(trace_id)
         try:
             yield self
         except Exception as e:
-            await trace_context.traces_queue.put(
-                (self._end_component_traces, (component_trace_context, trace_context, e))
-            )
+            self._submit_component_end(component_trace_context, trace_context, e)
             raise
         else:
-            await trace_context.traces_queue.put(
-                (self._end_component_traces, (component_trace_context, trace_context, None))
-            )
+            self._submit_component_end(component_trace_context, trace_context, None)
+
+    def _submit_component_end(
+        self,
+        component_trace_context: ComponentTraceContext,
+        trace_context: TraceContext,
+        error: Exception | None,
+    ) -> None:
+        # A component trace is dropped as a whole: its end is queued if and only if its start was
+        trace_id = component_trace_context.trace_id
+        if trace_id in trace_context.dropped_traces:
+            trace_context.dropped_traces.discard(trace_id)
+            return
+        trace_name = component_trace_context.trace_name
+        outputs = dict(trace_context.all_outputs[trace_name])
+        logs = list(component_trace_context.logs[trace_name])
+        self._submit(
+            trace_context,
+            self._end_component_traces,
+            (component_trace_context, trace_context, outputs, logs, error),
+            critical=True,
+        )
 
     @property
     def project_name(self):
@@ -429,3 +464,6 @@ class TracingService(Service):
             if langchain_callback:
                 callbacks.append(langchain_callback)
         return callbacks
+
+    async def teardown(self) -> None:
+        await asyncio.to_thread(self.exporter.close, 10.0)
@@ -8,6 +8,7 @@ from axiestudio.logging import logger
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from axiestudio.services.database.models.api_key.cache import invalidate_user_api_keys
 from axiestudio.services.database.models.user.model import User
 from axiestudio.services.database.models.user.crud import get_user_by_id
 try:
@@ -204,6 +205,7 @@ class TrialService:
             user.subscription_status = "expired"
             
             await session.commit()
+            invalidate_user_api_keys(user.id)
             logger.info(f"Successfully deactivated expired user: {user.username}")
             return True
             
@@ -124,6 +124,11 @@ async def teardown_superuser(settings_service, session: AsyncSession) -> None:
 
 async def teardown_services() -> None:
     """Teardown all the services."""
+    from axiestudio.memory import close_message_sink
+    from axiestudio.services.database.models.api_key.cache import close_api_key_usage_tracker
+
+    await close_message_sink()
+    await close_api_key_usage_tracker()
     async with get_db_service().with_session() as session:
         await teardown_superuser(get_settings_service(), session)
 
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 from axiestudio.logging import logger
-from sqlmodel import select
+from sqlmodel import col, select
 from typing_extensions import override
 
 from axiestudio.services.auth import utils as auth_utils
@@ -15,7 +18,7 @@ from axiestudio.services.variable.base import VariableService
 from axiestudio.services.variable.constants import CREDENTIAL_TYPE, GENERIC_TYPE
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Sequence
     from uuid import UUID
 
     from sqlmodel.ext.asyncio.session import AsyncSession
@@ -23,9 +26,58 @@ if TYPE_CHECKING:
     from axiestudio.services.settings.service import SettingsService
 
 
+class _CachedVariable(NamedTuple):
+    type: str | None
+    value: str
+    expires_at: float
+
+
+class _VariableCache:
+    """Short-lived cache of decrypted variables, keyed by user id and variable name.
+
+    Every change to a user's variables through the service drops all of that user's entries.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 10_000) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple[str, str], _CachedVariable] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: UUID | str, name: str) -> _CachedVariable | None:
+        if self.ttl <= 0:
+            return None
+        key = (str(user_id), name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry
+
+    def put(self, user_id: UUID | str, name: str, type_: str | None, value: str) -> None:
+        if self.ttl <= 0:
+            return
+        key = (str(user_id), name)
+        with self._lock:
+            self._entries[key] = _CachedVariable(type_, value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: UUID | str) -> None:
+        user_id = str(user_id)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+
 class DatabaseVariableService(VariableService, Service):
     def __init__(self, settings_service: SettingsService):
         self.settings_service = settings_service
+        self._cache = _VariableCache(ttl=settings_service.settings.variable_cache_ttl)
 
     async def initialize_user_variables(self, user_id: UUID | str, session: AsyncSession) -> None:
         if not self.settings_service.settings.store_environment_variables:
@@ -60,24 +112,49 @@ class DatabaseVariableService(VariableService, Service):
         field: str,
         session: AsyncSession,
     ) -> str:
-        # we get the credential from the database
-        # credential = session.query(Variable).filter(Variable.user_id == user_id, Variable.name == name).first()
-        stmt = select(Variable).where(Variable.user_id == user_id, Variable.name == name)
-        variable = (await session.exec(stmt)).first()
+        cached = self._cache.get(user_id, name)
+        if cached is None:
+            # we get the credential from the database
+            stmt = select(Variable).where(Variable.user_id == user_id, Variable.name == name)
+            variable = (await session.exec(stmt)).first()
 
-        if not variable or not variable.value:
-            msg = f"{name} variable not found."
-            raise ValueError(msg)
+            if not variable or not variable.value:
+                msg = f"{name} variable not found."
+                raise ValueError(msg)
+            cached = self._decrypt_and_cache(user_id, variable)
 
-        if variable.type == CREDENTIAL_TYPE and field == "session_id":
+        if cached.type == CREDENTIAL_TYPE and field == "session_id":
             msg = (
                 f"variable {name} of type 'Credential' cannot be used in a Session ID field "
                 "because its purpose is to prevent the exposure of values."
             )
             raise TypeError(msg)
 
+        return cached.value
+
+    async def prefetch_variables(self, user_id: UUID | str, names: Iterable[str], session: AsyncSession) -> None:
+        """Load the given variables of a user with one query, so that ``get_variable`` finds them cached.
+
+        Names that are already cached, unknown or empty are skipped; ``get_variable`` reports them as usual.
+        """
+        names = {name for name in names if self._cache.get(user_id, name) is None}
+        if not names or self._cache.ttl <= 0:
+            return
+        stmt = select(Variable).where(Variable.user_id == user_id, col(Variable.name).in_(names))
+        for variable in (await session.exec(stmt)).all():
+            if not variable.value:
+                continue
+            try:
+                self._decrypt_and_cache(user_id, variable)
+            except Exception:  # noqa: BLE001
+                # get_variable raises the error when the variable is actually used
+                logger.debug(f"Could not decrypt variable '{variable.name}' while prefetching")
+
+    def _decrypt_and_cache(self, user_id: UUID | str, variable: Variable) -> _CachedVariable:
         # we decrypt the value
-        return auth_utils.decrypt_api_key(variable.value, settings_service=self.settings_service)
+        value = auth_utils.decrypt_api_key(variable.value, settings_service=self.settings_service)
+        self._cache.put(user_id, variable.name, variable.type, value)
+        return _CachedVariable(variable.type, value, 0.0)
 
     async def get_all(self, user_id: UUID | str, session: AsyncSession) -> list[VariableRead]:
         stmt = select(Variable).where(Variable.user_id == user_id)
@@ -132,6 +209,7 @@ class DatabaseVariableService(VariableService, Service):
         variable.value = encrypted
         session.add(variable)
         await session.commit()
+        self._cache.invalidate_user(user_id)
         await session.refresh(variable)
         return variable
 
@@ -156,6 +234,7 @@ class DatabaseVariableService(VariableService, Service):
 
         session.add(db_variable)
         await session.commit()
+        self._cache.invalidate_user(user_id)
         await session.refresh(db_variable)
         return db_variable
 
@@ -173,6 +252,7 @@ class DatabaseVariableService(VariableService, Service):
             raise ValueError(msg)
         await session.delete(variable)
         await session.commit()
+        self._cache.invalidate_user(user_id)
 
     @override
     async def delete_variable_by_id(self, user_id: UUID | str, variable_id: UUID, session: AsyncSession) -> None:
@@ -183,6 +263,7 @@ class DatabaseVariableService(VariableService, Service):
             raise ValueError(msg)
         await session.delete(variable)
         await session.commit()
+        self._cache.invalidate_user(user_id)
 
     async def create_variable(
         self,
@@ -203,5 +284,6 @@ class DatabaseVariableService(VariableService, Service):
         variable = Variable.model_validate(variable_base, from_attributes=True, update={"user_id": user_id})
         session.add(variable)
         await session.commit()
+        self._cache.invalidate_user(user_id)
         await session.refresh(variable)
         return variable
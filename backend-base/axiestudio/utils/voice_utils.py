@@ -1,6 +1,7 @@
 import asyncio
 import base64
 from pathlib import Path
+from typing import Protocol
 
 import numpy as np
 from scipy.signal import resample
@@ -44,6 +45,102 @@ def resample_24k_to_16k(frame_24k_bytes):
     return frame_16k.tobytes()
 
 
+class PolyphaseResampler:
+    """Streaming rational resampler (``up/down``) with a polyphase windowed-sinc FIR filter.
+
+    Unlike :func:`resample_24k_to_16k`, the filter history is kept across calls, so audio
+    can be fed in chunks of any size, even splitting a sample, without artefacts at the
+    chunk boundaries. Each call is a handful of vectorised NumPy operations.
+
+    The output lags the input by the filter delay, about ``taps_per_phase / 2`` input samples.
+
+    Args:
+        up: Upsampling factor.
+        down: Downsampling factor.
+        taps_per_phase: Filter taps per polyphase branch; more taps give a sharper cutoff.
+    """
+
+    def __init__(self, up: int = 2, down: int = 3, taps_per_phase: int = 16) -> None:
+        self.up = up
+        self.down = down
+        self.taps_per_phase = taps_per_phase
+        num_taps = up * taps_per_phase
+        # Low-pass at the lower of the two Nyquist frequencies, with some room for the transition band
+        cutoff = 0.9 / (2 * max(up, down))
+        n = np.arange(num_taps) - (num_taps - 1) / 2
+        taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(num_taps, 5.0)
+        taps *= up / taps.sum()
+        # Output r of each group of `up` outputs is branch (down * r) % up of the filter, applied to the input
+        # starting (down * r) // up samples into the group's window. Each branch is stored reversed, in its
+        # column of the kernel at that offset, so a whole group is one row of windows times the kernel.
+        offsets = [(down * r) // up for r in range(up)]
+        self._window = offsets[-1] + taps_per_phase
+        self._kernel = np.zeros((self._window, up))
+        for r, offset in enumerate(offsets):
+            self._kernel[offset : offset + taps_per_phase, r] = taps[(down * r) % up :: up][::-1]
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the filter history, e.g. when a new stream starts."""
+        # The input the next group of outputs starts at, preceded by silence at the start of the stream
+        self._history = np.zeros(self.taps_per_phase - 1)
+        self._partial = b""
+
+    def process(self, chunk: bytes) -> bytes:
+        """Resample a chunk of 16-bit little-endian mono PCM and return the PCM resampled so far."""
+        if self._partial:
+            chunk = self._partial + chunk
+        usable = len(chunk) - len(chunk) % BYTES_PER_SAMPLE
+        self._partial = bytes(chunk[usable:])
+        history = np.concatenate((self._history, np.frombuffer(chunk, dtype="<i2", count=usable // BYTES_PER_SAMPLE)))
+
+        groups = (len(history) - self._window) // self.down + 1
+        if groups <= 0:
+            self._history = history
+            return b""
+        # Group j reads history[j * down : j * down + window]; a strided view, nothing is copied
+        itemsize = history.itemsize
+        windows = np.ndarray((groups, self._window), history.dtype, history, strides=(self.down * itemsize, itemsize))
+        output = np.dot(windows, self._kernel)
+        self._history = history[groups * self.down :]
+        output.clip(-32768, 32767, out=output)
+        return np.rint(output, out=output).astype("<i2").tobytes()
+
+
+class _VadLike(Protocol):
+    def is_speech(self, buf: bytes, sample_rate: int) -> bool: ...
+
+
+class SpeechDetector:
+    """Resamples a 24kHz PCM stream to 16kHz and runs voice activity detection on its 20ms frames.
+
+    :meth:`process` is synchronous and keeps no reference to the event loop, so a session
+    can run it in a worker thread with ``asyncio.to_thread``. One detector per stream; it is
+    not safe to share one between concurrent calls.
+
+    Args:
+        vad: A ``webrtcvad.Vad`` (or anything with the same ``is_speech`` method).
+    """
+
+    def __init__(self, vad: _VadLike) -> None:
+        self.vad = vad
+        self.resampler = PolyphaseResampler(up=2, down=3)
+        self._buffer = bytearray()
+
+    def process(self, chunk_24k: bytes) -> bool:
+        """Feed a chunk of 24kHz audio of any size and tell whether any complete frame contains speech."""
+        self._buffer.extend(self.resampler.process(chunk_24k))
+        has_speech = False
+        while len(self._buffer) >= BYTES_PER_16K_FRAME:
+            frame_16k = bytes(self._buffer[:BYTES_PER_16K_FRAME])
+            del self._buffer[:BYTES_PER_16K_FRAME]
+            try:
+                has_speech = self.vad.is_speech(frame_16k, VAD_SAMPLE_RATE_16K) or has_speech
+            except Exception as e:  # noqa: BLE001
+                logger.error(f"[ERROR] VAD processing failed: {e}")
+        return has_speech
+
+
 # def resample_24k_to_16k(frame_24k_bytes: bytes) -> bytes:
 #    """
 #    Convert one 20ms chunk (960 bytes @ 24kHz) to 20ms @ 16kHz (640 bytes).
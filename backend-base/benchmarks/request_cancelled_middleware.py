@@ -0,0 +1,130 @@
+"""Compare the event-loop CPU cost of disconnect detection in ``RequestCancelledMiddleware``.
+
+The previous middleware was a ``BaseHTTPMiddleware`` that polled ``request.is_disconnected()``
+every 100 ms in a second task for each request. The current one is a pure ASGI middleware
+whose watcher task sleeps until the server reports ``http.disconnect``.
+
+This script holds ``--concurrency`` slow requests in flight for ``--hold`` seconds against
+an in-process Starlette app, once without middleware, once with the polling middleware and
+once with the current one, and reports the CPU time the process used meanwhile. Requests
+are driven through the ASGI interface directly, so the numbers contain no network or
+server overhead.
+
+Usage::
+
+    python benchmarks/request_cancelled_middleware.py [--concurrency N] [--hold SECONDS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+from axiestudio.middleware import RequestCancelledMiddleware
+
+if TYPE_CHECKING:
+    from starlette.requests import Request
+
+
+class PollingRequestCancelledMiddleware(BaseHTTPMiddleware):
+    """The previous implementation, kept here as the baseline."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        sentinel = object()
+
+        async def cancel_handler():
+            while True:
+                if await request.is_disconnected():
+                    return sentinel
+                await asyncio.sleep(0.1)
+
+        handler_task = asyncio.create_task(call_next(request))
+        cancel_task = asyncio.create_task(cancel_handler())
+
+        done, pending = await asyncio.wait([handler_task, cancel_task], return_when=asyncio.FIRST_COMPLETED)
+
+        for task in pending:
+            task.cancel()
+
+        if cancel_task in done:
+            return Response("Request was cancelled", status_code=499)
+        return await handler_task
+
+
+def _build_app(hold: float):
+    async def slow(_request: Request) -> Response:
+        await asyncio.sleep(hold)
+        return PlainTextResponse("ok")
+
+    return Starlette(routes=[Route("/slow", slow)])
+
+
+async def _request(app) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/slow",
+        "raw_path": b"/slow",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("benchmark", 80),
+    }
+    response_complete = asyncio.Event()
+    body_sent = False
+
+    # Like an ASGI server: the request body first, then block until the connection ends
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            response_complete.set()
+
+    await app(scope, receive, send)
+
+
+async def _measure(app, concurrency: int) -> tuple[float, float]:
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(_request(app) for _ in range(concurrency)))
+    return time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=2000, help="Requests in flight at the same time")
+    parser.add_argument("--hold", type=float, default=5.0, help="Seconds each request takes")
+    args = parser.parse_args()
+
+    variants = {
+        "no middleware": _build_app(args.hold),
+        "polling": PollingRequestCancelledMiddleware(_build_app(args.hold)),
+        "event-driven": RequestCancelledMiddleware(_build_app(args.hold)),
+    }
+    print(f"{args.concurrency} concurrent requests, {args.hold:.1f}s each")  # noqa: T201
+    for name, app in variants.items():
+        cpu, wall = asyncio.run(_measure(app, args.concurrency))
+        print(  # noqa: T201
+            f"{name:>14}: cpu {cpu:7.3f} s  wall {wall:6.2f} s  "
+            f"event-loop load {cpu / wall:6.1%}  cpu/request {cpu / args.concurrency * 1000:7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
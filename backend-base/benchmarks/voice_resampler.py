@@ -0,0 +1,90 @@
+"""Compare the cost of resampling voice-mode audio for VAD, per frame and per session.
+
+Voice mode resampled each 20 ms frame of 24kHz audio to 16kHz on its own with
+``resample_24k_to_16k`` (an FFT per frame). It now streams the audio through a
+``PolyphaseResampler`` that keeps its filter state across chunks.
+
+This script feeds ``--seconds`` of noisy tone through both, frame by frame, and reports
+frames per second and the CPU cost of one voice session: the share of a core needed to
+keep up with one real-time stream, and the number of concurrent sessions one core can
+resample. The streaming resampler also takes chunks of ``--chunk-ms`` (the voice session
+passes on whatever audio queued up while the previous chunk was processed). With ``--vad``
+(needs ``webrtcvad``), the streaming numbers include the VAD of ``SpeechDetector``.
+
+Usage::
+
+    python benchmarks/voice_resampler.py [--seconds N] [--chunk-ms MS] [--vad]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+from axiestudio.utils.voice_utils import (
+    BYTES_PER_24K_FRAME,
+    FRAME_DURATION_MS,
+    SAMPLE_RATE_24K,
+    PolyphaseResampler,
+    SpeechDetector,
+    resample_24k_to_16k,
+)
+
+
+def _audio(seconds: float) -> bytes:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(SAMPLE_RATE_24K * seconds)) / SAMPLE_RATE_24K
+    signal = 6000 * np.sin(2 * np.pi * 440 * t) + rng.normal(0, 500, t.size)
+    return signal.astype("<i2").tobytes()
+
+
+def _chunks(audio: bytes, size: int) -> list[bytes]:
+    return [audio[i : i + size] for i in range(0, len(audio) - size + 1, size)]
+
+
+def _cpu_time(process, chunks: list[bytes]) -> float:
+    start = time.process_time()
+    for chunk in chunks:
+        process(chunk)
+    return time.process_time() - start
+
+
+def _report(name: str, cpu: float, frame_count: int) -> None:
+    audio_seconds = frame_count * FRAME_DURATION_MS / 1000
+    load = cpu / audio_seconds
+    print(  # noqa: T201
+        f"{name:>22}: {frame_count / cpu:10.0f} frames/s  {cpu / frame_count * 1e6:7.1f} us/frame  "
+        f"{load:7.3%} of a core per session  {1 / load:8.0f} sessions per core"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60.0, help="Seconds of audio to resample")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Chunk size for the streaming resampler")
+    parser.add_argument("--vad", action="store_true", help="Include webrtcvad in the streaming numbers")
+    args = parser.parse_args()
+
+    audio = _audio(args.seconds)
+    frames = _chunks(audio, BYTES_PER_24K_FRAME)
+    chunks = _chunks(audio, BYTES_PER_24K_FRAME * max(1, args.chunk_ms // FRAME_DURATION_MS))
+    print(f"{len(frames)} frames of {FRAME_DURATION_MS} ms at {SAMPLE_RATE_24K} Hz")  # noqa: T201
+    _report("FFT per frame", _cpu_time(resample_24k_to_16k, frames), len(frames))
+    _report("streaming, 20 ms", _cpu_time(PolyphaseResampler().process, frames), len(frames))
+    _report(f"streaming, {args.chunk_ms} ms", _cpu_time(PolyphaseResampler().process, chunks), len(frames))
+    if args.vad:
+        if webrtcvad is None:
+            parser.error("--vad needs the webrtcvad package")
+        detector = SpeechDetector(webrtcvad.Vad(mode=3))
+        _report("streaming + VAD, 20 ms", _cpu_time(detector.process, frames), len(frames))
+
+
+if __name__ == "__main__":
+    main()
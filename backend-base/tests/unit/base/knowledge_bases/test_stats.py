@@ -0,0 +1,131 @@
+import pytest
+
+from axiestudio.base.knowledge_bases import stats
+from axiestudio.base.knowledge_bases.stats import (
+    STATS_FILE_NAME,
+    delete_kb,
+    get_kb_stats,
+    read_kb_stats,
+    reconcile_kb_stats,
+    record_ingest,
+    record_removal,
+)
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Replace the scan of the Chroma collection, recording the knowledge bases it was run on."""
+    scanned = []
+
+    def get_kb_metadata(kb_path):
+        scanned.append(kb_path.name)
+        return {
+            "chunks": 2,
+            "words": 5,
+            "characters": 20,
+            "avg_chunk_size": 10.0,
+            "embedding_provider": "Chroma",
+            "embedding_model": "model",
+        }
+
+    monkeypatch.setattr(stats, "get_kb_metadata", get_kb_metadata)
+    return scanned
+
+
+def _kb(root, name="kb"):
+    kb_path = root / "user" / name
+    kb_path.mkdir(parents=True)
+    (kb_path / "chroma.sqlite3").write_bytes(b"data")
+    return kb_path
+
+
+def test_stats_are_computed_once_and_stored(tmp_path, scans):
+    kb_path = _kb(tmp_path)
+
+    first = get_kb_stats(kb_path)
+    second = get_kb_stats(kb_path)
+
+    assert scans == ["kb"]
+    assert (kb_path / STATS_FILE_NAME).exists()
+    assert first.chunks == second.chunks == 2
+    assert second.embedding_model == "model"
+    assert second.size == len(b"data")
+    assert second.avg_chunk_size == 10.0
+
+
+def test_missing_stats_file_reads_as_none(tmp_path):
+    assert read_kb_stats(_kb(tmp_path)) is None
+
+
+@pytest.mark.parametrize("content", ["not json", '{"chunks": "many"}', '{"version": 999}'])
+def test_corrupt_stats_file_is_recomputed(tmp_path, scans, content):
+    kb_path = _kb(tmp_path)
+    (kb_path / STATS_FILE_NAME).write_text(content, encoding="utf-8")
+
+    assert read_kb_stats(kb_path) is None
+    assert get_kb_stats(kb_path).chunks == 2
+    assert scans == ["kb"]
+    assert read_kb_stats(kb_path) is not None
+
+
+def test_record_ingest_adds_chunks_without_a_scan(tmp_path, scans):
+    kb_path = _kb(tmp_path)
+    get_kb_stats(kb_path)
+
+    updated = record_ingest(kb_path, ["one two", "three"], embedding_model="other")
+
+    assert scans == ["kb"]
+    assert (updated.chunks, updated.words, updated.characters) == (4, 8, 32)
+    assert updated.embedding_model == "other"
+    assert read_kb_stats(kb_path) == updated
+
+
+def test_record_removal_subtracts_chunks_and_stops_at_zero(tmp_path, scans):
+    kb_path = _kb(tmp_path)
+    get_kb_stats(kb_path)
+
+    updated = record_removal(kb_path, ["one two", "three", "four"])
+
+    assert scans == ["kb"]
+    assert (updated.chunks, updated.words, updated.characters) == (0, 1, 4)
+
+
+def test_record_without_stored_stats_scans_instead(tmp_path, scans):
+    kb_path = _kb(tmp_path)
+
+    updated = record_ingest(kb_path, ["one"])
+
+    assert scans == ["kb"]
+    assert updated.chunks == 2
+
+
+def test_reconcile_recomputes_only_knowledge_bases_that_changed(tmp_path, scans):
+    changed, unchanged = _kb(tmp_path, "changed"), _kb(tmp_path, "unchanged")
+    get_kb_stats(changed)
+    get_kb_stats(unchanged)
+    scans.clear()
+
+    (changed / "chroma.sqlite3").write_bytes(b"more data")
+
+    assert reconcile_kb_stats(tmp_path) == 1
+    assert scans == ["changed"]
+    assert read_kb_stats(changed).fingerprint == stats.kb_fingerprint(changed)
+    assert reconcile_kb_stats(tmp_path) == 0
+
+
+def test_reconcile_computes_missing_stats(tmp_path, scans):
+    _kb(tmp_path)
+
+    assert reconcile_kb_stats(tmp_path) == 1
+    assert scans == ["kb"]
+
+
+def test_delete_kb_removes_the_directory_and_its_lock(tmp_path, scans):
+    kb_path = _kb(tmp_path)
+    get_kb_stats(kb_path)
+
+    delete_kb(kb_path)
+
+    assert not kb_path.exists()
+    assert kb_path.resolve() not in stats._locks
+    assert scans == ["kb"]
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from axiestudio.initial_setup import flow_sync
+from axiestudio.initial_setup.flow_sync import FlowFileSync, notify_flow_path
+from axiestudio.services.database.models.flow.model import Flow
+
+
+class FakeDatabase:
+    """Stands in for the database behind ``session_scope``; a session commits when its scope exits."""
+
+    def __init__(self) -> None:
+        self.flows: dict = {}
+        self.commits = 0
+        self.committed: asyncio.Queue[int] = asyncio.Queue()
+
+    @asynccontextmanager
+    async def session_scope(self):
+        session = FakeSession(self)
+        yield session
+        if session.added:
+            self.commits += 1
+            self.committed.put_nowait(self.commits)
+
+
+class FakeResult:
+    def __init__(self, rows) -> None:
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, database: FakeDatabase) -> None:
+        self.database = database
+        self.added: list[Flow] = []
+
+    async def exec(self, statement):
+        flows = self.database.flows.values()
+        if [column["name"] for column in statement.column_descriptions] == ["id", "fs_path"]:
+            return FakeResult([(flow.id, flow.fs_path) for flow in flows if flow.fs_path])
+        return FakeResult(list(flows))
+
+    def add(self, flow):
+        self.added.append(flow)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(flow_sync, "session_scope", database.session_scope)
+    return database
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    graph_cache = MagicMock()
+    run_cache = MagicMock()
+    monkeypatch.setattr(flow_sync, "get_prepared_graph_cache", lambda: graph_cache)
+    monkeypatch.setattr(flow_sync, "get_run_result_cache", lambda: run_cache)
+    return graph_cache, run_cache
+
+
+def _write(path, **data):
+    path.write_text(json.dumps(data))
+    # Give each write its own modification time, whatever the file system's resolution
+    mtime = path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+
+
+def _add_flow(database, path, **data):
+    flow = Flow(id=uuid4(), name="flow", data={"nodes": []}, fs_path=str(path) if path else None, **data)
+    database.flows[flow.id] = flow
+    return flow
+
+
+async def test_refresh_reads_the_file_backed_flows(tmp_path, database):
+    flow = _add_flow(database, tmp_path / "flow.json")
+    _add_flow(database, None)
+    sync = FlowFileSync(use_watcher=False)
+
+    await sync.refresh()
+
+    assert sync.flows_by_path == {(tmp_path / "flow.json").resolve(): {flow.id}}
+    assert sync._paths_changed.is_set()
+
+
+async def test_sync_writes_changed_files_in_one_commit(tmp_path, database, caches):
+    first = _add_flow(database, tmp_path / "first.json")
+    second = _add_flow(database, tmp_path / "second.json")
+    _write(tmp_path / "first.json", name="First", data={"nodes": [{"id": "a"}]})
+    _write(tmp_path / "second.json", name="Second")
+    sync = FlowFileSync(use_watcher=False)
+    await sync.refresh()
+
+    assert await sync.sync(sync.flows_by_path) == 2
+
+    assert database.commits == 1
+    assert (first.name, first.data, second.name) == ("First", {"nodes": [{"id": "a"}]}, "Second")
+    graph_cache, run_cache = caches
+    assert {call.args[0] for call in graph_cache.invalidate.call_args_list} == {str(first.id), str(second.id)}
+    assert {call.args[0] for call in run_cache.forget_flow.call_args_list} == {str(first.id), str(second.id)}
+
+
+@pytest.mark.usefixtures("caches")
+async def test_sync_skips_files_whose_mtime_did_not_change(tmp_path, database):
+    flow = _add_flow(database, tmp_path / "flow.json")
+    _write(tmp_path / "flow.json", name="First")
+    sync = FlowFileSync(use_watcher=False)
+    await sync.refresh()
+    await sync.sync(sync.flows_by_path)
+
+    # Same content under the same modification time: the file is not read again
+    flow.name = "Changed in the database"
+    assert await sync.sync(sync.flows_by_path) == 0
+    assert (flow.name, sync.synced_files, database.commits) == ("Changed in the database", 1, 1)
+
+    _write(tmp_path / "flow.json", name="Second")
+    assert await sync.sync(sync.flows_by_path) == 1
+    assert flow.name == "Second"
+
+
+@pytest.mark.usefixtures("caches")
+async def test_polling_picks_up_changes(tmp_path, database):
+    flow = _add_flow(database, tmp_path / "flow.json")
+    _write(tmp_path / "flow.json", name="First")
+    sync = FlowFileSync(use_watcher=False, poll_interval=0.01)
+    task = asyncio.create_task(sync.run())
+    try:
+        async with asyncio.timeout(5):
+            await database.committed.get()
+            assert flow.name == "First"
+            _write(tmp_path / "flow.json", name="Second")
+            await database.committed.get()
+            assert flow.name == "Second"
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def test_notify_flow_path_moves_a_flow_to_its_new_file(tmp_path, monkeypatch):
+    sync = FlowFileSync(use_watcher=False)
+    monkeypatch.setattr(flow_sync, "_flow_file_sync", sync)
+    flow_id = uuid4()
+
+    notify_flow_path(flow_id, str(tmp_path / "old.json"))
+    sync.mtimes[(tmp_path / "old.json").resolve()] = 1
+    notify_flow_path(flow_id, str(tmp_path / "new.json"))
+    notify_flow_path(uuid4(), None)
+
+    assert sync.flows_by_path == {(tmp_path / "new.json").resolve(): {flow_id}}
+    assert sync.mtimes == {}
+
+
+async def test_watcher_restarts_when_the_directories_change(tmp_path, monkeypatch):
+    watched: list[set] = []
+
+    def fake_awatch(*directories, stop_event, **_kwargs):
+        watched.append(set(directories))
+
+        async def changes():
+            await stop_event.wait()
+            return
+            yield
+
+        return changes()
+
+    monkeypatch.setattr(flow_sync, "awatch", fake_awatch)
+    (tmp_path / "first").mkdir()
+    (tmp_path / "second").mkdir()
+    sync = FlowFileSync()
+    sync.add_flow_path(uuid4(), str(tmp_path / "first" / "flow.json"))
+    changes = sync._watch()
+
+    next_paths = asyncio.create_task(anext(changes))
+    await asyncio.sleep(0)
+    assert watched == [{(tmp_path / "first").resolve()}]
+
+    sync.add_flow_path(uuid4(), str(tmp_path / "second" / "flow.json"))
+    # Files that were never synced are synced at once after the restart
+    assert await next_paths == set(sync.flows_by_path)
+
+    next_paths = asyncio.create_task(anext(changes))
+    await asyncio.sleep(0)
+    assert watched[-1] == {(tmp_path / "first").resolve(), (tmp_path / "second").resolve()}
+    next_paths.cancel()
+    await asyncio.gather(next_paths, return_exceptions=True)
+    await changes.aclose()
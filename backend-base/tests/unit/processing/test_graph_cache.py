@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from axiestudio.components.input_output import ChatInput, ChatOutput
+from axiestudio.graph.graph.base import Graph
+from axiestudio.processing.graph_cache import PreparedGraphCache
+from axiestudio.processing.process import apply_tweaks_to_graph
+
+UPDATED_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def flow_data():
+    chat_input = ChatInput(_id="chat_input")
+    chat_output = ChatOutput(_id="chat_output")
+    chat_output.set(input_value=chat_input.message_response)
+    return Graph(chat_input, chat_output).dump()["data"]
+
+
+def _flow(data, **kwargs):
+    defaults = {"id": uuid4(), "name": "flow", "updated_at": UPDATED_AT, "data": data}
+    return SimpleNamespace(**{**defaults, **kwargs})
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Record the flows the cache builds graphs for."""
+    built = []
+    build = PreparedGraphCache._build
+
+    def recording_build(flow, **kwargs):
+        built.append((flow.id, flow.updated_at))
+        return build(flow, **kwargs)
+
+    monkeypatch.setattr(PreparedGraphCache, "_build", staticmethod(recording_build))
+    return built
+
+
+def test_a_hit_returns_a_fork(flow_data, builds):
+    cache = PreparedGraphCache()
+    flow = _flow(flow_data)
+
+    first = cache.get_graph(flow, user_id="user")
+    second = cache.get_graph(flow, user_id="user")
+
+    assert len(builds) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    cached = next(iter(cache._entries.values())).graph
+    assert first is not second
+    assert cached is not first
+    assert cached is not second
+    assert second.get_vertex("chat_input") is not cached.get_vertex("chat_input")
+
+
+def test_a_new_version_rebuilds_the_entry(flow_data, builds):
+    cache = PreparedGraphCache()
+    flow = _flow(flow_data)
+    cache.get_graph(flow, user_id="user")
+
+    flow.updated_at = UPDATED_AT + timedelta(seconds=1)
+    cache.get_graph(flow, user_id="user")
+    cache.get_graph(flow, user_id="user")
+
+    assert [updated_at for _, updated_at in builds] == [UPDATED_AT, flow.updated_at]
+    assert len(cache._entries) == 1
+
+
+def test_an_older_build_does_not_replace_a_newer_one(flow_data, monkeypatch):
+    cache = PreparedGraphCache()
+    old = _flow(flow_data)
+    new = _flow(flow_data, id=old.id, updated_at=UPDATED_AT + timedelta(seconds=1))
+    build = PreparedGraphCache._build
+
+    def build_with_a_concurrent_request(flow, **kwargs):
+        if flow is old:
+            # A request for the newer version completes while the old version is being built
+            cache.get_graph(new, user_id="user")
+        return build(flow, **kwargs)
+
+    monkeypatch.setattr(PreparedGraphCache, "_build", staticmethod(build_with_a_concurrent_request))
+    cache.get_graph(old, user_id="user")
+
+    assert [entry.updated_at for entry in cache._entries.values()] == [new.updated_at]
+
+
+def test_least_recently_used_entries_are_evicted(flow_data, builds):
+    cache = PreparedGraphCache(max_size=2)
+    first, second, third = (_flow(flow_data) for _ in range(3))
+
+    cache.get_graph(first, user_id="user")
+    cache.get_graph(second, user_id="user")
+    cache.get_graph(first, user_id="user")
+    cache.get_graph(third, user_id="user")
+
+    assert {key.flow_id for key in cache._entries} == {str(first.id), str(third.id)}
+    cache.get_graph(second, user_id="user")
+    assert [flow_id for flow_id, _ in builds] == [first.id, second.id, third.id, second.id]
+
+
+def test_max_size_zero_bypasses_the_cache(flow_data, builds):
+    cache = PreparedGraphCache(max_size=0)
+    flow = _flow(flow_data)
+
+    cache.get_graph(flow, user_id="user")
+    cache.get_graph(flow, user_id="user")
+
+    assert len(builds) == 2
+    assert cache.stats()["size"] == 0
+
+
+def test_tweaks_do_not_leak_into_the_next_fork(flow_data):
+    cache = PreparedGraphCache()
+    flow = _flow(flow_data)
+
+    tweaked = apply_tweaks_to_graph(cache.get_graph(flow, user_id="user"), {"chat_input": {"input_value": "tweak"}})
+    untweaked = cache.get_graph(flow, user_id="user")
+
+    assert tweaked.get_vertex("chat_input").params["input_value"] == "tweak"
+    assert untweaked.get_vertex("chat_input").params["input_value"] != "tweak"
+    assert untweaked.get_vertex("chat_input").data["node"]["template"]["input_value"]["value"] != "tweak"
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from pydantic import BaseModel
+
+from axiestudio.processing.run_cache import RunResultCache, parse_cache_control
+
+
+class Request(BaseModel):
+    input_value: str = "hello"
+
+
+def _flow(**kwargs):
+    defaults = {
+        "id": uuid4(),
+        "updated_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        "tags": ["cache"],
+        "data": {"nodes": [], "edges": []},
+    }
+    return SimpleNamespace(**{**defaults, **kwargs})
+
+
+def test_fingerprint_depends_on_request_user_and_version():
+    cache = RunResultCache()
+    flow = _flow()
+    key = cache.fingerprint(flow, Request(), user_id="user")
+
+    assert cache.fingerprint(flow, Request(), user_id="user") == key
+    assert cache.fingerprint(flow, Request(input_value="other"), user_id="user") != key
+    assert cache.fingerprint(flow, Request(), user_id="other") != key
+    flow.updated_at = datetime(2026, 1, 2, tzinfo=timezone.utc)
+    assert cache.fingerprint(flow, Request(), user_id="user") != key
+
+
+async def test_changed_flow_data_is_not_served_from_the_cache():
+    cache = RunResultCache()
+    flow = _flow()
+    key = cache.fingerprint(flow, Request(), user_id="user")
+    await cache.set(key, "response")
+
+    flow.data = {"nodes": [{"id": "changed"}], "edges": []}
+    # The digest is kept per version until the file sync reports the change
+    assert cache.fingerprint(flow, Request(), user_id="user") == key
+    cache.forget_flow(str(flow.id))
+
+    new_key = cache.fingerprint(flow, Request(), user_id="user")
+    assert new_key != key
+    assert await cache.get(new_key) is None
+    assert RunResultCache().fingerprint(_flow(id=flow.id, data=dict(flow.data)), Request(), user_id="user") == new_key
+
+
+async def test_stats_count_hits_and_misses():
+    cache = RunResultCache()
+    await cache.set("key", "response")
+
+    assert await cache.get("key") == "response"
+    assert await cache.get("other") is None
+    assert await cache.get("key", "no-store") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["bypassed"]) == (1, 1, 1)
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_only_tagged_flows_are_cached():
+    cache = RunResultCache()
+    assert cache.is_enabled_for(_flow())
+    assert not cache.is_enabled_for(_flow(tags=[]))
+    assert not cache.is_enabled_for(_flow(updated_at=None))
+    assert not RunResultCache(max_size=0).is_enabled_for(_flow())
+
+
+def test_parse_cache_control():
+    assert parse_cache_control(None) == (True, True)
+    assert parse_cache_control("no-cache") == (False, True)
+    assert parse_cache_control("max-age=0") == (False, True)
+    assert parse_cache_control("no-store, no-cache") == (False, False)
@@ -0,0 +1,126 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from axiestudio.services.database.models.api_key import cache, crud
+from axiestudio.services.database.models.api_key.cache import ApiKeyUsageTracker, VerifiedApiKeyCache
+from axiestudio.services.database.models.user import crud as user_crud
+from axiestudio.services.database.models.user.model import User, UserRead, UserUpdate
+
+
+def _user(**kwargs) -> User:
+    return User(username="user", password="password", is_active=True, **kwargs)  # noqa: S106
+
+
+def _user_read(user: User) -> UserRead:
+    return UserRead.model_validate(user, from_attributes=True)
+
+
+class FakeSession:
+    def __init__(self, api_key=None) -> None:
+        self.api_key = api_key
+        self.statements: list = []
+
+    async def get(self, _model, _id):
+        return self.api_key
+
+    async def delete(self, _row):
+        pass
+
+    async def commit(self):
+        pass
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+
+@pytest.fixture
+def verified_cache(monkeypatch):
+    verified_cache = VerifiedApiKeyCache(ttl=30)
+    monkeypatch.setattr(cache, "_verified_api_key_cache", verified_cache)
+    return verified_cache
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    verified_cache = VerifiedApiKeyCache(ttl=30)
+    verified_cache.put("sk-key", uuid4(), _user_read(_user()))
+
+    now += 29
+    assert verified_cache.get("sk-key") is not None
+    now += 1
+    assert verified_cache.get("sk-key") is None
+    assert verified_cache.stats()["hits"] == 1
+    assert verified_cache.stats()["misses"] == 1
+
+
+def test_zero_ttl_disables_the_cache():
+    verified_cache = VerifiedApiKeyCache(ttl=0)
+    verified_cache.put("sk-key", uuid4(), _user_read(_user()))
+
+    assert verified_cache.get("sk-key") is None
+
+
+async def test_deleting_a_key_invalidates_it(verified_cache):
+    verified_cache.put("sk-key", uuid4(), _user_read(_user()))
+    verified_cache.put("sk-other", uuid4(), _user_read(_user()))
+
+    await crud.delete_api_key(FakeSession(SimpleNamespace(api_key="sk-key")), uuid4())
+
+    assert verified_cache.get("sk-key") is None
+    assert verified_cache.get("sk-other") is not None
+
+
+async def test_updating_a_user_invalidates_their_keys(verified_cache):
+    user, other_user = _user(), _user()
+    verified_cache.put("sk-key", uuid4(), _user_read(user))
+    verified_cache.put("sk-other", uuid4(), _user_read(other_user))
+
+    await user_crud.update_user_instance(user, UserUpdate(is_active=False), FakeSession())
+
+    assert verified_cache.get("sk-key") is None
+    assert verified_cache.get("sk-other") is not None
+
+
+async def test_verify_key_of_a_deleted_user_is_rejected(verified_cache, monkeypatch):
+    @asynccontextmanager
+    async def session_scope():
+        yield FakeSession()
+
+    async def get_api_key(_session, _api_key):
+        return SimpleNamespace(id=uuid4(), user=None)
+
+    monkeypatch.setattr(crud, "session_scope", session_scope)
+    monkeypatch.setattr(crud, "_get_api_key", get_api_key)
+
+    assert await crud.verify_key("sk-key") is None
+    assert verified_cache.stats()["size"] == 0
+
+
+async def test_usage_tracker_writes_accumulated_uses_in_one_flush(monkeypatch):
+    session = FakeSession()
+
+    @asynccontextmanager
+    async def session_scope():
+        yield session
+
+    monkeypatch.setattr(cache, "session_scope", session_scope)
+    tracker = ApiKeyUsageTracker(flush_interval=60)
+    assert tracker.usable()
+    key_id, other_key_id = uuid4(), uuid4()
+    tracker.record(key_id)
+    tracker.record(key_id)
+    tracker.record(other_key_id)
+    assert tracker.pending == 2
+
+    await tracker.aclose()
+
+    assert tracker.pending == 0
+    params = [statement.compile().params for statement in session.statements]
+    increments = sorted(
+        value for statement_params in params for key, value in statement_params.items() if key.startswith("total_uses")
+    )
+    assert increments == [1, 2]
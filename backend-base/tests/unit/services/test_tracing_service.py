@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from axiestudio.services.tracing.service import TracingService, trace_context_var
+
+
+class RecordingExporter:
+    """Records submitted callbacks instead of running them; drops the ones listed in ``drop``."""
+
+    def __init__(self) -> None:
+        self.submitted: list[tuple] = []
+        self.drop: set = set()
+
+    def submit(self, _context, func, args, *, critical=False):
+        if not critical and func.__name__ in self.drop:
+            return False
+        self.submitted.append((func.__name__, args))
+        return True
+
+
+@pytest.fixture
+async def service():
+    settings = SimpleNamespace(
+        deactivate_tracing=False, tracing_sample_rate=1.0, tracing_max_queue_size=10, tracing_batch_size=10
+    )
+    service = TracingService(MagicMock(settings=settings))
+    service.exporter = RecordingExporter()
+    await service.start_tracers(uuid4(), "run", user_id=None, session_id=None, project_name="project")
+    yield service
+    trace_context_var.set(None)
+
+
+def _component():
+    return SimpleNamespace(_vertex=None, trace_type="chain")
+
+
+def _names(service):
+    return [name for name, _ in service.exporter.submitted]
+
+
+async def test_dropped_component_trace_is_not_ended(service):
+    service.exporter.drop.add("_start_component_traces")
+
+    async with service.trace_component(_component(), "component", {"input": 1}):
+        pass
+
+    assert _names(service) == []
+    assert not trace_context_var.get().dropped_traces
+
+
+async def test_component_trace_end_is_queued_once_started(service):
+    async with service.trace_component(_component(), "component", {"api_key": "secret"}):
+        service.exporter.drop.add("_end_component_traces")
+
+    assert _names(service) == ["_start_component_traces", "_end_component_traces"]
+    component_trace_context = service.exporter.submitted[0][1][0]
+    assert component_trace_context.inputs == {"api_key": "*****"}
+
+
+async def test_component_trace_end_gets_a_copy_of_outputs_and_logs(service):
+    async with service.trace_component(_component(), "component", {}):
+        service.set_outputs("component", {"text": "first"})
+        service.add_log("component", {"message": "log"})
+
+    service.set_outputs("component", {"text": "second"})
+    _, args = service.exporter.submitted[-1]
+    _, _, outputs, logs, error = args
+
+    assert outputs == {"text": "first"}
+    assert logs == [{"message": "log"}]
+    assert error is None
+
+
+async def test_end_tracers_gets_a_copy_of_inputs_and_outputs(service):
+    async with service.trace_component(_component(), "component", {"input": 1}):
+        service.set_outputs("component", {"text": "first"})
+    await service.end_tracers({"result": 1})
+
+    trace_context = trace_context_var.get()
+    trace_context.all_inputs["component"]["input"] = 2
+    trace_context.all_outputs["component"]["text"] = "second"
+    name, (_, all_inputs, all_outputs, outputs, _) = service.exporter.submitted[-1]
+
+    assert name == "_end_all_tracers"
+    assert all_inputs == {"component": {"input": 1}}
+    assert all_outputs == {"component": {"text": "first"}}
+    assert outputs == {"result": 1}
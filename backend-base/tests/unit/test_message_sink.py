@@ -0,0 +1,172 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from axiestudio import memory
+from axiestudio.memory import MessageSink, aget_messages
+from axiestudio.schema.message import Message
+from axiestudio.services.database.models.message.model import MessageTable
+
+
+class FakeDatabase:
+    """Stands in for the database behind ``session_scope``; a session commits when its scope exits."""
+
+    def __init__(self) -> None:
+        self.rows: dict = {}
+        self.commits = 0
+        self.failing: set = set()
+
+    @asynccontextmanager
+    async def session_scope(self):
+        session = FakeSession(self)
+        yield session
+        session.commit()
+
+
+class FakeSession:
+    def __init__(self, database: FakeDatabase) -> None:
+        self.database = database
+        self.added: list[MessageTable] = []
+        self.updates: list[dict] = []
+
+    def add(self, row):
+        self.added.append(row)
+
+    def add_all(self, rows):
+        self.added.extend(rows)
+
+    async def flush(self):
+        pass
+
+    async def execute(self, _statement, rows):
+        self.updates.extend(rows)
+
+    async def exec(self, _statement):
+        return list(self.database.rows.values())
+
+    def commit(self):
+        ids = {row.id for row in self.added} | {row["id"] for row in self.updates}
+        if ids & self.database.failing:
+            msg = "write failed"
+            raise RuntimeError(msg)
+        for row in self.added:
+            self.database.rows[row.id] = row
+        for row in self.updates:
+            self.database.rows[row["id"]].sqlmodel_update({key: value for key, value in row.items() if key != "id"})
+        self.database.commits += 1
+
+
+def _row(text: str) -> MessageTable:
+    return MessageTable(
+        sender="User", sender_name="User", session_id="session", text=text, files=[], category="message"
+    )
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(memory, "session_scope", database.session_scope)
+    return database
+
+
+@pytest.fixture
+async def sink():
+    sink = MessageSink(flush_interval=60, max_batch_size=100, max_retries=2)
+    assert sink.usable()
+    yield sink
+    await sink.aclose()
+
+
+async def test_writes_are_batched(database, sink):
+    for text in ("a", "b", "c"):
+        await sink.add([_row(text)])
+    assert database.commits == 0
+    assert sink.pending == 3
+
+    await sink.flush()
+
+    assert database.commits == 1
+    assert sorted(row.text for row in database.rows.values()) == ["a", "b", "c"]
+
+
+async def test_flush_when_batch_is_full(database, sink):
+    sink.max_batch_size = 2
+    await sink.add([_row("a")])
+    assert database.commits == 0
+    await sink.add([_row("b")])
+    assert database.commits == 1
+    assert sink.pending == 0
+
+
+async def test_flush_after_interval(database, sink):
+    sink.flush_interval = 0.01
+    await sink.add([_row("a")])
+    assert database.commits == 0
+    await asyncio.sleep(0.1)
+    assert database.commits == 1
+
+
+async def test_close_writes_pending_messages(database, sink):
+    await sink.add([_row("a")])
+    await sink.aclose()
+    assert [row.text for row in database.rows.values()] == ["a"]
+
+
+async def test_update_of_pending_message_is_written_with_it(database, sink):
+    row = _row("a")
+    await sink.add([row])
+    updated = await sink.update([Message(id=str(row.id), text="ab")])
+    assert updated[0].text == "ab"
+
+    await sink.flush()
+
+    assert database.commits == 1
+    assert database.rows[row.id].text == "ab"
+
+
+async def test_update_of_unknown_message_is_not_queued(database, sink):  # noqa: ARG001
+    assert await sink.update([Message(id="00000000-0000-0000-0000-000000000001", text="a")]) is None
+    assert sink.pending == 0
+
+
+async def test_failed_row_is_retried_then_dropped(database, sink):
+    failing, written = _row("failing"), _row("written")
+    database.failing.add(failing.id)
+    await sink.add([failing, written])
+
+    await sink.flush()
+    assert written.id in database.rows
+    assert sink.pending == 1
+
+    await sink.flush()
+    assert sink.pending == 1
+
+    await sink.flush()
+    assert sink.pending == 0
+    assert failing.id not in database.rows
+
+
+async def test_failed_row_is_written_when_database_recovers(database, sink):
+    row = _row("a")
+    database.failing.add(row.id)
+    await sink.add([row])
+    await sink.flush()
+    assert sink.pending == 1
+
+    database.failing.clear()
+    await sink.flush()
+
+    assert sink.pending == 0
+    assert database.rows[row.id].text == "a"
+
+
+async def test_aget_messages_reads_pending_writes(database, sink, monkeypatch):
+    monkeypatch.setattr(memory, "_message_sink", sink)
+    await sink.add([_row("a")])
+    assert database.commits == 0
+
+    messages = await aget_messages(session_id="session")
+
+    assert [message.text for message in messages] == ["a"]
+    assert sink.pending == 0
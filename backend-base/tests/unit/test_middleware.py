@@ -0,0 +1,119 @@
+import asyncio
+
+from axiestudio.middleware import RequestCancelledMiddleware
+
+SCOPE = {"type": "http", "method": "POST", "path": "/"}
+
+
+class Client:
+    """The server side of one connection: sends the request body, then waits until the client goes away."""
+
+    def __init__(self, *chunks: bytes) -> None:
+        self.messages = [
+            {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1} for i, chunk in enumerate(chunks)
+        ]
+        self.gone = asyncio.Event()
+        self.sent: asyncio.Queue[dict] = asyncio.Queue()
+
+    async def receive(self):
+        if self.messages:
+            return self.messages.pop(0)
+        await self.gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        await self.sent.put(message)
+
+    def sent_messages(self) -> list[dict]:
+        messages = []
+        while not self.sent.empty():
+            messages.append(self.sent.get_nowait())
+        return messages
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            return body
+
+
+async def _respond(send, *chunks: bytes) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    for i, chunk in enumerate(chunks):
+        await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+
+
+async def test_the_body_reaches_the_app_intact():
+    async def app(_scope, receive, send):
+        await _respond(send, await _read_body(receive))
+
+    client = Client(b"hello ", b"", b"world")
+    async with asyncio.timeout(5):
+        await RequestCancelledMiddleware(app)(SCOPE, client.receive, client.send)
+
+    assert [message.get("body") for message in client.sent_messages()] == [None, b"hello world"]
+
+
+async def test_a_disconnect_cancels_a_slow_app():
+    cancelled = asyncio.Event()
+
+    async def app(_scope, receive, send):
+        await _read_body(receive)
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        await _respond(send, b"too late")
+
+    client = Client(b"request")
+    request = asyncio.create_task(RequestCancelledMiddleware(app)(SCOPE, client.receive, client.send))
+    await asyncio.sleep(0.01)
+    client.gone.set()
+    async with asyncio.timeout(5):
+        await request
+
+    assert cancelled.is_set()
+    assert client.sent_messages() == []
+
+
+async def test_a_completed_response_is_not_cancelled():
+    finished = asyncio.Event()
+
+    async def app(_scope, receive, send):
+        await _respond(send, await _read_body(receive))
+        # Work after the response, e.g. background tasks, outlives the client
+        client.gone.set()
+        await asyncio.sleep(0.01)
+        finished.set()
+
+    client = Client(b"request")
+    async with asyncio.timeout(5):
+        await RequestCancelledMiddleware(app)(SCOPE, client.receive, client.send)
+
+    assert finished.is_set()
+
+
+async def test_streamed_chunks_are_not_buffered():
+    release = asyncio.Event()
+
+    async def app(_scope, receive, send):
+        await _read_body(receive)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"first", "more_body": True})
+        await release.wait()
+        await send({"type": "http.response.body", "body": b"second"})
+
+    client = Client(b"request")
+    request = asyncio.create_task(RequestCancelledMiddleware(app)(SCOPE, client.receive, client.send))
+    async with asyncio.timeout(5):
+        assert (await client.sent.get())["type"] == "http.response.start"
+        assert (await client.sent.get())["body"] == b"first"
+        assert not request.done()
+        release.set()
+        await request
+
+    assert [message["body"] for message in client.sent_messages()] == [b"second"]